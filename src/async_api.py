@@ -0,0 +1,192 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from engine_pool import EnginePool
+
+class AsyncPlateRecognizer:
+    def __init__(self, settings=None, detector_replicas=1, plan=None, pool=None, decode_workers=2):
+        """
+        asyncio servisleri için engellemeyen plaka tespit ve tanıma arayüzü
+        
+        Tespit ve OCR, EnginePool'un kendi modellerini tutan iş parçacıklarında çalışır; olay döngüsü
+        yalnızca bekler. Her çağrı için süre sınırı verilebilir. Süre dolduğunda veya çağıran görev
+        iptal edildiğinde henüz başlamamış tespit ve OCR işleri iptal edilir, başlamış olanların
+        sonucu atılır.
+        
+        Parametreler:
+            settings: pipeline_settings tarafından oluşturulan ayar sözlüğü (pool verilmezse gerekli)
+            detector_replicas: Tespit modeli kopyası sayısı
+            plan: partition_cores çıktısı (isteğe bağlı)
+            pool: Hazır bir EnginePool. Verilirse kapatılması çağırana aittir
+            decode_workers: Görüntü yolu verildiğinde dosya çözmede kullanılacak iş parçacığı sayısı
+        """
+        if pool is None and settings is None:
+            raise ValueError("settings veya pool verilmeli")
+        
+        self._owns_pool = pool is None
+        self.pool = pool or EnginePool(settings, detector_replicas, plan)
+        self._decode_pool = ThreadPoolExecutor(decode_workers, thread_name_prefix='plate-decode')
+        self._closed = False
+    
+    async def _load(self, image):
+        """
+        Görüntü yolu verildiyse dosyayı olay döngüsünü engellemeden çöz
+        """
+        if not isinstance(image, str):
+            return image
+        
+        loop = asyncio.get_running_loop()
+        decoded = await loop.run_in_executor(self._decode_pool, cv2.imread, image)
+        if decoded is None:
+            raise ValueError(f"Görüntü okunamadı: {image}")
+        return decoded
+    
+    async def _await_all(self, futures):
+        """
+        concurrent.futures işlerini bekle; bekleme iptal edilirse başlamamış işleri de iptal et
+        """
+        wrapped = [asyncio.wrap_future(future) for future in futures]
+        try:
+            return await asyncio.gather(*wrapped)
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    
+    async def _recognize(self, image, return_images):
+        image = await self._load(image)
+        
+        detection = await self._await_all([self.pool.submit_detection(image)])
+        detected_plates, annotated_image, plate_images = detection[0]
+        
+        recognized_plates = await self._await_all([self.pool.submit_ocr(plate_image, detected_plate)
+                                                   for plate_image, detected_plate in zip(plate_images, detected_plates)])
+        
+        if return_images:
+            return recognized_plates, annotated_image, plate_images
+        return recognized_plates
+    
+    async def recognize(self, image, timeout=None, return_images=False):
+        """
+        Görüntüde plakaları tespit et ve tanı
+        
+        Parametreler:
+            image: BGR görüntü veya görüntü yolu
+            timeout: Saniye cinsinden süre sınırı (None ise sınırsız)
+            return_images: True ise işaretlenmiş görüntü ve kırpıntılar da döndürülür
+            
+        Dönüş:
+            Tanınan plakalar listesi (return_images=True ise (plakalar, işaretli_görüntü, kırpıntılar))
+            
+        Hata:
+            asyncio.TimeoutError: Süre sınırı aşılırsa
+            ValueError: Görüntü yolu okunamazsa
+        """
+        if self._closed:
+            raise RuntimeError("AsyncPlateRecognizer kapatıldı")
+        return await asyncio.wait_for(self._recognize(image, return_images), timeout)
+    
+    async def detect(self, image, timeout=None):
+        """
+        Yalnızca plaka tespiti yap
+        
+        Dönüş:
+            (detected_plates, annotated_image, plate_images) demeti
+        """
+        if self._closed:
+            raise RuntimeError("AsyncPlateRecognizer kapatıldı")
+        
+        async def run():
+            loaded = await self._load(image)
+            return (await self._await_all([self.pool.submit_detection(loaded)]))[0]
+        
+        return await asyncio.wait_for(run(), timeout)
+    
+    async def recognize_many(self, images, timeout=None, concurrency=None):
+        """
+        Birden çok görüntüyü eşzamanlı işle ve sonuçları giriş sırasıyla döndür
+        
+        Parametreler:
+            images: Görüntüler veya görüntü yolları
+            timeout: Görüntü başına süre sınırı (saniye)
+            concurrency: Aynı anda işlenen en fazla görüntü (None ise havuzdaki işçi sayısının iki katı)
+            
+        Dönüş:
+            Her görüntü için plaka listesi veya hata nesnesi (TimeoutError, ValueError ...) içeren liste
+        """
+        results = {}
+        async for index, result in self.stream(enumerate(images), timeout, concurrency):
+            results[index] = result
+        return [results[i] for i in range(len(results))]
+    
+    async def stream(self, items, timeout=None, concurrency=None):
+        """
+        (anahtar, görüntü) çiftlerini sınırlı eşzamanlılıkla işle ve sonuçları tamamlanma sırasıyla üret
+        
+        Kaynak bir asenkron üreteç (örneğin kamera akışı) olabilir; işlemdeki görüntü sayısı
+        concurrency'e ulaştığında kaynaktan yeni görüntü alınmaz (geri basınç).
+        
+        Parametreler:
+            items: (anahtar, görüntü) çiftleri üreten normal veya asenkron yinelenebilir
+            timeout: Görüntü başına süre sınırı (saniye)
+            concurrency: Aynı anda işlenen en fazla görüntü
+            
+        Dönüş:
+            (anahtar, plaka listesi veya hata nesnesi) çiftleri üreten asenkron üreteç
+        """
+        concurrency = concurrency or 2 * (self.pool.detector_replicas + self.pool.plan['ocr_workers'])
+        pending = set()
+        
+        async def run(key, image):
+            try:
+                return key, await self.recognize(image, timeout)
+            except (asyncio.TimeoutError, ValueError, RuntimeError) as e:
+                return key, e
+        
+        async def source():
+            if hasattr(items, '__aiter__'):
+                async for item in items:
+                    yield item
+            else:
+                for item in items:
+                    yield item
+        
+        try:
+            async for key, image in source():
+                if len(pending) >= concurrency:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+                pending.add(asyncio.ensure_future(run(key, image)))
+            
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            # Tüketici erken çıkarsa veya iptal edilirse kalan işler iptal edilir
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def aclose(self):
+        """
+        Bekleyen işleri iptal et ve iş parçacıklarını olay döngüsünü engellemeden kapat
+        """
+        if self._closed:
+            return
+        self._closed = True
+        
+        loop = asyncio.get_running_loop()
+        self._decode_pool.shutdown(wait=False, cancel_futures=True)
+        if self._owns_pool:
+            await loop.run_in_executor(None, lambda: self.pool.close(cancel_pending=True))
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.aclose()
@@ -0,0 +1,244 @@
+import os
+import zlib
+import time
+
+import cv2
+import numpy as np
+from tqdm import tqdm
+
+from ocr import PlateOCR
+from ufpr_annotations import parse_ufpr_annotation
+from track_sampling import subsample_track
+
+# Karakter sınıfları: sınıf indeksi bu dizideki konumdur
+CHAR_CLASSES = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+def assemble_plate_text(boxes, classes, confidences, max_chars=7):
+    """
+    Karakter tespitlerini plaka metnine dönüştür
+    
+    Tek satırlı plakalarda karakterler soldan sağa, iki satırlı (motosiklet) plakalarda önce üst
+    satır sonra alt satır soldan sağa okunur. Satırlar, dikey merkezler arasındaki en büyük boşluk
+    karakter yüksekliğinin yarısını aşıyorsa ayrılır.
+    
+    Parametreler:
+        boxes: Karakter kutuları [[x1, y1, x2, y2], ...]
+        classes: Sınıf indeksleri (CHAR_CLASSES)
+        confidences: Güven skorları
+        max_chars: En fazla karakter sayısı; fazlası en düşük güvenlilerden başlanarak atılır
+        
+    Dönüş:
+        (metin, ortalama_güven) demeti
+    """
+    if len(boxes) == 0:
+        return '', 0.0
+    
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    classes = np.asarray(classes, dtype=int)
+    confidences = np.asarray(confidences, dtype=np.float32)
+    
+    keep = np.argsort(-confidences)[:max_chars]
+    boxes, classes, confidences = boxes[keep], classes[keep], confidences[keep]
+    
+    center_x = (boxes[:, 0] + boxes[:, 2]) / 2
+    center_y = (boxes[:, 1] + boxes[:, 3]) / 2
+    char_height = np.median(boxes[:, 3] - boxes[:, 1])
+    
+    order = np.argsort(center_y)
+    rows = [order]
+    if len(order) > 1:
+        gaps = np.diff(center_y[order])
+        split = int(np.argmax(gaps))
+        if gaps[split] > 0.5 * char_height:
+            rows = [order[:split + 1], order[split + 1:]]
+    
+    ordered = [i for row in rows for i in row[np.argsort(center_x[row])]]
+    text = ''.join(CHAR_CLASSES[classes[i]] for i in ordered)
+    return text, float(confidences.mean())
+
+class CharRecognizer:
+    # Komut satırı ve işçi ayarlarında arka ucu ayırt etmek için
+    backend = 'yolo'
+    
+    # Plaka biçimi doğrulaması Tesseract arka ucuyla aynıdır
+    analyze_results = PlateOCR.analyze_results
+    
+    def __init__(self, model_path, conf_threshold=0.25, img_size=192, batch_size=32):
+        """
+        Plaka kırpıntılarındaki karakterleri 36 sınıflı YOLO modeliyle tanıyan OCR arka ucu
+        
+        PlateOCR ile aynı arayüzü (recognize_plate, analyze_results) sunar; ayrıca bir karedeki tüm
+        kırpıntılar recognize_batch ile tek ileri geçişte okunur. Tesseract süreci başlatılmaz.
+        
+        Parametreler:
+            model_path: prepare_char_dataset verisiyle eğitilmiş karakter modeli
+            conf_threshold: Karakter tespiti güven eşiği
+            img_size: Çıkarım giriş boyutu (eğitimdeki boyutla aynı olmalı)
+            batch_size: Tek ileri geçişte işlenecek en fazla kırpıntı
+        """
+        # ultralytics yalnızca model yüklenirken gerekir; assemble_plate_text onsuz da kullanılabilir
+        from ultralytics import YOLO
+        
+        self.model = YOLO(model_path)
+        self.model_path = model_path
+        self.conf_threshold = conf_threshold
+        self.img_size = img_size
+        self.batch_size = batch_size
+    
+    def recognize_batch(self, plate_images):
+        """
+        Birden çok plaka kırpıntısını toplu olarak tanı
+        
+        Parametreler:
+            plate_images: Kırpılmış plaka görüntüleri (BGR veya gri)
+            
+        Dönüş:
+            Her kırpıntı için (metin, güven) demetleri listesi
+        """
+        reads = [('', 0.0)] * len(plate_images)
+        valid = [i for i, image in enumerate(plate_images) if image is not None and image.size > 0]
+        
+        for start in range(0, len(valid), self.batch_size):
+            indices = valid[start:start + self.batch_size]
+            batch = [plate_images[i] if plate_images[i].ndim == 3 else cv2.cvtColor(plate_images[i], cv2.COLOR_GRAY2BGR)
+                     for i in indices]
+            
+            # Aynı konumdaki benzer karakterler (O/0, I/1) ayrı sınıflar olduğundan NMS sınıflar arası yapılır
+            predictions = self.model(batch, imgsz=self.img_size, conf=self.conf_threshold, agnostic_nms=True,
+                                     verbose=False)
+            
+            for i, prediction in zip(indices, predictions):
+                detections = prediction.boxes
+                reads[i] = assemble_plate_text(detections.xyxy.cpu().numpy(), detections.cls.cpu().numpy(),
+                                               detections.conf.cpu().numpy())
+        
+        return reads
+    
+    def recognize_plate(self, plate_image):
+        """
+        Tek bir plaka kırpıntısını tanı
+        
+        Dönüş:
+            (metin, güven) demeti
+        """
+        return self.recognize_batch([plate_image])[0]
+
+def prepare_char_dataset(dataset_root, output_path, margin=0.1, frames_per_track=None, subsample_method='phash',
+                         dedup_threshold=None):
+    """
+    UFPR-ALPR karakter açıklamalarından karakter tanıma için YOLO veri seti hazırla
+    
+    Her karenin plakası kutusundan, kutu boyutunun rastgele [0, margin] katı kadar pay bırakılarak
+    kırpılır; karakter kutuları kırpıntı koordinatlarına taşınıp 36 sınıflı YOLO etiketlerine yazılır.
+    Karakter sayısı plaka metniyle uyuşmayan kareler atlanır. Ortaya çıkan veri seti
+    PlateDetector.train_custom_model ile eğitilir.
+    
+    Parametreler:
+        dataset_root: training/validation/testing klasörlerini içeren UFPR-ALPR veri seti kök dizini
+        output_path: Hazırlanan veri setini kaydetmek için yol
+        margin: Kırpıntıya eklenecek en büyük pay (plaka boyutuna oranla)
+        frames_per_track: Verilirse eğitim bölümünde her izlemeden en fazla bu kadar farklı kare alınır
+        subsample_method: Kare benzerliği ölçüsü ('phash' veya 'motion')
+        dedup_threshold: Yakın kopya eşiği (None ise yöntem varsayılanı)
+        
+    Dönüş:
+        Hazırlanan veri setinin yolu
+    """
+    print("Karakter veri seti hazırlama başladı...")
+    start_time = time.time()
+    
+    split_mapping = {
+        'training': 'train',
+        'validation': 'val',
+        'testing': 'test'
+    }
+    for split in split_mapping.values():
+        os.makedirs(os.path.join(output_path, split, 'images'), exist_ok=True)
+        os.makedirs(os.path.join(output_path, split, 'labels'), exist_ok=True)
+    
+    stats = {'crops': 0, 'skipped': 0, 'chars': 0}
+    
+    for ufpr_split, our_split in split_mapping.items():
+        split_path = os.path.join(dataset_root, ufpr_split)
+        if not os.path.exists(split_path):
+            print(f"Uyarı: {split_path} mevcut değil")
+            continue
+        
+        for track_folder in tqdm(sorted(os.listdir(split_path)), desc=f"{ufpr_split} izlemeleri"):
+            track_path = os.path.join(split_path, track_folder)
+            if not os.path.isdir(track_path):
+                continue
+            
+            track_frames = []
+            for file in sorted(os.listdir(track_path)):
+                txt_path = os.path.join(track_path, file.replace('.png', '.txt'))
+                if not file.endswith('.png') or not os.path.exists(txt_path):
+                    continue
+                
+                annotation = parse_ufpr_annotation(txt_path)
+                if annotation is None or annotation['box'] is None:
+                    continue
+                
+                text = annotation['text'].replace('-', '').upper()
+                if not annotation['chars'] or len(annotation['chars']) != len(text) or \
+                   any(c not in CHAR_CLASSES for c in text):
+                    stats['skipped'] += 1
+                    continue
+                track_frames.append((file, annotation))
+            
+            if frames_per_track and our_split == 'train' and track_frames:
+                track_frames, _ = subsample_track(track_path, track_frames, frames_per_track, subsample_method,
+                                                  dedup_threshold)
+            
+            for file, annotation in track_frames:
+                image = cv2.imread(os.path.join(track_path, file))
+                if image is None:
+                    continue
+                
+                # Tespit kırpıntılarındaki konum oynamasına benzemesi için payı dosyaya bağlı rastgele seç
+                rng = np.random.default_rng(zlib.crc32(file.encode('utf-8')))
+                x1, y1, x2, y2 = annotation['box']
+                pads = rng.uniform(0, margin, 4) * [x2 - x1, y2 - y1, x2 - x1, y2 - y1]
+                crop_x1, crop_y1 = int(max(x1 - pads[0], 0)), int(max(y1 - pads[1], 0))
+                crop_x2 = int(min(x2 + pads[2], image.shape[1]))
+                crop_y2 = int(min(y2 + pads[3], image.shape[0]))
+                crop = image[crop_y1:crop_y2, crop_x1:crop_x2]
+                if crop.size == 0:
+                    stats['skipped'] += 1
+                    continue
+                
+                crop_height, crop_width = crop.shape[:2]
+                text = annotation['text'].replace('-', '').upper()
+                lines = []
+                for char, (cx1, cy1, cx2, cy2) in zip(text, annotation['chars']):
+                    # Karakter kutusunu kırpıntı koordinatlarına taşı ve kırpıntıyla sınırla
+                    cx1, cx2 = np.clip([cx1 - crop_x1, cx2 - crop_x1], 0, crop_width)
+                    cy1, cy2 = np.clip([cy1 - crop_y1, cy2 - crop_y1], 0, crop_height)
+                    if cx2 <= cx1 or cy2 <= cy1:
+                        continue
+                    lines.append(f"{CHAR_CLASSES.index(char)} {(cx1 + cx2) / 2 / crop_width} "
+                                 f"{(cy1 + cy2) / 2 / crop_height} {(cx2 - cx1) / crop_width} {(cy2 - cy1) / crop_height}")
+                
+                cv2.imwrite(os.path.join(output_path, our_split, 'images', file), crop)
+                with open(os.path.join(output_path, our_split, 'labels', file.replace('.png', '.txt')), 'w') as f:
+                    f.write('\n'.join(lines))
+                
+                stats['crops'] += 1
+                stats['chars'] += len(lines)
+    
+    names = ', '.join(f"'{c}'" for c in CHAR_CLASSES)
+    yaml_content = f"""
+path: {output_path}
+train: train/images
+val: val/images
+test: test/images
+
+nc: {len(CHAR_CLASSES)}
+names: [{names}]
+"""
+    with open(os.path.join(output_path, 'dataset.yaml'), 'w') as f:
+        f.write(yaml_content)
+    
+    print(f"Karakter veri seti hazırlandı: {stats['crops']} kırpıntı, {stats['chars']} karakter, "
+          f"{stats['skipped']} kare atlandı ({(time.time() - start_time) / 60:.1f} dakika)")
+    return output_path
@@ -0,0 +1,321 @@
+import os
+import re
+import csv
+import time
+import sqlite3
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+from journal import atomic_imwrite
+from tracker import box_iou
+from preprocessing import OCR_PREPROCESSING_VARIANTS
+from evaluate import EvaluationMetrics
+
+class CropBank:
+    def __init__(self, bank_dir, gt_data=None, iou_threshold=0.5):
+        """
+        Çıkarılan plaka kırpıntılarını kaynak bilgileriyle saklayan dizinli kırpıntı bankası
+        
+        Kırpıntılar bank_dir/crops altına kayıpsız PNG olarak, kaynak görüntü, kutu, tespit güveni,
+        tespit modeli sürümü ve (varsa) gerçek plaka metniyle birlikte bank_dir/index.db SQLite
+        dizinine yazılır. OCR denemeleri tespit yeniden çalıştırılmadan doğrudan bankadan yapılır.
+        
+        Parametreler:
+            bank_dir: Banka dizini
+            gt_data: Görüntü adından gerçek etiketlere sözlük (veya UFPRIndex). Verilirse her kırpıntıya
+                     en çok örtüşen gerçek plakanın metni eklenir
+            iou_threshold: Kırpıntının gerçek plakayla eşleşmesi için gereken en küçük IoU
+        """
+        os.makedirs(os.path.join(bank_dir, 'crops'), exist_ok=True)
+        
+        self.bank_dir = bank_dir
+        self.gt_data = gt_data or {}
+        self.iou_threshold = iou_threshold
+        
+        self.conn = sqlite3.connect(os.path.join(bank_dir, 'index.db'))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        
+        # Aynı görüntü aynı modelle yeniden işlendiğinde kırpıntı tekrar eklenmez
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS crops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                crop_file TEXT,
+                source TEXT NOT NULL,
+                image_name TEXT NOT NULL,
+                x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER,
+                detection_confidence REAL,
+                detector_version TEXT,
+                rectified INTEGER,
+                gt_text TEXT,
+                timestamp REAL,
+                UNIQUE (image_name, x1, y1, x2, y2, detector_version)
+            );
+            CREATE INDEX IF NOT EXISTS idx_crops_gt_text ON crops(gt_text);
+            CREATE INDEX IF NOT EXISTS idx_crops_detector_version ON crops(detector_version);
+        """)
+        self.conn.commit()
+    
+    def _match_gt_text(self, image_name, box):
+        """
+        Kutuyla en çok örtüşen gerçek plakanın temizlenmiş metnini bul (eşleşme yoksa None)
+        """
+        gt_info = self.gt_data.get(image_name) if hasattr(self.gt_data, 'get') else None
+        if not gt_info:
+            return None
+        
+        best_iou, best_text = self.iou_threshold, None
+        for plate in gt_info['plates']:
+            iou = box_iou(box, plate['position'])
+            if iou >= best_iou:
+                best_iou, best_text = iou, plate['text']
+        
+        # UFPR metinleri tire içerir (ABC-1234); OCR çıktısıyla aynı biçimde saklanır
+        return re.sub(r'[^A-Z0-9]', '', best_text.upper()) if best_text is not None else None
+    
+    def add_crops(self, image_path, detected_plates, plate_images, detector_version=None, rectified=False):
+        """
+        Bir görüntünün plaka kırpıntılarını bankaya ekle
+        
+        Parametreler:
+            image_path: Kaynak görüntünün yolu
+            detected_plates: Tespitler listesi [x1, y1, x2, y2, güven]
+            plate_images: OCR ön işlemesinden önceki kırpıntılar
+            detector_version: Kırpıntıları üreten tespit modeli (örneğin ağırlık dosyası yolu)
+            rectified: Kırpıntılar köşelerden perspektif düzeltmesiyle mi çıkarıldı
+            
+        Dönüş:
+            Eklenen kırpıntı sayısı
+        """
+        image_name = os.path.basename(image_path)
+        added = 0
+        
+        for plate, plate_img in zip(detected_plates, plate_images):
+            if plate_img is None or plate_img.size == 0:
+                continue
+            
+            x1, y1, x2, y2, det_conf = plate
+            cursor = self.conn.execute("""
+                INSERT OR IGNORE INTO crops (source, image_name, x1, y1, x2, y2, detection_confidence,
+                                             detector_version, rectified, gt_text, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (str(image_path), image_name, int(x1), int(y1), int(x2), int(y2), float(det_conf),
+                  detector_version, int(rectified), self._match_gt_text(image_name, [x1, y1, x2, y2]), time.time()))
+            if cursor.rowcount == 0:
+                continue
+            
+            # Dosya adı satır kimliğinden türetilir; dizin başına dosya sayısı sınırlı kalsın diye alt dizinlere bölünür
+            crop_id = cursor.lastrowid
+            crop_file = os.path.join('crops', f"{crop_id // 10000:04d}", f"{crop_id:08d}.png")
+            os.makedirs(os.path.join(self.bank_dir, os.path.dirname(crop_file)), exist_ok=True)
+            atomic_imwrite(os.path.join(self.bank_dir, crop_file), plate_img)
+            self.conn.execute('UPDATE crops SET crop_file = ? WHERE id = ?', (crop_file, crop_id))
+            added += 1
+        
+        self.conn.commit()
+        return added
+    
+    def count(self, labeled_only=False):
+        """
+        Bankadaki kırpıntı sayısını döndür
+        """
+        query = 'SELECT COUNT(*) FROM crops WHERE crop_file IS NOT NULL'
+        if labeled_only:
+            query += ' AND gt_text IS NOT NULL'
+        return self.conn.execute(query).fetchone()[0]
+    
+    def iter_batches(self, batch_size=256, labeled_only=True, detector_version=None, limit=None, workers=4):
+        """
+        Kırpıntıları görüntüleriyle birlikte toplu olarak oku
+        
+        Parametreler:
+            batch_size: Toplu iş başına kırpıntı sayısı
+            labeled_only: True ise yalnızca gerçek metni bilinen kırpıntılar
+            detector_version: Verilirse yalnızca bu modelin ürettiği kırpıntılar
+            limit: En fazla kırpıntı sayısı
+            workers: PNG çözmede kullanılacak iş parçacığı sayısı
+            
+        Dönüş:
+            (satır sözlükleri, görüntüler) demetleri üreten üreteç
+        """
+        query = 'SELECT * FROM crops WHERE crop_file IS NOT NULL'
+        params = []
+        if labeled_only:
+            query += ' AND gt_text IS NOT NULL'
+        if detector_version:
+            query += ' AND detector_version = ?'
+            params.append(detector_version)
+        query += ' ORDER BY id'
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        
+        cursor = self.conn.execute(query, params)
+        with ThreadPoolExecutor(workers, thread_name_prefix='crop-bank-read') as executor:
+            while True:
+                rows = [dict(row) for row in cursor.fetchmany(batch_size)]
+                if not rows:
+                    break
+                images = list(executor.map(lambda row: cv2.imread(os.path.join(self.bank_dir, row['crop_file'])), rows))
+                yield rows, images
+    
+    def close(self):
+        """
+        Veritabanı bağlantısını kapat
+        """
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def evaluate_bank(bank, ocr, ocr_variants=('default',), batch_size=256, workers=4, detector_version=None, limit=None):
+    """
+    OCR ön işleme varyantlarını tespit çalıştırmadan bankadaki etiketli kırpıntılarda değerlendir
+    
+    Her toplu iş bir kez okunur ve tüm varyantlar aynı görüntülerde çalıştırılır. Karakter modeli
+    (recognize_batch) toplu işi tek ileri geçişte okur; Tesseract çağrıları iş parçacıklarına dağıtılır.
+    
+    Parametreler:
+        bank: CropBank nesnesi
+        ocr: PlateOCR veya CharRecognizer nesnesi
+        ocr_variants: Denenecek OCR_PREPROCESSING_VARIANTS adları
+        batch_size: Toplu iş başına kırpıntı sayısı
+        workers: Tesseract için paralel iş parçacığı sayısı
+        detector_version: Verilirse yalnızca bu modelin kırpıntıları
+        limit: En fazla kırpıntı sayısı
+        
+    Dönüş:
+        Varyant başına {'ocr_variant', 'crops', 'exact_match_accuracy', 'character_accuracy', 'valid_rate', 'ms_per_crop'} listesi
+    """
+    # Metinler kısa olduğundan tüm okumalar tutulur ve doğruluk sonda tek seferde hesaplanır
+    gt_texts = []
+    stats = {variant: {'texts': [], 'valid': 0, 'seconds': 0.0} for variant in ocr_variants}
+    
+    def read(image):
+        plate_text, _ = ocr.recognize_plate(image)
+        return plate_text
+    
+    with ThreadPoolExecutor(workers, thread_name_prefix='crop-bank-ocr') as executor:
+        for rows, images in bank.iter_batches(batch_size, labeled_only=True, detector_version=detector_version,
+                                              limit=limit):
+            indices = [i for i, image in enumerate(images) if image is not None]
+            gt_texts.extend(rows[i]['gt_text'] for i in indices)
+            
+            for variant in ocr_variants:
+                start = time.perf_counter()
+                processed = [OCR_PREPROCESSING_VARIANTS[variant](images[i]) for i in indices]
+                if hasattr(ocr, 'recognize_batch'):
+                    raw_texts = [text for text, _ in ocr.recognize_batch(processed)]
+                else:
+                    raw_texts = list(executor.map(read, processed))
+                analyzed = [ocr.analyze_results(text, text) for text in raw_texts]
+                
+                variant_stats = stats[variant]
+                variant_stats['seconds'] += time.perf_counter() - start
+                variant_stats['texts'].extend(text for text, _ in analyzed)
+                variant_stats['valid'] += sum(1 for _, is_valid in analyzed if is_valid)
+    
+    evaluator = EvaluationMetrics()
+    crops = max(len(gt_texts), 1)
+    results = []
+    for variant in ocr_variants:
+        variant_stats = stats[variant]
+        char_acc, exact_acc = evaluator.evaluate_ocr(gt_texts, variant_stats['texts'])
+        results.append({
+            'ocr_variant': variant,
+            'crops': len(gt_texts),
+            'exact_match_accuracy': exact_acc,
+            'character_accuracy': char_acc,
+            'valid_rate': variant_stats['valid'] / crops,
+            'ms_per_crop': variant_stats['seconds'] / crops * 1000
+        })
+    return results
+
+def save_bank_report(results, backend, save_dir='results'):
+    """
+    Varyant sonuçlarını CSV dosyasına kaydet
+    
+    Dönüş:
+        CSV dosyasının yolu
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    csv_path = os.path.join(save_dir, f"crop_bank_eval_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv")
+    
+    with open(csv_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['ocr_backend'] + list(results[0].keys()))
+        writer.writeheader()
+        for result in results:
+            writer.writerow({'ocr_backend': backend, **result})
+    
+    return csv_path
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Kırpıntı bankası üzerinde yalnızca OCR değerlendirmesi')
+    parser.add_argument('bank_dir', type=str, help='detect_and_recognize.py --crop-bank ile oluşturulan banka dizini')
+    parser.add_argument('--ocr-variants', type=str, nargs='+', default=['default'],
+                        choices=sorted(OCR_PREPROCESSING_VARIANTS), help='Denenecek OCR ön işleme varyantları')
+    parser.add_argument('--ocr-backend', type=str, default='tesseract', choices=['tesseract', 'yolo'],
+                        help='Karakter tanıma arka ucu')
+    parser.add_argument('--char-model', type=str, help='YOLO karakter modeli (--ocr-backend yolo için)')
+    parser.add_argument('--tesseract-path', type=str, help='Tesseract uygulamasının yolu')
+    parser.add_argument('--detector-version', type=str, help='Yalnızca bu tespit modelinin kırpıntılarını kullan')
+    parser.add_argument('--limit', type=int, help='Kullanılacak en fazla kırpıntı sayısı')
+    parser.add_argument('--batch-size', type=int, default=256, help='Toplu iş başına kırpıntı sayısı')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Paralel Tesseract iş parçacığı sayısı')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    if args.ocr_backend == 'yolo':
+        if not args.char_model:
+            print("Hata: --ocr-backend yolo için --char-model belirtilmeli")
+            exit(1)
+        from char_recognizer import CharRecognizer
+        ocr = CharRecognizer(args.char_model)
+        
+        # Karakter modeli ham renkli kırpıntılarla eğitildiği için Tesseract ön işlemesi uygulanmaz
+        if args.ocr_variants != ['none']:
+            print(f"Uyarı: OCR ön işleme varyantları ({', '.join(args.ocr_variants)}) karakter modeliyle kullanılmaz; "
+                  f"yalnızca 'none' değerlendirilecek")
+        args.ocr_variants = ['none']
+    else:
+        from ocr import PlateOCR, limit_tesseract_threads
+        ocr = PlateOCR(tesseract_path=args.tesseract_path)
+        
+        # Paralellik iş parçacığı sayısıyla sağlandığı için her Tesseract süreci tek iş parçacığıyla sınırlanır
+        limit_tesseract_threads()
+    
+    with CropBank(args.bank_dir) as bank:
+        labeled = bank.count(labeled_only=True)
+        print(f"Bankada {bank.count()} kırpıntı var, {labeled} tanesinin gerçek metni biliniyor")
+        if labeled == 0:
+            print("Hata: Değerlendirilecek etiketli kırpıntı yok (banka --ground-truth ile oluşturulmalı)")
+            exit(1)
+        
+        start_time = time.time()
+        results = evaluate_bank(bank, ocr, args.ocr_variants, batch_size=args.batch_size, workers=args.workers,
+                                detector_version=args.detector_version, limit=args.limit)
+    
+    print(f"\nDeğerlendirme {time.time() - start_time:.1f} saniyede tamamlandı ({args.ocr_backend})")
+    print(f"{'varyant':<10} {'kırpıntı':>9} {'tam eşleşme':>12} {'karakter':>9} {'geçerli':>8} {'ms/kırpıntı':>12}")
+    for result in results:
+        print(f"{result['ocr_variant']:<10} {result['crops']:>9} {result['exact_match_accuracy']:>12.3f} "
+              f"{result['character_accuracy']:>9.3f} {result['valid_rate']:>8.3f} {result['ms_per_crop']:>12.1f}")
+    
+    csv_path = save_bank_report(results, args.ocr_backend)
+    print(f"Sonuçlar {csv_path} konumuna kaydedildi")
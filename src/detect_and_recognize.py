@@ -2,55 +2,81 @@ import os
 import cv2
 import numpy as np
 import argparse
+import json
 import matplotlib.pyplot as plt
 from pathlib import Path
 import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 
 # Özel modülleri içe aktar
-from preprocessing import preprocess_image_for_plate_detection, preprocess_plate_for_ocr
+from preprocessing import preprocess_image_for_plate_detection, assess_crop_quality, OCR_PREPROCESSING_VARIANTS
 from plate_detection import PlateDetector
-from ocr import PlateOCR
+from ocr import PlateOCR, limit_tesseract_threads
+from char_recognizer import CharRecognizer
 from evaluate import EvaluationMetrics
+from journal import ProcessingJournal, atomic_imwrite, atomic_write_json
+from plate_store import PlateStore
+from tracker import PlateTracker, image_source
+from mp_pipeline import pipeline_settings, run_pipeline
+from watch_folder import watch_folder
+from ufpr_annotations import UFPRIndex
+from prefilter import RegionPrefilter
+from roi_prior import ROIPrior, load_masks
+from model_registry import ModelRegistry
+from engine_pool import EnginePool
+from latency_budget import LatencyBudget, DEGRADATION_LEVELS
+from profiler import SamplingProfiler, finish_profile
+from crop_bank import CropBank
 
-def process_single_image(image_path, detector, ocr, save_results=True, display=False):
+# Düzeltilmiş plaka kırpıntılarının boyutu (genişlik, yükseklik); Brezilya plakaları yaklaşık 3:1
+RECTIFIED_PLATE_SIZE = (240, 80)
+
+def recognize_plate_images(plate_images, detected_plates, ocr, ocr_variant='default', quality_gate=False):
     """
-    Tek bir görüntüde plaka tespiti ve tanıma işlemi yap
+    Kırpılmış plaka görüntülerinde karakter tanıma yap
     
     Parametreler:
-        image_path: Giriş görüntüsünün yolu
-        detector: Başlatılmış PlateDetector nesnesi
-        ocr: Başlatılmış PlateOCR nesnesi
-        save_results: Sonuçların diske kaydedilip kaydedilmeyeceği
-        display: Sonuçların gösterilip gösterilmeyeceği
+        plate_images: Kırpılmış plaka görüntüleri listesi
+        detected_plates: Karşılık gelen tespitler listesi [x1, y1, x2, y2, güven]
+        ocr: Başlatılmış PlateOCR nesnesi veya CharRecognizer (kırpıntılar tek ileri geçişte okunur)
+        ocr_variant: OCR_PREPROCESSING_VARIANTS içindeki ön işleme varyantının adı
+        quality_gate: True ise okunamayacak kırpıntılar (küçük, bulanık, düşük kontrastlı) OCR'a verilmez
         
     Dönüş:
         recognized_plates: Tanınan plakaların metin ve konumlarını içeren liste
-        result_image: Tespit kutuları ve tanınan metinlerle işaretlenmiş görüntü
     """
-    # Görüntüyü oku
-    image = cv2.imread(image_path)
-    if image is None:
-        print(f"Hata: {image_path} konumundaki görüntü okunamadı")
-        return [], None
-    
-    # Görüntüyü ön işle
-    preprocessed = preprocess_image_for_plate_detection(image)
-    
-    # Plakaları tespit et
-    detected_plates, annotated_image = detector.detect(image)
-    
-    # Plaka bölgelerini çıkar
-    plate_images = detector.extract_plate_regions(image, detected_plates)
-    
+    preprocess = OCR_PREPROCESSING_VARIANTS[ocr_variant]
+    quality = assess_crop_quality(plate_images) if quality_gate else None
     recognized_plates = []
     
+    batch_reads = None
+    if hasattr(ocr, 'recognize_batch'):
+        # Karakter modeli karedeki tüm kırpıntıları tek ileri geçişte okur
+        indices = [i for i in range(len(plate_images)) if not quality or quality[i]['ok']]
+        reads = ocr.recognize_batch([preprocess(plate_images[i]) for i in indices])
+        batch_reads = dict(zip(indices, reads))
+    
     # Her bir tespit edilen plakayı işle
     for i, plate_img in enumerate(plate_images):
-        # Plakayı OCR için ön işle
-        processed_plate = preprocess_plate_for_ocr(plate_img)
+        # Kalite kapısından geçemeyen kırpıntıda OCR'ı atla ve nedenini kaydet
+        if quality and not quality[i]['ok']:
+            x1, y1, x2, y2, det_conf = detected_plates[i]
+            recognized_plates.append({
+                'text': '',
+                'position': [x1, y1, x2, y2],
+                'detection_confidence': det_conf,
+                'ocr_confidence': 0.0,
+                'is_valid': False,
+                'skip_reason': quality[i]['reason']
+            })
+            continue
         
         # Plaka karakterlerini tanı
-        plate_text, ocr_confidence = ocr.recognize_plate(processed_plate)
+        if batch_reads is not None:
+            plate_text, ocr_confidence = batch_reads[i]
+        else:
+            plate_text, ocr_confidence = ocr.recognize_plate(preprocess(plate_img))
         
         # OCR sonuçlarını analiz et
         final_text, is_valid = ocr.analyze_results(plate_text, plate_text)
@@ -58,32 +84,189 @@ def process_single_image(image_path, detector, ocr, save_results=True, display=F
         # Plaka konumunu al
         x1, y1, x2, y2, det_conf = detected_plates[i]
         
-        # İşaretlenmiş görüntüye tanınan metni ekle
-        cv2.putText(annotated_image, final_text, (x1, y2 + 30),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
-        
         # Sonuçları listeye ekle
         recognized_plates.append({
             'text': final_text,
             'position': [x1, y1, x2, y2],
             'detection_confidence': det_conf,
             'ocr_confidence': ocr_confidence,
-            'is_valid': is_valid
+            'is_valid': is_valid,
+            'skip_reason': None
         })
     
-    # Sonuçları kaydet
-    if save_results:
-        os.makedirs('results/images', exist_ok=True)
-        os.makedirs('results/plates', exist_ok=True)
+    return recognized_plates
+
+def recognize_tracked_plates(plate_images, detected_plates, ocr, tracker, ocr_variant='default', quality_gate=False):
+    """
+    Ardışık karelerde plakaları izleyerek yalnızca gerektiğinde OCR yap ve okumaları oyla
+    
+    Parametreler:
+        plate_images: Kırpılmış plaka görüntüleri listesi
+        detected_plates: Karşılık gelen tespitler listesi [x1, y1, x2, y2, güven]
+        ocr: Başlatılmış PlateOCR nesnesi
+        tracker: Kareler boyunca durumu koruyan PlateTracker nesnesi
+        ocr_variant: OCR_PREPROCESSING_VARIANTS içindeki ön işleme varyantının adı
+        quality_gate: True ise okunamayacak kırpıntılarda OCR izlemenin sonraki karelerine ertelenir
         
-        # İşaretlenmiş görüntüyü kaydet
-        result_path = os.path.join('results/images', f"result_{os.path.basename(image_path)}")
-        cv2.imwrite(result_path, annotated_image)
+    Dönüş:
+        recognized_plates: İzleme kimliği ve oylanmış metni içeren plaka listesi
+    """
+    preprocess = OCR_PREPROCESSING_VARIANTS[ocr_variant]
+    track_ids = tracker.update(detected_plates)
+    quality = assess_crop_quality(plate_images) if quality_gate else None
+    recognized_plates = []
+    
+    for i, plate_img in enumerate(plate_images):
+        x1, y1, x2, y2, det_conf = detected_plates[i]
+        track_id = track_ids[i]
+        skip_reason = quality[i]['reason'] if quality else None
         
-        # Her bir plakayı ayrı kaydet
-        for i, plate_img in enumerate(plate_images):
-            plate_path = os.path.join('results/plates', f"plate_{i}_{os.path.basename(image_path)}")
-            cv2.imwrite(plate_path, plate_img)
+        # Kararlı okunmuş izlemelerde ve okunamayacak kırpıntılarda OCR'ı atla
+        ocr_performed = skip_reason is None and tracker.should_ocr(track_id, plate_img, det_conf)
+        if ocr_performed:
+            plate_text, ocr_confidence = ocr.recognize_plate(preprocess(plate_img))
+            read_text, read_valid = ocr.analyze_results(plate_text, plate_text)
+            tracker.add_read(track_id, read_text, ocr_confidence, read_valid)
+        
+        track = tracker.get_track(track_id)
+        final_text, is_valid = ocr.analyze_results(track.text, track.text)
+        
+        recognized_plates.append({
+            'text': final_text,
+            'position': [x1, y1, x2, y2],
+            'detection_confidence': det_conf,
+            'ocr_confidence': track.confidence,
+            'is_valid': is_valid,
+            'track_id': track_id,
+            'ocr_performed': ocr_performed,
+            'skip_reason': skip_reason
+        })
+    
+    return recognized_plates
+
+def detect_plate_regions(image, detector, rectify=False, prefilter=None, image_name=None):
+    """
+    Görüntüdeki plakaları tespit et ve kırpıntılarını çıkar
+    
+    Parametreler:
+        image: Giriş görüntüsü
+        detector: Başlatılmış PlateDetector nesnesi
+        rectify: True ise plakalar köşelerinden düzeltilip sabit boyuta getirilir
+        prefilter: RegionPrefilter veya ROIPrior nesnesi. Verilirse YOLO yalnızca ön filtrenin seçtiği bölgede
+                   çalıştırılır (aday bulunmayan karelerde hiç çalıştırılmaz)
+        image_name: Ön filtre raporu ve kaynak (kamera) ayrımı için görüntü adı
+        
+    Dönüş:
+        detected_plates: Tespitler listesi [x1, y1, x2, y2, güven]
+        annotated_image: Tespit kutuları çizilmiş görüntü
+        plate_images: Kırpılmış plaka görüntüleri listesi
+    """
+    if prefilter is not None:
+        detect = lambda img, **kwargs: prefilter.detect(img, detector, image_name, **kwargs)
+    else:
+        detect = detector.detect
+    
+    if rectify:
+        detected_plates, annotated_image, corners = detect(image, return_corners=True)
+        plate_images = detector.extract_plate_regions(image, detected_plates, corners, rectify_size=RECTIFIED_PLATE_SIZE)
+    else:
+        detected_plates, annotated_image = detect(image)
+        plate_images = detector.extract_plate_regions(image, detected_plates)
+    
+    return detected_plates, annotated_image, plate_images
+
+def annotate_plate_texts(annotated_image, recognized_plates):
+    """
+    İşaretlenmiş görüntüye tanınan plaka metinlerini yaz
+    
+    Parametreler:
+        annotated_image: Tespit kutuları çizilmiş görüntü (yerinde değiştirilir)
+        recognized_plates: Tanınan plakalar listesi
+    """
+    for plate in recognized_plates:
+        x1, y1, x2, y2 = plate['position']
+        cv2.putText(annotated_image, plate['text'], (x1, y2 + 30),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 0, 255), 2)
+
+def save_image_results(image_path, annotated_image, plate_images):
+    """
+    İşaretlenmiş görüntüyü ve plaka kırpıntılarını results/ altına kaydet
+    
+    Parametreler:
+        image_path: Giriş görüntüsünün yolu (dosya adları için)
+        annotated_image: İşaretlenmiş görüntü
+        plate_images: Kırpılmış plaka görüntüleri listesi
+    """
+    os.makedirs('results/images', exist_ok=True)
+    os.makedirs('results/plates', exist_ok=True)
+    
+    # İşaretlenmiş görüntüyü kaydet
+    result_path = os.path.join('results/images', f"result_{os.path.basename(image_path)}")
+    atomic_imwrite(result_path, annotated_image)
+    
+    # Her bir plakayı ayrı kaydet
+    for i, plate_img in enumerate(plate_images):
+        plate_path = os.path.join('results/plates', f"plate_{i}_{os.path.basename(image_path)}")
+        atomic_imwrite(plate_path, plate_img)
+
+def process_single_image(image_path, detector, ocr, save_results=True, display=False, ocr_variant='default',
+                         tracker=None, rectify=False, quality_gate=False, prefilter=None, crop_bank=None,
+                         model_version=None):
+    """
+    Tek bir görüntüde plaka tespiti ve tanıma işlemi yap
+    
+    Parametreler:
+        image_path: Giriş görüntüsünün yolu
+        detector: Başlatılmış PlateDetector nesnesi
+        ocr: Başlatılmış PlateOCR nesnesi
+        save_results: Sonuçların diske kaydedilip kaydedilmeyeceği
+        display: Sonuçların gösterilip gösterilmeyeceği
+        ocr_variant: OCR ön işleme varyantı ('default', 'v1' veya 'none')
+        tracker: Ardışık kareler için PlateTracker nesnesi. Verilirse OCR yalnızca gerektiğinde yapılır
+        rectify: True ise plakalar köşelerinden düzeltilip sabit boyuta getirilir (köşe noktası modeli ile)
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez
+        prefilter: RegionPrefilter veya ROIPrior nesnesi. Verilirse YOLO'dan önce arama bölgesi daraltılır
+        crop_bank: CropBank nesnesi. Verilirse OCR öncesi kırpıntılar bankaya eklenir
+        model_version: Model kaydındaki sürüm. Verilirse her plakaya 'model_version' olarak eklenir
+        
+    Dönüş:
+        recognized_plates: Tanınan plakaların metin ve konumlarını içeren liste
+        result_image: Tespit kutuları ve tanınan metinlerle işaretlenmiş görüntü
+    """
+    # Görüntüyü oku
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"Hata: {image_path} konumundaki görüntü okunamadı")
+        return [], None
+    
+    # Görüntüyü ön işle
+    preprocessed = preprocess_image_for_plate_detection(image)
+    
+    # Plakaları tespit et ve bölgelerini çıkar
+    detected_plates, annotated_image, plate_images = detect_plate_regions(image, detector, rectify, prefilter,
+                                                                          os.path.basename(image_path))
+    
+    # Kırpıntıları sonraki yalnızca OCR denemeleri için bankaya ekle
+    if crop_bank is not None:
+        crop_bank.add_crops(image_path, detected_plates, plate_images, detector.model_path, rectify)
+    
+    # Plaka karakterlerini tanı
+    if tracker is not None:
+        recognized_plates = recognize_tracked_plates(plate_images, detected_plates, ocr, tracker, ocr_variant,
+                                                     quality_gate)
+    else:
+        recognized_plates = recognize_plate_images(plate_images, detected_plates, ocr, ocr_variant, quality_gate)
+    
+    if model_version is not None:
+        for plate in recognized_plates:
+            plate['model_version'] = model_version
+    
+    # İşaretlenmiş görüntüye tanınan metni ekle
+    annotate_plate_texts(annotated_image, recognized_plates)
+    
+    # Sonuçları kaydet
+    if save_results:
+        save_image_results(image_path, annotated_image, plate_images)
     
     # Sonuçları göster
     if display:
@@ -95,7 +278,304 @@ def process_single_image(image_path, detector, ocr, save_results=True, display=F
     
     return recognized_plates, annotated_image
 
-def process_dataset(dataset_path, detector, ocr, ground_truth=None):
+def process_image_with_budget(image_path, detector, ocr, budget, arrival_time=None, save_results=True,
+                              ocr_variant='default', rectify=False, quality_gate=False, model_version=None):
+    """
+    Tek bir görüntüyü kare başına süre bütçesi içinde işle
+    
+    Kalan süre yetmediğinde sırasıyla daha düşük tespit çözünürlüğüne, işaretleme ve kaydetmeyi
+    atlamaya ve en son metinsiz (yalnızca tespit) sonuç döndürmeye geçilir. Her plakaya
+    kullanılan seviye 'degradation_level' olarak eklenir (DEGRADATION_LEVELS indeksi).
+    
+    Parametreler:
+        image_path: Giriş görüntüsünün yolu
+        detector: Başlatılmış PlateDetector nesnesi
+        ocr: Başlatılmış PlateOCR nesnesi
+        budget: LatencyBudget nesnesi
+        arrival_time: İsteğin geliş anı (time.monotonic). Verilirse kuyrukta geçen süre de bütçeden düşülür
+        save_results: Sonuçların diske kaydedilip kaydedilmeyeceği
+        ocr_variant: OCR ön işleme varyantı
+        rectify: True ise plakalar köşelerinden düzeltilip sabit boyuta getirilir
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez
+        model_version: Model kaydındaki sürüm. Verilirse her plakaya 'model_version' olarak eklenir
+        
+    Dönüş:
+        recognized_plates: Tanınan plakalar listesi
+        result_image: İşaretlenmiş görüntü (okunamazsa None)
+    """
+    deadline = budget.start(arrival_time)
+    
+    image = cv2.imread(image_path)
+    if image is None:
+        print(f"Hata: {image_path} konumundaki görüntü okunamadı")
+        return [], None
+    
+    level = budget.choose_level(deadline)
+    options = DEGRADATION_LEVELS[level]
+    
+    # Düşük çözünürlüklü seviyede tespit daha küçük giriş boyutuyla yapılır
+    start = time.monotonic()
+    full_size = detector.img_size
+    if options['low_res']:
+        detector.set_image_size(budget.low_res_size)
+    try:
+        detected_plates, annotated_image, plate_images = detect_plate_regions(image, detector, rectify)
+    finally:
+        detector.set_image_size(full_size)
+    budget.observe('detect_low_res' if options['low_res'] else 'detect', time.monotonic() - start)
+    
+    # Gerçek plaka sayısıyla OCR ve kaydetme hâlâ sığıyor mu?
+    level = budget.after_detection(level, deadline, len(detected_plates))
+    options = DEGRADATION_LEVELS[level]
+    
+    if options['ocr']:
+        start = time.monotonic()
+        recognized_plates = recognize_plate_images(plate_images, detected_plates, ocr, ocr_variant, quality_gate)
+        if detected_plates:
+            budget.observe('ocr_per_plate', (time.monotonic() - start) / len(detected_plates))
+    else:
+        recognized_plates = [{
+            'text': '',
+            'position': [x1, y1, x2, y2],
+            'detection_confidence': det_conf,
+            'ocr_confidence': 0.0,
+            'is_valid': False,
+            'skip_reason': 'latency_budget'
+        } for x1, y1, x2, y2, det_conf in detected_plates]
+    
+    if options['annotate'] and save_results:
+        start = time.monotonic()
+        annotate_plate_texts(annotated_image, recognized_plates)
+        save_image_results(image_path, annotated_image, plate_images)
+        budget.observe('annotate', time.monotonic() - start)
+    
+    for plate in recognized_plates:
+        plate['degradation_level'] = level
+        if model_version is not None:
+            plate['model_version'] = model_version
+    budget.finish(level, deadline)
+    
+    return recognized_plates, annotated_image
+
+def list_dataset_images(dataset_path, recursive=False):
+    """
+    Veri setindeki görüntü dosyalarını kararlı bir sırayla listele
+    
+    Parametreler:
+        dataset_path: Veri seti dizininin yolu
+        recursive: True ise alt dizinler de taranır (örneğin UFPR-ALPR izleme klasörleri)
+        
+    Dönüş:
+        Veri seti dizinine göreli yola göre sıralanmış görüntü yolları listesi
+    """
+    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
+    image_files = []
+    pattern = '**/*' if recursive else '*'
+    
+    for ext in image_extensions:
+        image_files.extend(list(Path(dataset_path).glob(f'{pattern}{ext}')))
+    
+    # Farklı makinelerde aynı sırayı (ve aynı parça atamasını) elde etmek için göreli yola göre sırala;
+    # yalnızca dosya adına göre sıralamada farklı klasörlerdeki aynı adlı dosyalar glob sırasında kalırdı
+    return sorted(image_files, key=lambda p: dataset_image_key(p, dataset_path))
+
+def dataset_image_key(img_path, dataset_path):
+    """
+    Görüntünün günlükte, görüntü bazlı sonuçlarda ve metriklerde kullanılan anahtarını döndür
+    
+    Anahtar veri seti dizinine göreli yoldur; böylece özyinelemeli taramada farklı klasörlerdeki aynı
+    adlı dosyalar birbirinin sonucunu ezmez. Düz veri setlerinde dosya adıyla aynıdır.
+    
+    Parametreler:
+        img_path: Görüntü yolu
+        dataset_path: Veri seti dizininin yolu
+        
+    Dönüş:
+        '/' ayraçlı göreli yol
+    """
+    return Path(img_path).relative_to(dataset_path).as_posix()
+
+def parse_shard(shard_spec):
+    """
+    "i/N" biçimindeki parça tanımını ayrıştır
+    
+    Parametreler:
+        shard_spec: Parça tanımı (örneğin "0/4")
+        
+    Dönüş:
+        (parça_indeksi, parça_sayısı) demeti
+    """
+    try:
+        index, count = (int(part) for part in shard_spec.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz parça tanımı: {shard_spec} (beklenen biçim: i/N)")
+    
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Parça indeksi 0 ile {count - 1} arasında olmalı: {shard_spec}")
+    
+    return index, count
+
+def select_shard(image_files, shard_index, shard_count):
+    """
+    Sıralı görüntü listesinden belirli bir parçaya düşen görüntüleri seç
+    
+    Parametreler:
+        image_files: list_dataset_images ile elde edilen sıralı görüntü listesi
+        shard_index: Seçilecek parçanın indeksi (0 tabanlı)
+        shard_count: Toplam parça sayısı
+        
+    Dönüş:
+        Bu parçaya ait görüntülerin listesi
+    """
+    return [img_path for i, img_path in enumerate(image_files) if i % shard_count == shard_index]
+
+def shard_output_dir(results_dir, shard_index, shard_count):
+    """
+    Bir parçanın çıktılarının kaydedileceği dizini döndür
+    """
+    return os.path.join(results_dir, 'shards', f'shard_{shard_index:03d}_of_{shard_count:03d}')
+
+def load_ground_truth(ground_truth):
+    """
+    Gerçek etiket dosyasını yükle
+    
+    Parametreler:
+        ground_truth: Görüntü adından {'plates': [{'text', 'position'}]} bilgisine eşleyen JSON dosyasının
+                      veya UFPR-ALPR veri seti dizininin (kare başına .txt açıklamalarıyla) yolu
+        
+    Dönüş:
+        Gerçek etiket sözlüğü veya UFPRIndex (dosya yoksa boş sözlük)
+    """
+    if not ground_truth or not os.path.exists(ground_truth):
+        return {}
+    
+    # UFPR açıklamaları dönüştürülmeden, önbellekli indeks üzerinden kullanılır
+    if os.path.isdir(ground_truth):
+        return UFPRIndex.load_or_build(ground_truth)
+    
+    with open(ground_truth, 'r') as f:
+        return json.load(f)
+
+def update_metrics(evaluator, image_key, recognized_plates, gt_data):
+    """
+    Bir görüntünün tanıma sonuçlarıyla değerlendirme metriklerini güncelle
+    
+    Parametreler:
+        evaluator: Güncellenecek EvaluationMetrics nesnesi
+        image_key: Görüntünün anahtarı (dataset_image_key veya dosya adı); gerçek etiketler dosya adıyla aranır
+        recognized_plates: process_single_image tarafından döndürülen plaka listesi
+        gt_data: Görüntü adından gerçek etiketlere sözlük
+    """
+    # Gerçek etiketler yoksa değerlendirilecek bir şey yok
+    img_filename = os.path.basename(image_key)
+    if img_filename not in gt_data:
+        return
+    
+    gt_info = gt_data[img_filename]
+    
+    # Değerlendirme için formatla
+    gt_boxes = [box['position'] for box in gt_info['plates']]
+    gt_texts = [plate['text'] for plate in gt_info['plates']]
+    
+    detected_boxes = [plate['position'] + [plate['detection_confidence']] for plate in recognized_plates]
+    detected_texts = [plate['text'] for plate in recognized_plates]
+    
+    # Tespiti değerlendir
+    precision, recall, f1 = evaluator.evaluate_detection(gt_boxes, detected_boxes)
+    
+    # Plaka tespit edildiyse OCR'ı değerlendir
+    if detected_texts and gt_texts:
+        char_acc, exact_acc = evaluator.evaluate_ocr(gt_texts[:len(detected_texts)], detected_texts)
+        
+        # Tespit sonucunu ekle
+        for i, plate in enumerate(recognized_plates):
+            if i < len(gt_info['plates']):
+                evaluator.add_detection_result(
+                    image_key,
+                    gt_info['plates'][i],
+                    {
+                        'position': plate['position'],
+                        'confidence': plate['detection_confidence']
+                    },
+                    {
+                        'text': plate['text'],
+                        'confidence': plate['ocr_confidence']
+                    }
+                )
+
+def iter_sequential_results(image_files, detector, ocr, ocr_variant='default', tracker=None, rectify=False,
+                            quality_gate=False, prefilter=None, budget=None, crop_bank=None):
+    """
+    Görüntüleri bu süreçte sırayla işle ve sonuçları run_pipeline ile aynı biçimde üret
+    
+    budget (LatencyBudget) verilirse her görüntü process_image_with_budget ile süre bütçesi içinde işlenir.
+    tracker verilirse görüntünün klasörü değiştiğinde (örneğin UFPR'de yeni izleme klasörü) sıfırlanır;
+    böylece önceki aracın kararlı izlemesi yeni aracın ilk karesiyle eşleşip okumasını devralamaz.
+    
+    Dönüş:
+        (görüntü_yolu, tanınan_plakalar, işlem_süresi, hata) demetleri üreten üreteç
+    """
+    current_folder = None
+    for img_path in image_files:
+        image_start = time.perf_counter()
+        if tracker is not None and Path(img_path).parent != current_folder:
+            tracker.reset()
+            current_folder = Path(img_path).parent
+        
+        if budget is not None:
+            recognized_plates, _ = process_image_with_budget(str(img_path), detector, ocr, budget,
+                                                             ocr_variant=ocr_variant, rectify=rectify,
+                                                             quality_gate=quality_gate)
+            yield img_path, recognized_plates, time.perf_counter() - image_start, None
+            continue
+        
+        recognized_plates, _ = process_single_image(str(img_path), detector, ocr, save_results=True, display=False,
+                                                    ocr_variant=ocr_variant, tracker=tracker, rectify=rectify,
+                                                    quality_gate=quality_gate, prefilter=prefilter,
+                                                    crop_bank=crop_bank)
+        yield img_path, recognized_plates, time.perf_counter() - image_start, None
+
+def iter_pooled_results(image_files, pool, clients=None):
+    """
+    Görüntüleri çok iş parçacıklı tespit/OCR havuzunda işle ve sonuçları giriş sırasıyla üret
+    
+    Parametreler:
+        image_files: İşlenecek görüntü yolları
+        pool: EnginePool nesnesi
+        clients: Havuza aynı anda görüntü veren iş parçacığı sayısı (None ise havuzdaki işçi sayısı)
+        
+    Dönüş:
+        (görüntü_yolu, tanınan_plakalar, işlem_süresi, hata) demetleri üreten üreteç
+    """
+    def process(img_path):
+        start = time.perf_counter()
+        image = cv2.imread(str(img_path))
+        if image is None:
+            return img_path, [], time.perf_counter() - start, "görüntü okunamadı"
+        
+        recognized_plates, annotated_image, plate_images = pool.process(image)
+        if pool.settings['save_results']:
+            annotate_plate_texts(annotated_image, recognized_plates)
+            save_image_results(str(img_path), annotated_image, plate_images)
+        return img_path, recognized_plates, time.perf_counter() - start, None
+    
+    clients = clients or pool.detector_replicas + pool.plan['ocr_workers']
+    
+    with ThreadPoolExecutor(clients, thread_name_prefix='plate-client') as executor:
+        # Bellekte tutulan görüntü sayısını sınırlamak için en fazla 2 x clients iş beklesin
+        pending = deque()
+        for img_path in image_files:
+            pending.append(executor.submit(process, img_path))
+            if len(pending) >= 2 * clients:
+                yield pending.popleft().result()
+        
+        while pending:
+            yield pending.popleft().result()
+
+def process_dataset(dataset_path, detector, ocr, ground_truth=None, shard=None, results_dir='results', resume=False,
+                    store=None, ocr_variant='default', track=False, rectify=False, quality_gate=False,
+                    pipeline_workers=None, prefilter=None, engine_pool=None, latency_budget=None, roi_prior=None,
+                    crop_bank=None, model_version=None):
     """
     Görüntü veri setini işle ve performansı değerlendir
     
@@ -104,87 +584,365 @@ def process_dataset(dataset_path, detector, ocr, ground_truth=None):
         detector: Başlatılmış PlateDetector nesnesi
         ocr: Başlatılmış PlateOCR nesnesi
         ground_truth: Gerçek etiket dosyasının yolu (isteğe bağlı)
+        shard: Yalnızca belirli bir parçayı işlemek için (parça_indeksi, parça_sayısı) demeti (isteğe bağlı)
+        results_dir: Değerlendirme çıktılarının kaydedileceği ana dizin
+        resume: True ise günlükte tamamlanmış görünen görüntüler atlanır ve metrikler günlükten yeniden kurulur
+        store: Okumaların kaydedileceği PlateStore nesnesi (isteğe bağlı)
+        ocr_variant: OCR ön işleme varyantı ('default', 'v1' veya 'none')
+        track: True ise görüntüler sıralı kareler olarak izlenir ve OCR izleme başına birkaç kareyle sınırlanır
+        rectify: True ise plakalar köşelerinden düzeltilip sabit boyuta getirilir
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez ve atlanma nedenleri raporlanır
+        pipeline_workers: (tespit_süreci, ocr_süreci) sayıları verilirse görüntüler paylaşılan bellekli
+                          çok süreçli hatta işlenir
+        prefilter: Aday bölge ön filtresi modu ('skip' veya 'crop'). Sonda ön filtrenin geri çağırma kaybı raporlanır
+        engine_pool: Tespit modeli kopyası sayısı verilirse görüntüler bu süreçte çok iş parçacıklı
+                     havuzda işlenir; çekirdekler ilk görüntülerde ölçülen aşama maliyetlerine göre paylaştırılır
+        latency_budget: Kare başına süre bütçesi (ms). Verilirse bütçe daraldığında daha ucuz seviyelere geçilir
+        roi_prior: ROIPrior nesnesi. Verilirse YOLO kaynak başına öğrenilen ilgi bölgesinde çalıştırılır ve
+                   sonda bölge dışında kalan gerçek plakalar raporlanır
+        crop_bank: CropBank nesnesi. Verilirse kırpıntılar gerçek metinleriyle birlikte bankaya eklenir
+        model_version: Model kaydındaki sürüm. Verilirse her plakaya 'model_version' olarak eklenir
         
     Dönüş:
-        Değerlendirme sonuçlarını içeren EvaluationMetrics nesnesi
+        Değerlendirme sonuçlarını içeren EvaluationMetrics nesnesi; çok süreçli hat eksik tamamlanırsa None
     """
+    # Parça çalıştırmalarında her parça kendi dizinine yazar
+    save_dir = shard_output_dir(results_dir, *shard) if shard else results_dir
+    
     # Değerlendirme metriklerini başlat
-    evaluator = EvaluationMetrics()
+    evaluator = EvaluationMetrics(save_dir=save_dir)
     
     # Gerçek etiketleri yükle (varsa)
-    gt_data = {}
-    if ground_truth and os.path.exists(ground_truth):
-        import json
-        with open(ground_truth, 'r') as f:
-            gt_data = json.load(f)
+    gt_data = load_ground_truth(ground_truth)
     
-    # Görüntü dosyalarının listesini al
-    image_extensions = ['.jpg', '.jpeg', '.png', '.bmp']
-    image_files = []
+    # Görüntü dosyalarının listesini al (UFPR görüntüleri izleme klasörlerindedir)
+    image_files = list_dataset_images(dataset_path, recursive=isinstance(gt_data, UFPRIndex))
     
-    for ext in image_extensions:
-        image_files.extend(list(Path(dataset_path).glob(f'*{ext}')))
+    if shard:
+        image_files = select_shard(image_files, *shard)
+        print(f"Parça {shard[0]}/{shard[1]} seçildi")
     
     total_images = len(image_files)
     processed_images = 0
+    image_results = {}
+    
+    # Tamamlanan görüntüler günlüğü (çökme sonrası devam için)
+    journal = ProcessingJournal(os.path.join(save_dir, 'journal.jsonl'), resume=resume)
+    
+    if resume:
+        # Daha önce tamamlanan görüntülerin metriklerini günlükten yeniden kur
+        for img_path in image_files:
+            image_key = dataset_image_key(img_path, dataset_path)
+            if journal.is_completed(image_key):
+                recognized_plates = journal.completed[image_key]['plates']
+                image_results[image_key] = recognized_plates
+                update_metrics(evaluator, image_key, recognized_plates, gt_data)
+                processed_images += 1
+        
+        print(f"Günlükten {processed_images} tamamlanmış görüntü yüklendi")
+    
+    resumed_images = processed_images
+    
+    pending_files = [p for p in image_files if not journal.is_completed(dataset_image_key(p, dataset_path))]
+    
+    if pipeline_workers and track:
+        print("Uyarı: Çok süreçli hatta kareler sırasız tamamlandığı için izleme kapatıldı")
+        track = False
+    
+    if pipeline_workers and prefilter:
+        print("Uyarı: Aday bölge ön filtresi çok süreçli hatta desteklenmiyor; ön filtre kapatıldı")
+        prefilter = None
+    
+    if pipeline_workers and engine_pool:
+        print("Uyarı: Çok süreçli hat kullanıldığı için iş parçacığı havuzu kapatıldı")
+        engine_pool = None
+    
+    if engine_pool and (track or prefilter):
+        print("Uyarı: İzleme ve aday bölge ön filtresi iş parçacığı havuzunda desteklenmiyor; kapatıldı")
+        track = False
+        prefilter = None
+    
+    if latency_budget and (pipeline_workers or engine_pool):
+        print("Uyarı: Süre bütçesi yalnızca sıralı işlemede destekleniyor; bütçe kapatıldı")
+        latency_budget = None
+    
+    if latency_budget and (track or prefilter):
+        print("Uyarı: Süre bütçesi kullanıldığı için izleme ve aday bölge ön filtresi kapatıldı")
+        track = False
+        prefilter = None
+    
+    if roi_prior and (pipeline_workers or engine_pool or latency_budget):
+        print("Uyarı: İlgi bölgesi yalnızca sıralı işlemede destekleniyor; kapatıldı")
+        roi_prior = None
+    
+    if roi_prior and prefilter:
+        print("Uyarı: İlgi bölgesi kullanıldığı için aday bölge ön filtresi kapatıldı")
+        prefilter = None
+    
+    if roi_prior:
+        # Görüntü başına bölgeler yalnızca geri çağırma raporu üretilecekse saklanır
+        roi_prior.record_regions = bool(gt_data)
+    
+    if crop_bank and (pipeline_workers or engine_pool or latency_budget):
+        print("Uyarı: Kırpıntı bankası yalnızca sıralı işlemede destekleniyor; kapatıldı")
+        crop_bank = None
     
-    print(f"{total_images} görüntü işlenecek...")
+    if crop_bank:
+        crop_bank.gt_data = gt_data or {}
+        bank_start_count = crop_bank.count()
+    budget = LatencyBudget(latency_budget) if latency_budget else None
+    region_prefilter = RegionPrefilter(mode=prefilter) if prefilter else None
+    
+    # Bir klasördeki kareler yol sırasıyla ardışık gelir; izleyici klasör değişiminde sıfırlanır
+    tracker = PlateTracker() if track else None
+    print(f"{total_images - processed_images} görüntü işlenecek...")
     
     start_time = time.time()
     
-    for img_path in image_files:
-        # Görüntüyü işle
-        img_filename = os.path.basename(img_path)
-        recognized_plates, _ = process_single_image(str(img_path), detector, ocr, save_results=True, display=False)
-        
-        # Gerçek etiketler varsa değerlendirme metriklerini güncelle
-        if img_filename in gt_data:
-            gt_info = gt_data[img_filename]
+    if pipeline_workers:
+        settings = pipeline_settings(detector, ocr, ocr_variant, quality_gate, rectify)
+        results = run_pipeline(pending_files, settings, *pipeline_workers)
+    elif engine_pool:
+        settings = pipeline_settings(detector, ocr, ocr_variant, quality_gate, rectify)
+        pool = EnginePool.calibrate(settings, pending_files[:5], detector_replicas=engine_pool)
+        results = iter_pooled_results(pending_files, pool)
+    else:
+        results = iter_sequential_results(pending_files, detector, ocr, ocr_variant, tracker, rectify, quality_gate,
+                                          region_prefilter or roi_prior, budget, crop_bank)
+    
+    try:
+        for img_path, recognized_plates, seconds, error in results:
+            image_key = dataset_image_key(img_path, dataset_path)
+            if error:
+                print(f"Hata: {img_path}: {error}")
             
-            # Değerlendirme için formatla
-            gt_boxes = [box['position'] for box in gt_info['plates']]
-            gt_texts = [plate['text'] for plate in gt_info['plates']]
+            if model_version is not None:
+                for plate in recognized_plates:
+                    plate['model_version'] = model_version
             
-            detected_boxes = [plate['position'] + [plate['detection_confidence']] for plate in recognized_plates]
-            detected_texts = [plate['text'] for plate in recognized_plates]
+            evaluator.add_timing(seconds)
+            image_results[image_key] = recognized_plates
             
-            # Tespiti değerlendir
-            precision, recall, f1 = evaluator.evaluate_detection(gt_boxes, detected_boxes)
+            update_metrics(evaluator, image_key, recognized_plates, gt_data)
             
-            # Plaka tespit edildiyse OCR'ı değerlendir
-            if detected_texts and gt_texts:
-                char_acc, exact_acc = evaluator.evaluate_ocr(gt_texts[:len(detected_texts)], detected_texts)
-                
-                # Tespit sonucunu ekle
-                for i, plate in enumerate(recognized_plates):
-                    if i < len(gt_info['plates']):
-                        evaluator.add_detection_result(
-                            img_filename,
-                            gt_info['plates'][i],
-                            {
-                                'position': plate['position'],
-                                'confidence': plate['detection_confidence']
-                            },
-                            {
-                                'text': plate['text'],
-                                'confidence': plate['ocr_confidence']
-                            }
-                        )
-        
-        processed_images += 1
-        if processed_images % 10 == 0:
-            print(f"{processed_images}/{total_images} görüntü işlendi")
+            # Okumaları aranabilir depoya ekle
+            if store:
+                store.add_reads(str(img_path), recognized_plates)
+            
+            # Tamamlanan görüntüyü günlüğe yaz
+            journal.record(image_key, recognized_plates)
+            
+            processed_images += 1
+            if processed_images % 10 == 0:
+                print(f"{processed_images}/{total_images} görüntü işlendi")
+    except RuntimeError as e:
+        # Eksik çalıştırmanın metrikleri tam sonuç gibi kaydedilmez; tamamlananlar günlükte kalır
+        print(f"Hata: {str(e)}")
+        print(f"{processed_images}/{total_images} görüntü tamamlandı; kalanlar için --resume ile yeniden çalıştırın")
+        return None
+    finally:
+        journal.close()
+        if engine_pool:
+            pool.close()
     
     end_time = time.time()
     processing_time = end_time - start_time
     
     print(f"İşlem {processing_time:.2f} saniyede tamamlandı")
-    print(f"Görüntü başına ortalama süre: {processing_time/total_images:.2f} saniye")
+    new_images = processed_images - resumed_images
+    if new_images > 0:
+        print(f"Görüntü başına ortalama süre: {processing_time/new_images:.2f} saniye")
+    
+    if tracker:
+        stats = tracker.stats
+        print(f"İzleme: {stats['tracks']} izleme, {stats['detections']} tespit için {stats['ocr_calls']} OCR çağrısı")
+    
+    if budget:
+        budget.report()
+    
+    if region_prefilter:
+        report = region_prefilter.recall_report(gt_data)
+        print(f"Ön filtre ({prefilter}): karelerin %{report['skip_rate'] * 100:.1f}'inde YOLO atlandı, "
+              f"kare başına {report['mean_ms']:.1f} ms")
+        if region_prefilter.mode == 'crop':
+            print(f"  YOLO'ya verilen ortalama alan: karenin %{report['mean_area_ratio'] * 100:.1f}'i")
+        if report['prefilter_recall'] is not None:
+            print(f"  Gerçek plakaların {report['lost_plates']}/{report['gt_plates']} tanesi ön filtrede kaybedildi "
+                  f"(ön filtre geri çağırması: {report['prefilter_recall']:.3f})")
+    
+    if roi_prior:
+        roi_prior.report(gt_data)
+    
+    if crop_bank:
+        print(f"Kırpıntı bankası: {crop_bank.count() - bank_start_count} yeni kırpıntı "
+              f"(toplam {crop_bank.count()}, {crop_bank.count(labeled_only=True)} etiketli) -> {crop_bank.bank_dir}")
+    
+    if detector.cache is not None:
+        print(f"Tespit önbelleği: {detector.cache.stats['hits']} isabet, {detector.cache.stats['misses']} ıskalama")
+    
+    if quality_gate:
+        # Kalite kapısının OCR'dan çevirdiği kırpıntıları nedenlerine göre say
+        skip_counts = Counter(plate.get('skip_reason') for plates in image_results.values() for plate in plates)
+        total_crops = sum(skip_counts.values())
+        skipped = total_crops - skip_counts[None]
+        print(f"Kalite kapısı: {total_crops} kırpıntının {skipped} tanesinde OCR atlandı")
+        for reason, count in skip_counts.most_common():
+            if reason is not None:
+                print(f"  {reason}: {count}")
     
     # Değerlendirme sonuçlarını görselleştir ve kaydet
     plot_path, csv_path = evaluator.plot_results()
     print(f"Değerlendirme sonuçları {plot_path} ve {csv_path} konumlarına kaydedildi")
     
+    # Parça sonuçlarını birleştirme aracı için kaydet
+    if shard:
+        save_shard_results(save_dir, shard, evaluator, image_results)
+    
+    return evaluator
+
+def process_spool(spool_dir, detector, ocr, output_dir=None, store=None, ocr_variant='default', track=False,
+                  rectify=False, quality_gate=False, max_in_flight=8, settle_seconds=1.0, registry=None,
+                  latency_budget=None, roi_prior=None):
+    """
+    Kameraların görüntü bıraktığı biriktirme dizinini sürekli izleyerek gelen görüntüleri işle
+    
+    Parametreler:
+        spool_dir: İzlenecek dizin
+        detector: Başlatılmış PlateDetector nesnesi
+        ocr: Başlatılmış PlateOCR nesnesi
+        output_dir: processed/, failed/ dizinlerinin ve günlüğün yeri (None ise spool_dir)
+        store: Okumaların kaydedileceği PlateStore nesnesi (isteğe bağlı)
+        ocr_variant: OCR ön işleme varyantı
+        track: True ise her kameranın (dosya adının ilk "_" veya "-" öncesi) görüntüleri ayrı bir izleyicide
+               ardışık kareler olarak izlenir
+        rectify: True ise plakalar köşelerinden düzeltilip sabit boyuta getirilir
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez
+        max_in_flight: Sahiplenilmiş ama tamamlanmamış en fazla dosya sayısı
+        settle_seconds: Dosyanın hazır sayılması için değişmeden kalması gereken süre (saniye)
+        registry: ModelRegistry nesnesi. Verilirse her görüntü o anki etkin model sürümüyle işlenir ve
+                  sonuçlara 'model_version' eklenir; detector kullanılmaz
+        latency_budget: Dosyanın hazır olduğu andan itibaren süre bütçesi (ms). Birikme olduğunda
+                        kuyrukta bekleyen dosyalar daha ucuz seviyelerde işlenir
+        roi_prior: ROIPrior nesnesi. Verilirse YOLO her kameranın öğrenilen ilgi bölgesinde çalıştırılır;
+                   kamera, dosya adından ROIPrior.source_of ile belirlenir
+        
+    Dönüş:
+        İşlenen dosya sayısı
+    """
+    if latency_budget and track:
+        print("Uyarı: Süre bütçesi kullanıldığı için izleme kapatıldı")
+        track = False
+    if latency_budget and roi_prior:
+        print("Uyarı: Süre bütçesi kullanıldığı için ilgi bölgesi kapatıldı")
+        roi_prior = None
+    # İlgisiz kameraların kareleri birbirinin izlemelerini devralmasın diye her kameranın kendi izleyicisi vardır
+    trackers = defaultdict(PlateTracker) if track else None
+    budget = LatencyBudget(latency_budget) if latency_budget else None
+    
+    def run(image_path, ready_time, image_detector):
+        if budget is not None:
+            return process_image_with_budget(image_path, image_detector, ocr, budget, arrival_time=ready_time,
+                                             ocr_variant=ocr_variant, rectify=rectify, quality_gate=quality_gate)
+        return process_single_image(image_path, image_detector, ocr, save_results=True, display=False,
+                                    ocr_variant=ocr_variant,
+                                    tracker=trackers[image_source(image_path)] if track else None,
+                                    rectify=rectify, quality_gate=quality_gate, prefilter=roi_prior)
+    
+    def process_image(image_path, ready_time=None):
+        if registry is None:
+            recognized_plates, result_image = run(image_path, ready_time, detector)
+        else:
+            # Görüntü işlenirken model değiştirilirse bu görüntü eski sürümle tamamlanır
+            with registry.lease() as (model_version, leased_detector):
+                recognized_plates, result_image = run(image_path, ready_time, leased_detector)
+            for plate in recognized_plates:
+                plate['model_version'] = model_version
+        
+        if store and result_image is not None:
+            store.add_reads(image_path, recognized_plates)
+        return recognized_plates, result_image is not None
+    
+    processed = watch_folder(spool_dir, process_image, output_dir=output_dir, max_in_flight=max_in_flight,
+                             settle_seconds=settle_seconds)
+    if budget:
+        budget.report()
+    if roi_prior:
+        roi_prior.report()
+    return processed
+
+def save_shard_results(save_dir, shard, evaluator, image_results):
+    """
+    Bir parçanın görüntü bazlı sonuçlarını ve değerlendirme durumunu kaydet
+    
+    Parametreler:
+        save_dir: Parçanın çıktı dizini
+        shard: (parça_indeksi, parça_sayısı) demeti
+        evaluator: Parçanın EvaluationMetrics nesnesi
+        image_results: Görüntü anahtarından (dataset_image_key) tanınan plakalara sözlük
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    
+    shard_path = os.path.join(save_dir, 'shard_results.json')
+    atomic_write_json(shard_path, {
+        'shard_index': shard[0],
+        'shard_count': shard[1],
+        'images': image_results,
+        'metrics': evaluator.results
+    })
+    
+    print(f"Parça sonuçları kaydedildi: {shard_path}")
+
+def merge_shards(results_dir='results', title="Plaka Tespiti ve Tanıma Sonuçları"):
+    """
+    Parça çıktılarını birleştirerek nihai değerlendirme grafiklerini ve CSV dosyasını üret
+    
+    Parametreler:
+        results_dir: Parçaların 'shards' alt dizininde bulunduğu ana sonuç dizini
+        title: Grafikler için başlık
+        
+    Dönüş:
+        Birleştirilmiş EvaluationMetrics nesnesi veya parça bulunamazsa None
+    """
+    shard_files = sorted(Path(results_dir, 'shards').glob('shard_*_of_*/shard_results.json'))
+    if not shard_files:
+        print(f"Hata: {os.path.join(results_dir, 'shards')} altında parça sonucu bulunamadı")
+        return None
+    
+    evaluator = EvaluationMetrics(save_dir=results_dir)
+    merged_images = {}
+    found_shards = set()
+    shard_counts = set()
+    
+    for shard_file in shard_files:
+        with open(shard_file, 'r', encoding='utf-8') as f:
+            shard_data = json.load(f)
+        
+        found_shards.add(shard_data['shard_index'])
+        shard_counts.add(shard_data['shard_count'])
+        evaluator.merge(shard_data['metrics'])
+        
+        # Görüntüler göreli yollarıyla anahtarlandığı için çakışma yalnızca aynı görüntü iki parçada işlendiyse olur
+        duplicates = merged_images.keys() & shard_data['images'].keys()
+        if duplicates:
+            print(f"Uyarı: {shard_file} içindeki {len(duplicates)} görüntü başka bir parçada da işlenmiş "
+                  f"(örnek: {min(duplicates)})")
+        merged_images.update(shard_data['images'])
+    
+    if len(shard_counts) > 1:
+        print(f"Uyarı: Farklı parça sayılarıyla üretilmiş sonuçlar birleştiriliyor: {sorted(shard_counts)}")
+    
+    missing_shards = set(range(max(shard_counts))) - found_shards
+    if missing_shards:
+        print(f"Uyarı: Eksik parçalar: {sorted(missing_shards)}")
+    
+    print(f"{len(found_shards)} parça birleştirildi ({len(merged_images)} görüntü)")
+    
+    merged_path = os.path.join(results_dir, 'merged_results.json')
+    atomic_write_json(merged_path, merged_images)
+    
+    plot_path, csv_path = evaluator.plot_results(title=title)
+    print(f"Birleştirilmiş sonuçlar {plot_path} ve {csv_path} konumlarına kaydedildi")
+    
     return evaluator
 
 def parse_arguments():
@@ -198,28 +956,161 @@ def parse_arguments():
     parser.add_argument('--image', type=str, help='İşlenecek tek görüntünün yolu')
     parser.add_argument('--dataset', type=str, help='Veri seti dizininin yolu')
     parser.add_argument('--model', type=str, help='Eğitilmiş YOLOv8 model dosyasının yolu')
-    parser.add_argument('--ground-truth', type=str, help='Gerçek etiket dosyasının yolu')
+    parser.add_argument('--ground-truth', type=str, help='Gerçek etiket JSON dosyasının veya UFPR-ALPR dizininin yolu')
     parser.add_argument('--tesseract-path', type=str, help='Tesseract uygulamasının yolu')
     parser.add_argument('--conf-threshold', type=float, default=0.25, help='Tespit için güven eşiği')
+    parser.add_argument('--iou-threshold', type=float, help='Tespit için NMS IoU eşiği (varsayılan: model varsayılanı)')
+    parser.add_argument('--detection-cache', type=str, metavar='CACHE_DIR',
+                        help='Ham tespitleri bu dizinde önbelleğe al; eşik/NMS/OCR denemelerinde model yeniden çalışmaz')
+    parser.add_argument('--img-size', type=int, help='Tespit için giriş görüntüsü boyutu (varsayılan: model varsayılanı)')
+    parser.add_argument('--ocr-variant', type=str, default='default', choices=sorted(OCR_PREPROCESSING_VARIANTS),
+                        help='OCR ön işleme varyantı')
+    parser.add_argument('--ocr-backend', type=str, default='tesseract', choices=['tesseract', 'yolo'],
+                        help='Karakter tanıma arka ucu: Tesseract veya 36 sınıflı YOLO karakter modeli (--char-model)')
+    parser.add_argument('--char-model', type=str, help='Eğitilmiş YOLO karakter modeli (train_ufpr.py --char_model ile)')
     parser.add_argument('--display', action='store_true', help='Sonuçları göster')
+    parser.add_argument('--shard', type=parse_shard, help='Veri setinin yalnızca i/N parçasını işle (örneğin 0/4)')
+    parser.add_argument('--merge-shards', type=str, metavar='RESULTS_DIR',
+                        help='Verilen sonuç dizinindeki parça çıktılarını birleştir ve çık')
+    parser.add_argument('--resume', action='store_true',
+                        help='Yarıda kalan veri seti çalıştırmasına günlükten devam et')
+    parser.add_argument('--store', type=str, help='Tanınan plakaların kaydedileceği SQLite veritabanının yolu')
+    parser.add_argument('--rectify', action='store_true',
+                        help='Plakaları köşelerinden perspektif düzeltmesiyle sabit boyuta getir (köşe noktası modeli gerekir)')
+    parser.add_argument('--quality-gate', action='store_true',
+                        help='Küçük, bulanık, düşük kontrastlı veya karakter içermeyen kırpıntılarda OCR\'ı atla')
+    parser.add_argument('--pipeline-workers', type=int, nargs=2, metavar=('DETECTORS', 'OCR_WORKERS'),
+                        help='Veri setini paylaşılan bellekli çok süreçli hatta işle (tespit ve OCR süreci sayıları)')
+    parser.add_argument('--engine-pool', type=int, metavar='DETECTOR_REPLICAS',
+                        help='Veri setini bu süreçte tespit kopyaları ve OCR işçilerinden oluşan iş parçacığı havuzunda işle; '
+                             'çekirdekler ölçülen aşama maliyetlerine göre paylaştırılır')
+    parser.add_argument('--watch', type=str, metavar='SPOOL_DIR',
+                        help='Biriktirme dizinini sürekli izle ve gelen görüntüleri işle (Ctrl+C ile durur)')
+    parser.add_argument('--watch-output', type=str,
+                        help='İşlenen/başarısız dosyaların taşınacağı dizin (varsayılan: izlenen dizin)')
+    parser.add_argument('--max-in-flight', type=int, default=8, help='İzleme modunda aynı anda sahiplenilen en fazla dosya')
+    parser.add_argument('--settle-seconds', type=float, default=1.0,
+                        help='İzleme modunda dosyanın tamamlanmış sayılması için değişmeden kalması gereken süre')
+    parser.add_argument('--prefilter', type=str, choices=['skip', 'crop'],
+                        help='YOLO öncesi kenar/morfoloji aday bölge ön filtresi: adaysız karelerde YOLO\'yu atla '
+                             '(skip) veya ayrıca yalnızca aday bölgede çalıştır (crop)')
+    parser.add_argument('--model-registry', type=str, metavar='REGISTRY_DIR',
+                        help='Modeli sürümlü model kaydından yükle; izleme modunda yeni sürümler yeniden başlatmadan devreye alınır')
+    parser.add_argument('--latency-budget', type=float, metavar='MS',
+                        help='Kare başına süre bütçesi (ms); bütçe daraldığında düşük çözünürlük, işaretlemesiz '
+                             've metinsiz seviyelere geçilir')
+    parser.add_argument('--roi-prior', action='store_true',
+                        help='Sabit kameralarda geçmiş tespitlerden kamera başına ilgi bölgesi öğren ve YOLO\'yu '
+                             'yalnızca bu bölgede çalıştır (kamera adı dosya adının ilk "_" veya "-" öncesindeki kısmıdır)')
+    parser.add_argument('--roi-masks', type=str, metavar='MASKS_JSON',
+                        help='İlgi bölgesi için kamera başına statik çokgen maskeleri ({"kamera": [[[x, y], ...]], "*": ...})')
+    parser.add_argument('--roi-state', type=str, metavar='STATE_JSON',
+                        help='Öğrenilen ısı haritalarını bu dosyadan yükle ve çalışma sonunda kaydet')
+    parser.add_argument('--roi-full-frame-interval', type=int, default=50,
+                        help='İlgi bölgesi kullanılırken kaç karede bir tam kare kontrolü yapılacağı')
+    parser.add_argument('--crop-bank', type=str, metavar='BANK_DIR',
+                        help='Plaka kırpıntılarını kaynak, kutu, model sürümü ve gerçek metinle bu dizine kaydet '
+                             '(yalnızca OCR değerlendirmesi için: python crop_bank.py BANK_DIR)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Çalışma boyunca yığın örnekleyerek profil çıkar; flamegraph, katlanmış yığınlar ve en çok '
+                             'zaman alan fonksiyonlar results/profile altına yazılır')
+    parser.add_argument('--profile-interval', type=float, default=5.0, metavar='MS', help='Profil örnekleme aralığı (ms)')
+    parser.add_argument('--track', action='store_true',
+                        help='Veri seti görüntülerini ardışık kareler olarak izle ve OCR okumalarını izleme başına oyla')
     
     return parser.parse_args()
 
+def configure_detector(detector, args):
+    """
+    Komut satırındaki tespit ayarlarını PlateDetector nesnesine uygula
+    
+    Parametreler:
+        detector: PlateDetector nesnesi
+        args: Ayrıştırılmış argümanlar
+    """
+    detector.set_confidence_threshold(args.conf_threshold)
+    detector.set_image_size(args.img_size)
+    detector.set_iou_threshold(args.iou_threshold)
+    if args.detection_cache:
+        detector.enable_cache(args.detection_cache)
+
 if __name__ == "__main__":
     args = parse_arguments()
     
+    if args.merge_shards:
+        # Parça çıktılarını birleştir (model yüklemeye gerek yok)
+        evaluator = merge_shards(args.merge_shards)
+        exit(0 if evaluator else 1)
+    
     # Tespit modülünü başlat
-    detector = PlateDetector(model_path=args.model)
-    detector.set_confidence_threshold(args.conf_threshold)
+    registry = None
+    model_version = None
+    if args.model_registry:
+        # Yalnızca izleme modunda kayıt arka planda izlenir; diğer modlar etkin sürümle çalışır ve sonuçlara
+        # bu sürüm yazılır
+        registry = ModelRegistry(args.model_registry, configure=lambda d: configure_detector(d, args))
+        if not registry.start(watch=bool(args.watch)):
+            exit(1)
+        model_version, detector = registry.current()
+    else:
+        detector = PlateDetector(model_path=args.model)
+        configure_detector(detector, args)
     
     # OCR modülünü başlat
-    ocr = PlateOCR(tesseract_path=args.tesseract_path)
+    if args.ocr_backend == 'yolo':
+        if not args.char_model:
+            print("Hata: --ocr-backend yolo için --char-model belirtilmeli")
+            exit(1)
+        ocr = CharRecognizer(args.char_model)
+        
+        # Karakter modeli ham renkli kırpıntılarla eğitildiği için Tesseract ön işlemesi uygulanmaz
+        if args.ocr_variant not in ('default', 'none'):
+            print(f"Uyarı: OCR ön işleme varyantı '{args.ocr_variant}' karakter modeliyle kullanılmaz")
+        args.ocr_variant = 'none'
+    else:
+        ocr = PlateOCR(tesseract_path=args.tesseract_path)
+    
+        # İş parçacığı havuzunda OCR paralelliği işçi sayısıyla sağlandığı için her Tesseract süreci tek
+        # iş parçacığıyla sınırlanır
+        if args.engine_pool:
+            limit_tesseract_threads()
+    
+    # Plaka okuma deposunu başlat (isteğe bağlı)
+    store = PlateStore(args.store) if args.store else None
+    
+    # Kamera başına ilgi bölgesi (isteğe bağlı)
+    roi_prior = None
+    if args.roi_prior:
+        roi_prior = ROIPrior(full_frame_interval=args.roi_full_frame_interval,
+                             masks=load_masks(args.roi_masks) if args.roi_masks else None)
+        if args.roi_state:
+            loaded = roi_prior.load(args.roi_state)
+            if loaded:
+                print(f"{loaded} kaynağın ilgi bölgesi {args.roi_state} dosyasından yüklendi")
+    
+    # Kırpıntı bankası (isteğe bağlı)
+    crop_bank = CropBank(args.crop_bank) if args.crop_bank else None
+    
+    # İsteğe bağlı örnekleyici profil (model yükleme dışındaki işlem süresi)
+    profiler = SamplingProfiler(interval=args.profile_interval / 1000).start() if args.profile else None
     
     if args.image:
         # Tek görüntüyü işle
-        recognized_plates, result_image = process_single_image(
-            args.image, detector, ocr, save_results=True, display=args.display
-        )
+        if args.latency_budget:
+            recognized_plates, result_image = process_image_with_budget(
+                args.image, detector, ocr, LatencyBudget(args.latency_budget), ocr_variant=args.ocr_variant,
+                rectify=args.rectify, quality_gate=args.quality_gate, model_version=model_version
+            )
+        else:
+            recognized_plates, result_image = process_single_image(
+                args.image, detector, ocr, save_results=True, display=args.display, ocr_variant=args.ocr_variant,
+                rectify=args.rectify, quality_gate=args.quality_gate,
+                prefilter=roi_prior or (RegionPrefilter(mode=args.prefilter) if args.prefilter else None),
+                crop_bank=crop_bank, model_version=model_version
+            )
+        
+        if store:
+            store.add_reads(args.image, recognized_plates)
         
         # Sonuçları yazdır
         print("Tanınan plakalar:")
@@ -228,8 +1119,43 @@ if __name__ == "__main__":
     
     elif args.dataset:
         # Veri setini işle
-        evaluator = process_dataset(args.dataset, detector, ocr, args.ground_truth)
+        evaluator = process_dataset(args.dataset, detector, ocr, args.ground_truth,
+                                    shard=args.shard, resume=args.resume, store=store,
+                                    ocr_variant=args.ocr_variant, track=args.track, rectify=args.rectify,
+                                    quality_gate=args.quality_gate, pipeline_workers=args.pipeline_workers,
+                                    prefilter=args.prefilter, engine_pool=args.engine_pool,
+                                    latency_budget=args.latency_budget, roi_prior=roi_prior, crop_bank=crop_bank,
+                                    model_version=model_version)
+        if evaluator is None:
+            exit(1)
+    
+    elif args.watch:
+        if args.prefilter:
+            print("Uyarı: Aday bölge ön filtresi izleme modunda desteklenmiyor; ön filtre kapatıldı")
+        
+        if crop_bank:
+            print("Uyarı: Kırpıntı bankası izleme modunda desteklenmiyor; kapatıldı")
+            crop_bank.close()
+            crop_bank = None
+        
+        # Biriktirme dizinini izle
+        process_spool(args.watch, detector, ocr, output_dir=args.watch_output, store=store,
+                      ocr_variant=args.ocr_variant, track=args.track, rectify=args.rectify,
+                      quality_gate=args.quality_gate, max_in_flight=args.max_in_flight,
+                      settle_seconds=args.settle_seconds, registry=registry,
+                      latency_budget=args.latency_budget, roi_prior=roi_prior)
     
     else:
-        print("Hata: --image veya --dataset argümanı belirtilmeli")
-        exit(1) 
\ No newline at end of file
+        print("Hata: --image, --dataset veya --watch argümanı belirtilmeli")
+        exit(1)
+    
+    if roi_prior and args.roi_state:
+        roi_prior.save(args.roi_state)
+        print(f"İlgi bölgesi durumu kaydedildi: {args.roi_state}")
+    
+    if crop_bank:
+        crop_bank.close()
+    
+    # Profil çıktıları değerlendirme çıktılarının yanına yazılır
+    results_dir = shard_output_dir('results', *args.shard) if args.shard else 'results'
+    finish_profile(profiler, os.path.join(results_dir, 'profile')) 
\ No newline at end of file
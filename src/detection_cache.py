@@ -0,0 +1,180 @@
+import os
+import json
+import hashlib
+import threading
+
+import cv2
+import numpy as np
+
+def file_hash(path, chunk_size=1 << 20):
+    """
+    Dosya içeriğinin SHA-256 özetini hesapla
+    
+    Parametreler:
+        path: Dosya yolu
+        chunk_size: Okuma parça boyutu (bayt)
+        
+    Dönüş:
+        Onaltılık özet metni
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def image_hash(image):
+    """
+    Çözülmüş görüntü içeriğinin özetini hesapla (dosya adından ve kodlamadan bağımsız)
+    
+    Parametreler:
+        image: Giriş görüntüsü
+        
+    Dönüş:
+        Onaltılık özet metni
+    """
+    digest = hashlib.sha256(str(image.shape).encode())
+    digest.update(np.ascontiguousarray(image).data)
+    return digest.hexdigest()
+
+def filter_detections(raw_boxes, conf_threshold, iou_threshold=0.7, raw_keypoints=None):
+    """
+    Ham (düşük eşikli) tespitlere güven eşiği ve NMS uygula
+    
+    Parametreler:
+        raw_boxes: (N, 6) dizisi [x1, y1, x2, y2, güven, sınıf]
+        conf_threshold: Güven eşiği
+        iou_threshold: NMS için IoU eşiği
+        raw_keypoints: (N, K, 2) köşe noktası dizisi veya None
+        
+    Dönüş:
+        boxes: Kalan kutular (güvene göre azalan sırada)
+        keypoints: Kalan köşe noktaları veya None
+    """
+    keep = np.flatnonzero(raw_boxes[:, 4] >= conf_threshold) if len(raw_boxes) else np.array([], dtype=int)
+    
+    if len(keep) > 0:
+        # cv2.dnn.NMSBoxes [x, y, genişlik, yükseklik] biçiminde kutu bekler
+        boxes = raw_boxes[keep]
+        xywh = np.column_stack([boxes[:, 0], boxes[:, 1], boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]])
+        nms_keep = cv2.dnn.NMSBoxes(xywh.tolist(), boxes[:, 4].tolist(), conf_threshold, iou_threshold)
+        keep = keep[np.array(nms_keep, dtype=int).reshape(-1)]
+        keep = keep[np.argsort(-raw_boxes[keep, 4], kind='stable')]
+    
+    keypoints = raw_keypoints[keep] if raw_keypoints is not None else None
+    return raw_boxes[keep], keypoints
+
+class DetectionCache:
+    def __init__(self, cache_dir, raw_conf=0.01, raw_iou=0.95):
+        """
+        Ham tespitler için disk önbelleğini başlat
+        
+        Önbellek anahtarı model ağırlıklarının özeti, görüntü içeriğinin özeti ve çıkarım
+        ayarlarından oluşur; model veya görüntü değiştiğinde eski kayıtlar kendiliğinden
+        kullanılmaz hale gelir. Ham tespitler düşük güven eşiği ve gevşek NMS ile saklanır,
+        böylece farklı eşik ve NMS ayarları modeli yeniden çalıştırmadan uygulanabilir.
+        
+        Parametreler:
+            cache_dir: Önbellek dizini
+            raw_conf: Ham tespitlerin saklanacağı en düşük güven
+            raw_iou: Ham çıkarımda kullanılan NMS IoU eşiği (yüksek değer neredeyse hiç kutu elemez)
+        """
+        self.cache_dir = cache_dir
+        self.raw_conf = raw_conf
+        self.raw_iou = raw_iou
+        
+        # Ağırlık özetleri (yol, değiştirilme zamanı, boyut) ile hatırlanır
+        self._weights_hashes = {}
+        
+        self.stats = {'hits': 0, 'misses': 0}
+        
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def weights_hash(self, model_path):
+        """
+        Model ağırlıklarının özetini döndür (dosya değişmedikçe yeniden hesaplanmaz)
+        
+        Parametreler:
+            model_path: Model ağırlık dosyasının yolu
+            
+        Dönüş:
+            Onaltılık özet metni
+        """
+        if not os.path.exists(model_path):
+            # İndirilmemiş hazır modeller için adı kullan
+            return hashlib.sha256(model_path.encode()).hexdigest()
+        
+        stat = os.stat(model_path)
+        key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+        if key not in self._weights_hashes:
+            self._weights_hashes[key] = file_hash(model_path)
+        return self._weights_hashes[key]
+    
+    def entry_path(self, model_path, image, img_size=None):
+        """
+        Önbellek kaydının dosya yolunu (anahtarını) oluştur
+        
+        Görüntünün tamamı özetlendiği için anahtar bir kez hesaplanıp get ve put'a aynı değer verilmelidir.
+        
+        Parametreler:
+            model_path: Model ağırlık dosyasının yolu
+            image: Giriş görüntüsü
+            img_size: Çıkarım görüntü boyutu
+            
+        Dönüş:
+            Kayıt dosyasının yolu
+        """
+        settings = json.dumps({'raw_conf': self.raw_conf, 'raw_iou': self.raw_iou, 'img_size': img_size},
+                              sort_keys=True)
+        model_key = hashlib.sha256((self.weights_hash(model_path) + settings).encode()).hexdigest()[:16]
+        image_key = image_hash(image)
+        
+        # Tek dizinde çok sayıda dosya olmaması için görüntü özetinin ilk iki karakteriyle böl
+        return os.path.join(self.cache_dir, model_key, image_key[:2], f"{image_key}.npz")
+    
+    def get(self, entry_path):
+        """
+        Önbellekteki ham tespitleri döndür
+        
+        Parametreler:
+            entry_path: entry_path ile oluşturulan kayıt yolu
+            
+        Dönüş:
+            (boxes, keypoints) demeti veya kayıt yoksa None
+        """
+        if not os.path.exists(entry_path):
+            self.stats['misses'] += 1
+            return None
+        
+        try:
+            with np.load(entry_path) as entry:
+                boxes = entry['boxes']
+                keypoints = entry['keypoints'] if 'keypoints' in entry.files else None
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Uyarı: Bozuk önbellek kaydı yok sayıldı ({entry_path}): {str(e)}")
+            self.stats['misses'] += 1
+            return None
+        
+        self.stats['hits'] += 1
+        return boxes, keypoints
+    
+    def put(self, entry_path, boxes, keypoints=None):
+        """
+        Ham tespitleri önbelleğe atomik olarak yaz
+        
+        Parametreler:
+            entry_path: entry_path ile oluşturulan kayıt yolu (ıskalanan get çağrısındakiyle aynı)
+            boxes: (N, 6) ham tespit dizisi
+            keypoints: (N, K, 2) köşe noktası dizisi veya None
+        """
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        
+        arrays = {'boxes': np.asarray(boxes, dtype=np.float64).reshape(-1, 6)}
+        if keypoints is not None:
+            arrays['keypoints'] = np.asarray(keypoints, dtype=np.float64)
+        
+        # Paralel süreçler veya iş parçacıkları aynı kaydı yazabilir; yarım dosya hiçbir zaman görünmesin
+        tmp_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, entry_path)
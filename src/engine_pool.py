@@ -0,0 +1,259 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import torch
+
+from mp_pipeline import build_detector, build_ocr
+
+def available_cores():
+    """
+    Bu sürecin çalışabileceği CPU çekirdeklerini döndür
+    
+    Dönüş:
+        Sıralı çekirdek numaraları listesi
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def pin_current_thread(cores):
+    """
+    Çağıran iş parçacığını verilen çekirdeklere bağla (yalnızca Linux)
+    
+    Linux'ta sched_setaffinity(0) yalnızca çağıran iş parçacığını etkiler; bu iş parçacığının
+    başlattığı torch iş parçacıkları ve Tesseract alt süreçleri aynı çekirdek kümesini devralır.
+    
+    Parametreler:
+        cores: Çekirdek numaraları listesi
+    """
+    if cores and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, cores)
+        except OSError as e:
+            print(f"Uyarı: İş parçacığı çekirdeklere bağlanamadı: {str(e)}")
+
+def partition_cores(detection_cost, ocr_cost, cores=None, detector_replicas=1):
+    """
+    Çekirdekleri ölçülen aşama maliyetlerine göre tespit ve OCR arasında paylaştır
+    
+    Her aşamaya kare başına süresiyle orantılı çekirdek verilir; böylece iki aşama yaklaşık aynı
+    hızda ilerler ve biri diğerini beklerken çekirdekler boşta kalmaz.
+    
+    Parametreler:
+        detection_cost: Kare başına tespit süresi (saniye, tek iş parçacığıyla ölçülmüş)
+        ocr_cost: Kare başına toplam OCR süresi (saniye)
+        cores: Paylaştırılacak çekirdekler (None ise sürecin tüm çekirdekleri)
+        detector_replicas: Tespit modeli kopyası sayısı
+        
+    Dönüş:
+        {'detector_cores', 'ocr_cores', 'torch_threads', 'ocr_workers'} sözlüğü
+    """
+    cores = list(cores) if cores is not None else available_cores()
+    if len(cores) < 2:
+        return {'detector_cores': cores, 'ocr_cores': cores, 'torch_threads': 1, 'ocr_workers': 1}
+    
+    total_cost = detection_cost + ocr_cost
+    detection_share = detection_cost / total_cost if total_cost > 0 else 0.5
+    
+    # Her aşamaya en az bir çekirdek kalsın; tespit kopyaları mümkünse birer çekirdek alsın
+    detector_count = round(len(cores) * detection_share)
+    detector_count = max(detector_count, min(detector_replicas, len(cores) - 1), 1)
+    detector_count = min(detector_count, len(cores) - 1)
+    
+    return {
+        'detector_cores': cores[:detector_count],
+        'ocr_cores': cores[detector_count:],
+        'torch_threads': max(1, detector_count // detector_replicas),
+        'ocr_workers': len(cores) - detector_count
+    }
+
+def measure_stage_costs(settings, sample_images):
+    """
+    Tek tespit ve tek OCR örneğiyle aşamaların kare başına maliyetini ölç
+    
+    Parametreler:
+        settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+        sample_images: Ölçümde kullanılacak görüntü yolları (birkaç görüntü yeterli)
+        
+    Dönüş:
+        (kare_başına_tespit_süresi, kare_başına_ocr_süresi) demeti (saniye)
+    """
+    from detect_and_recognize import detect_plate_regions, recognize_plate_images
+    
+    detector = build_detector(settings)
+    ocr = build_ocr(settings)
+    
+    # Ölçüm, tespit aşamasının tek iş parçacığındaki maliyetini verir
+    previous_threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    
+    detection_seconds = 0.0
+    ocr_seconds = 0.0
+    frames = 0
+    
+    try:
+        for i, image_path in enumerate(sample_images):
+            image = cv2.imread(str(image_path))
+            if image is None:
+                continue
+            
+            start = time.perf_counter()
+            detected_plates, _, plate_images = detect_plate_regions(image, detector, settings['rectify'])
+            detect_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            recognize_plate_images(plate_images, detected_plates, ocr, settings['ocr_variant'], settings['quality_gate'])
+            ocr_time = time.perf_counter() - start
+            
+            # İlk kare model ısınmasını içerdiği için ölçüme katılmaz
+            if i == 0 and len(sample_images) > 1:
+                continue
+            
+            detection_seconds += detect_time
+            ocr_seconds += ocr_time
+            frames += 1
+    finally:
+        torch.set_num_threads(previous_threads)
+    
+    frames = max(frames, 1)
+    return detection_seconds / frames, ocr_seconds / frames
+
+class EnginePool:
+    def __init__(self, settings, detector_replicas=1, plan=None):
+        """
+        Çok iş parçacıklı servislerde paylaşılabilen tespit ve OCR havuzu
+        
+        Her tespit iş parçacığı kendi PlateDetector kopyasını, her OCR iş parçacığı kendi OCR arka
+        ucunu (PlateOCR veya CharRecognizer) tutar; bir model hiçbir zaman iki iş parçacığı tarafından aynı anda kullanılmaz.
+        Tespit iş parçacıkları plan['detector_cores'], OCR iş parçacıkları plan['ocr_cores'] çekirdeklerine
+        bağlanır; böylece torch iş parçacıkları ile Tesseract süreçleri aynı çekirdekler için yarışmaz.
+        Tesseract süreçlerinin iş parçacığı sayısı süreç ortamından gelir; komut satırı giriş noktaları
+        bunu ocr.limit_tesseract_threads ile sınırlar.
+        
+        Parametreler:
+            settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+            detector_replicas: Tespit modeli kopyası (ve tespit iş parçacığı) sayısı
+            plan: partition_cores çıktısı (None ise çekirdekler iki aşama arasında eşit paylaştırılır)
+        """
+        self.settings = settings
+        self.detector_replicas = detector_replicas
+        self.plan = plan or partition_cores(1.0, 1.0, detector_replicas=detector_replicas)
+        
+        # torch iş parçacığı sayısı süreç genelindedir; her tespit kopyası kendi payı kadar kullanır.
+        # Önceki değer close() ile geri yüklenir
+        self._previous_torch_threads = torch.get_num_threads()
+        torch.set_num_threads(self.plan['torch_threads'])
+        
+        self._local = threading.local()
+        self._detect_pool = ThreadPoolExecutor(detector_replicas, thread_name_prefix='plate-detector',
+                                               initializer=self._init_detector_thread)
+        self._ocr_pool = ThreadPoolExecutor(self.plan['ocr_workers'], thread_name_prefix='plate-ocr',
+                                            initializer=self._init_ocr_thread)
+    
+    @classmethod
+    def calibrate(cls, settings, sample_images, detector_replicas=1, cores=None):
+        """
+        Aşama maliyetlerini örnek görüntülerde ölçüp çekirdekleri buna göre paylaştıran havuz oluştur
+        
+        Parametreler:
+            settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+            sample_images: Ölçüm için birkaç görüntü yolu
+            detector_replicas: Tespit modeli kopyası sayısı
+            cores: Kullanılacak çekirdekler (None ise sürecin tüm çekirdekleri)
+            
+        Dönüş:
+            EnginePool nesnesi
+        """
+        detection_cost, ocr_cost = measure_stage_costs(settings, sample_images)
+        plan = partition_cores(detection_cost, ocr_cost, cores, detector_replicas)
+        plan.update({'detection_cost': detection_cost, 'ocr_cost': ocr_cost})
+        
+        print(f"Aşama maliyetleri: tespit {detection_cost * 1000:.1f} ms/kare, OCR {ocr_cost * 1000:.1f} ms/kare")
+        print(f"Çekirdek paylaşımı: tespit {len(plan['detector_cores'])} çekirdek "
+              f"({detector_replicas} kopya x {plan['torch_threads']} torch iş parçacığı), "
+              f"OCR {len(plan['ocr_cores'])} çekirdek ({plan['ocr_workers']} işçi)")
+        
+        return cls(settings, detector_replicas, plan)
+    
+    def _init_detector_thread(self):
+        pin_current_thread(self.plan['detector_cores'])
+        self._local.detector = build_detector(self.settings)
+    
+    def _init_ocr_thread(self):
+        pin_current_thread(self.plan['ocr_cores'])
+        self._local.ocr = build_ocr(self.settings)
+    
+    def _detect(self, image):
+        from detect_and_recognize import detect_plate_regions
+        
+        return detect_plate_regions(image, self._local.detector, self.settings['rectify'])
+    
+    def _recognize(self, plate_image, detected_plate):
+        from detect_and_recognize import recognize_plate_images
+        
+        return recognize_plate_images([plate_image], [detected_plate], self._local.ocr,
+                                      self.settings['ocr_variant'], self.settings['quality_gate'])[0]
+    
+    def submit_detection(self, image):
+        """
+        Tespiti bir tespit kopyasına gönder
+        
+        Dönüş:
+            (detected_plates, annotated_image, plate_images) üretecek concurrent.futures.Future
+        """
+        return self._detect_pool.submit(self._detect, image)
+    
+    def submit_ocr(self, plate_image, detected_plate):
+        """
+        Tek bir plaka kırpıntısının tanınmasını bir OCR işçisine gönder
+        
+        Dönüş:
+            Tanınan plaka sözlüğünü üretecek concurrent.futures.Future
+        """
+        return self._ocr_pool.submit(self._recognize, plate_image, detected_plate)
+    
+    def process(self, image):
+        """
+        Görüntüde plakaları tespit et ve tanı (birden çok iş parçacığından aynı anda çağrılabilir)
+        
+        Tespit bir tespit kopyasında, her plaka kırpıntısı ayrı bir OCR işçisinde işlenir.
+        
+        Parametreler:
+            image: Giriş görüntüsü (BGR)
+            
+        Dönüş:
+            recognized_plates: Tanınan plakalar listesi
+            annotated_image: Tespit kutuları çizilmiş görüntü
+            plate_images: Kırpılmış plaka görüntüleri listesi
+        """
+        detected_plates, annotated_image, plate_images = self.submit_detection(image).result()
+        
+        futures = [self.submit_ocr(plate_image, detected_plate)
+                   for plate_image, detected_plate in zip(plate_images, detected_plates)]
+        recognized_plates = [future.result() for future in futures]
+        
+        return recognized_plates, annotated_image, plate_images
+    
+    def close(self, cancel_pending=False):
+        """
+        İş parçacıklarını durdur
+        
+        Parametreler:
+            cancel_pending: True ise henüz başlamamış işler iptal edilir
+        """
+        self._detect_pool.shutdown(wait=True, cancel_futures=cancel_pending)
+        self._ocr_pool.shutdown(wait=True, cancel_futures=cancel_pending)
+        
+        # Süreç genelindeki torch ayarını havuzdan önceki haline döndür
+        if self._previous_torch_threads is not None:
+            torch.set_num_threads(self._previous_torch_threads)
+            self._previous_torch_threads = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -26,7 +26,8 @@ class EvaluationMetrics:
             'ocr_correct': 0,
             'ocr_incorrect': 0,
             'total_plates': 0,
-            'plate_detections': []
+            'plate_detections': [],
+            'latencies': []
         }
     
     def evaluate_detection(self, ground_truth_boxes, detected_boxes, iou_threshold=0.5):
@@ -71,6 +72,7 @@ class EvaluationMetrics:
         false_positives = len(detected_boxes) - len(matched_detections)
         
         # Sonuçları kaydet
+        self.results['total_plates'] += len(ground_truth_boxes)
         self.results['true_positives'] += true_positives
         self.results['false_positives'] += false_positives
         self.results['false_negatives'] += false_negatives
@@ -169,6 +171,31 @@ class EvaluationMetrics:
             'recognition': recognition
         })
     
+    def add_timing(self, seconds):
+        """
+        Bir görüntünün uçtan uca işlem süresini kaydet
+        
+        Parametreler:
+            seconds: Görüntünün tespit ve tanıma süresi (saniye)
+        """
+        self.results['latencies'].append(seconds)
+    
+    def merge(self, other_results):
+        """
+        Başka bir değerlendirmenin sonuçlarını bu değerlendirmeye ekle
+        
+        Parametreler:
+            other_results: EvaluationMetrics nesnesi veya onun results sözlüğü
+        """
+        if isinstance(other_results, EvaluationMetrics):
+            other_results = other_results.results
+        
+        for key, value in other_results.items():
+            if isinstance(value, list):
+                self.results.setdefault(key, []).extend(value)
+            else:
+                self.results[key] = self.results.get(key, 0) + value
+    
     def plot_results(self, title="Plaka Tespiti ve Tanıma Sonuçları"):
         """
         Değerlendirme sonuçlarını görselleştir
@@ -259,7 +286,7 @@ class EvaluationMetrics:
         character_accuracy = self.results['ocr_correct'] / total_ocr if total_ocr > 0 else 0
         exact_match_accuracy = self.results['ocr_correct'] / self.results['total_plates'] if self.results['total_plates'] > 0 else 0
         
-        return {
+        metrics = {
             'precision': precision,
             'recall': recall,
             'f1': f1,
@@ -267,6 +294,15 @@ class EvaluationMetrics:
             'character_accuracy': character_accuracy,
             'exact_match_accuracy': exact_match_accuracy
         }
+        
+        # Süre ölçümü yapıldıysa hız metriklerini ekle
+        latencies = self.results.get('latencies', [])
+        if latencies:
+            metrics['mean_latency_ms'] = float(np.mean(latencies)) * 1000
+            metrics['p95_latency_ms'] = float(np.percentile(latencies, 95)) * 1000
+            metrics['throughput_fps'] = len(latencies) / float(np.sum(latencies)) if np.sum(latencies) > 0 else 0
+        
+        return metrics
     
     def _save_metrics_to_csv(self, metrics, csv_path):
         """
@@ -0,0 +1,155 @@
+import os
+import json
+import cv2
+
+def atomic_write_json(path, data):
+    """
+    JSON verisini önce geçici dosyaya yazıp yerine taşıyarak atomik olarak kaydet
+    
+    Parametreler:
+        path: Hedef dosya yolu
+        data: JSON olarak yazılacak veri
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def atomic_imwrite(path, image):
+    """
+    Görüntüyü atomik olarak kaydet; yarım yazılmış dosyalar hedef yolda asla görünmez
+    
+    Parametreler:
+        path: Hedef görüntü yolu
+        image: Kaydedilecek görüntü
+        
+    Dönüş:
+        Kaydetme başarılıysa True
+    """
+    # OpenCV kodlayıcıyı uzantıdan seçtiği için uzantıyı koru
+    root, ext = os.path.splitext(path)
+    tmp_path = f"{root}.tmp{ext}"
+    
+    if not cv2.imwrite(tmp_path, image):
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    
+    os.replace(tmp_path, path)
+    return True
+
+class ProcessingJournal:
+    def __init__(self, journal_path, resume=False, retain=True):
+        """
+        Tamamlanan görüntüleri ve sonuçlarını tutan yalnızca-ekleme günlüğünü başlat
+        
+        Parametreler:
+            journal_path: Günlük dosyasının yolu (JSON Lines)
+            resume: True ise mevcut günlük korunur, False ise sıfırdan başlanır
+            retain: True ise kayıtlar is_completed için bellekte tutulur. Sürekli çalışan servislerde False
+                    verilirse günlük açılışta okunmaz (yalnızca yarım kalan son satır kesilir) ve bellek büyümez
+        """
+        self.journal_path = journal_path
+        self.retain = retain
+        self.completed = {}
+        
+        os.makedirs(os.path.dirname(journal_path) or '.', exist_ok=True)
+        
+        if resume and os.path.exists(journal_path):
+            if retain:
+                self.completed = self._load()
+            else:
+                self._repair_tail()
+        
+        # Devam edilmiyorsa eski günlüğü boşalt
+        self._file = open(journal_path, 'a' if resume else 'w', encoding='utf-8')
+    
+    def _load(self):
+        """
+        Günlükteki tamamlanmış kayıtları oku
+        
+        Dönüş:
+            Görüntü adından sonuç kaydına sözlük
+        """
+        completed = {}
+        valid_bytes = 0
+        
+        with open(self.journal_path, 'rb') as f:
+            for raw_line in f:
+                # Çökme sırasında yarım kalan son satırı yok say
+                if not raw_line.endswith(b'\n'):
+                    break
+                try:
+                    entry = json.loads(raw_line.decode('utf-8'))
+                except (UnicodeDecodeError, json.JSONDecodeError):
+                    break
+                completed[entry['image']] = entry
+                valid_bytes += len(raw_line)
+        
+        # Yarım satırı kes ki yeni kayıtlar ona eklenmesin
+        if valid_bytes != os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        
+        return completed
+    
+    def _repair_tail(self, block_size=65536):
+        """
+        Günlüğün tamamını okumadan çökme sırasında yarım kalan son satırı kes
+        """
+        size = os.path.getsize(self.journal_path)
+        if size == 0:
+            return
+        
+        with open(self.journal_path, 'r+b') as f:
+            f.seek(size - 1)
+            if f.read(1) == b'\n':
+                return
+            
+            # Son satır sonunu bulana kadar dosyanın sonundan geriye doğru oku
+            end = size
+            while end > 0:
+                start = max(end - block_size, 0)
+                f.seek(start)
+                newline = f.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    f.truncate(start + newline + 1)
+                    return
+                end = start
+            f.truncate(0)
+    
+    def is_completed(self, image_name):
+        """
+        Görüntünün daha önce işlenip işlenmediğini kontrol et
+        """
+        return image_name in self.completed
+    
+    def record(self, image_name, recognized_plates):
+        """
+        Tamamlanan görüntüyü sonuçlarıyla birlikte günlüğe ekle
+        
+        Parametreler:
+            image_name: Görüntü dosyasının adı
+            recognized_plates: process_single_image tarafından döndürülen plaka listesi
+        """
+        entry = {'image': image_name, 'plates': recognized_plates}
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self.retain:
+            self.completed[image_name] = entry
+    
+    def close(self):
+        """
+        Günlük dosyasını kapat
+        """
+        if not self._file.closed:
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
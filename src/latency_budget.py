@@ -0,0 +1,124 @@
+import time
+
+# Bozulma seviyeleri: her seviye bir öncekinden daha ucuzdur
+DEGRADATION_LEVELS = [
+    {'name': 'full', 'low_res': False, 'annotate': True, 'ocr': True},
+    {'name': 'low_res', 'low_res': True, 'annotate': True, 'ocr': True},
+    {'name': 'no_annotation', 'low_res': True, 'annotate': False, 'ocr': True},
+    {'name': 'detections_only', 'low_res': True, 'annotate': False, 'ocr': False}
+]
+
+class LatencyBudget:
+    def __init__(self, budget_ms, low_res_size=416, smoothing=0.2, safety=1.2):
+        """
+        Kare başına süre bütçesine göre işlem seviyesini seçen denetleyici
+        
+        Aşamaların süreleri üstel hareketli ortalamayla öğrenilir. Her istekte kalan süreye sığan en
+        pahalı seviye seçilir; tespitten sonra kalan süre OCR'a veya kaydetmeye yetmezse istek daha
+        ucuz bir seviyeye indirilir.
+        
+        Parametreler:
+            budget_ms: Kare başına süre bütçesi (milisaniye)
+            low_res_size: Düşük çözünürlüklü seviyelerde tespit giriş boyutu
+            smoothing: Hareketli ortalamada yeni ölçümün ağırlığı
+            safety: Tahmini sürelerin çarpıldığı güvenlik payı
+        """
+        self.budget = budget_ms / 1000
+        self.low_res_size = low_res_size
+        self.smoothing = smoothing
+        self.safety = safety
+        
+        # Aşama süreleri (saniye); ilk ölçüme kadar bilinmez ve tam seviye denenir
+        self.costs = {'detect': None, 'detect_low_res': None, 'ocr_per_plate': None, 'annotate': None}
+        self.stats = {'frames': 0, 'missed': 0, 'levels': [0] * len(DEGRADATION_LEVELS)}
+    
+    def start(self, arrival_time=None):
+        """
+        İsteğin son teslim anını hesapla
+        
+        Parametreler:
+            arrival_time: İsteğin geliş anı (time.monotonic). None ise şimdi; kuyrukta bekleme de bütçeden düşülür
+            
+        Dönüş:
+            Son teslim anı (time.monotonic)
+        """
+        return (arrival_time if arrival_time is not None else time.monotonic()) + self.budget
+    
+    def observe(self, stage, seconds):
+        """
+        Bir aşamanın ölçülen süresini hareketli ortalamaya ekle
+        """
+        previous = self.costs[stage]
+        self.costs[stage] = seconds if previous is None else previous + self.smoothing * (seconds - previous)
+    
+    def _estimate(self, stage, count=1):
+        cost = self.costs[stage]
+        return 0.0 if cost is None else cost * count * self.safety
+    
+    def _remaining(self, deadline):
+        return deadline - time.monotonic()
+    
+    def choose_level(self, deadline, expected_plates=1):
+        """
+        Tespitten önce kalan süreye sığan en pahalı seviyeyi seç
+        
+        Parametreler:
+            deadline: start ile hesaplanan son teslim anı
+            expected_plates: Karede beklenen plaka sayısı (OCR süresini tahmin etmek için)
+            
+        Dönüş:
+            Seviye indeksi (DEGRADATION_LEVELS)
+        """
+        remaining = self._remaining(deadline)
+        for level, options in enumerate(DEGRADATION_LEVELS):
+            cost = self._estimate('detect_low_res' if options['low_res'] else 'detect')
+            if options['ocr']:
+                cost += self._estimate('ocr_per_plate', expected_plates)
+            if options['annotate']:
+                cost += self._estimate('annotate')
+            if cost <= remaining:
+                return level
+        
+        return len(DEGRADATION_LEVELS) - 1
+    
+    def after_detection(self, level, deadline, plate_count):
+        """
+        Tespitten sonra gerçek plaka sayısına göre seviyeyi gerekirse düşür
+        
+        Tespit tam çözünürlükte yapılmış olsa bile sonuç, uygulanan en ucuz adımın seviyesiyle etiketlenir.
+        
+        Dönüş:
+            Yeni seviye indeksi (en az level)
+        """
+        remaining = self._remaining(deadline)
+        for next_level in range(level, len(DEGRADATION_LEVELS)):
+            options = DEGRADATION_LEVELS[next_level]
+            cost = 0.0
+            if options['ocr']:
+                cost += self._estimate('ocr_per_plate', plate_count)
+            if options['annotate']:
+                cost += self._estimate('annotate')
+            if cost <= remaining:
+                return next_level
+        
+        return len(DEGRADATION_LEVELS) - 1
+    
+    def finish(self, level, deadline):
+        """
+        İsteğin kullandığı seviyeyi ve süreyi kaydet
+        """
+        self.stats['frames'] += 1
+        self.stats['levels'][level] += 1
+        if time.monotonic() > deadline:
+            self.stats['missed'] += 1
+    
+    def report(self):
+        """
+        Seviye dağılımını ve süre aşımlarını yazdır
+        """
+        frames = max(self.stats['frames'], 1)
+        print(f"Süre bütçesi {self.budget * 1000:.0f} ms: {self.stats['missed']}/{self.stats['frames']} kare "
+              f"bütçeyi aştı")
+        for level, options in enumerate(DEGRADATION_LEVELS):
+            count = self.stats['levels'][level]
+            print(f"  Seviye {level} ({options['name']}): {count} kare (%{count / frames * 100:.1f})")
@@ -0,0 +1,416 @@
+import os
+import json
+import time
+import shutil
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+
+from journal import atomic_write_json
+from detection_cache import file_hash
+from plate_detection import PlateDetector
+
+# Kayıt dizinindeki sürüm listesinin dosya adı
+MANIFEST_NAME = 'registry.json'
+
+def read_manifest(registry_dir):
+    """
+    Kayıt dizinindeki sürüm listesini oku
+    
+    Parametreler:
+        registry_dir: Model kayıt dizini
+        
+    Dönüş:
+        {'versions': [...], 'active': sürüm, 'history': [önceki etkin sürümler]} sözlüğü
+    """
+    manifest_path = os.path.join(registry_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return {'versions': [], 'active': None, 'history': []}
+    
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def publish_model(registry_dir, weights_path, activate=True, note=None):
+    """
+    Eğitilmiş ağırlıkları yeni bir sürüm olarak kayıt dizinine kopyala
+    
+    Ağırlıklar önce geçici dosyaya kopyalanıp yerine taşınır, ardından sürüm listesi atomik olarak
+    yazılır; izleyen süreçler yarım kopyalanmış bir dosyayı asla görmez. Sürüm listesine aynı anda
+    yalnızca tek bir sürecin (eğitim veya operatör) yazdığı varsayılır.
+    
+    Parametreler:
+        registry_dir: Model kayıt dizini
+        weights_path: Yayınlanacak .pt dosyası
+        activate: True ise yeni sürüm hemen etkin yapılır
+        note: Sürümle birlikte saklanacak açıklama (isteğe bağlı)
+        
+    Dönüş:
+        Yeni sürümün adı (örneğin "v003")
+    """
+    versions_dir = os.path.join(registry_dir, 'versions')
+    os.makedirs(versions_dir, exist_ok=True)
+    
+    manifest = read_manifest(registry_dir)
+    version = f"v{len(manifest['versions']) + 1:03d}"
+    relative_path = os.path.join('versions', f"{version}.pt")
+    
+    target = os.path.join(registry_dir, relative_path)
+    shutil.copyfile(weights_path, f"{target}.tmp")
+    os.replace(f"{target}.tmp", target)
+    
+    manifest['versions'].append({
+        'version': version,
+        'path': relative_path,
+        'sha256': file_hash(target),
+        'source': os.path.abspath(weights_path),
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'note': note
+    })
+    if activate:
+        if manifest['active']:
+            manifest['history'].append(manifest['active'])
+        manifest['active'] = version
+    
+    atomic_write_json(os.path.join(registry_dir, MANIFEST_NAME), manifest)
+    return version
+
+def set_active_version(registry_dir, version):
+    """
+    Kayıttaki bir sürümü etkin yap
+    
+    Parametreler:
+        registry_dir: Model kayıt dizini
+        version: Etkin yapılacak sürüm
+        
+    Dönüş:
+        Başarılıysa True
+    """
+    manifest = read_manifest(registry_dir)
+    if version not in {entry['version'] for entry in manifest['versions']}:
+        print(f"Hata: Kayıtta böyle bir sürüm yok: {version}")
+        return False
+    
+    if manifest['active'] and manifest['active'] != version:
+        manifest['history'].append(manifest['active'])
+    manifest['active'] = version
+    atomic_write_json(os.path.join(registry_dir, MANIFEST_NAME), manifest)
+    return True
+
+def rollback_version(registry_dir):
+    """
+    Bir önceki etkin sürüme geri dön
+    
+    Dönüş:
+        Yeniden etkin yapılan sürüm veya geri dönülecek sürüm yoksa None
+    """
+    manifest = read_manifest(registry_dir)
+    if not manifest['history']:
+        print("Hata: Geri dönülecek önceki sürüm yok")
+        return None
+    
+    manifest['active'] = manifest['history'].pop()
+    atomic_write_json(os.path.join(registry_dir, MANIFEST_NAME), manifest)
+    return manifest['active']
+
+class ModelRegistry:
+    def __init__(self, registry_dir, configure=None, warmup_shape=(720, 1280, 3), warmup_runs=2,
+                 poll_interval=5.0, keep_loaded=2):
+        """
+        Uzun süre çalışan süreçlerde modeli yeniden başlatmadan değiştiren sürümlü model kaydı
+        
+        Kayıt dizinindeki etkin sürüm değiştiğinde yeni ağırlıklar arka plan iş parçacığında yüklenir
+        ve ısıtılır; ardından etkin model tek bir atama ile değiştirilir. Yeni istekler yeni modeli
+        alır, o sırada eski modeli kiralamış istekler eski modelle tamamlanır. Eski model son kiralama
+        bırakıldığında bellekten çıkarılır; en son keep_loaded sürüm anında geri dönüş için bellekte tutulur.
+        
+        Parametreler:
+            registry_dir: Model kayıt dizini (publish_model ile oluşturulur)
+            configure: Yeni yüklenen PlateDetector'a eşik/boyut/önbellek ayarlarını uygulayan fonksiyon
+            warmup_shape: Isıtma çıkarımında kullanılacak boş görüntünün şekli
+            warmup_runs: Değiştirmeden önce yapılacak ısıtma çıkarımı sayısı
+            poll_interval: Sürüm listesinin kontrol aralığı (saniye)
+            keep_loaded: Bellekte tutulacak en fazla sürüm sayısı (etkin sürüm dahil)
+        """
+        self.registry_dir = registry_dir
+        self.configure = configure
+        self.warmup_shape = warmup_shape
+        self.warmup_runs = warmup_runs
+        self.poll_interval = poll_interval
+        self.keep_loaded = max(keep_loaded, 1)
+        
+        self._lock = threading.Lock()
+        self._detectors = {}
+        self._leases = {}
+        self._recent = []
+        self._active = None
+        
+        # Yüklenemeyen (sürüm, özet) çiftleri her kontrolde yeniden denenmez
+        self._failed = set()
+        self._loading = None
+        self._stop = threading.Event()
+        self._watcher = None
+    
+    @property
+    def active_version(self):
+        return self._active
+    
+    def _entry(self, version):
+        """
+        Sürüm listesinden sürümün kaydını bul
+        """
+        manifest = read_manifest(self.registry_dir)
+        for entry in manifest['versions']:
+            if entry['version'] == version:
+                return entry
+        return None
+    
+    def _load(self, entry):
+        """
+        Sürümün ağırlıklarını yükle, ayarlarını uygula ve ısıt
+        
+        Dönüş:
+            Hazır PlateDetector nesnesi
+        """
+        weights_path = os.path.join(self.registry_dir, entry['path'])
+        if file_hash(weights_path) != entry['sha256']:
+            raise ValueError(f"{entry['version']} ağırlık dosyasının özeti kayıttakiyle uyuşmuyor")
+        
+        detector = PlateDetector(model_path=weights_path)
+        if self.configure:
+            self.configure(detector)
+        
+        # İlk çıkarımlardaki çekirdek derleme ve bellek ayırma gecikmesi isteklere yansımasın;
+        # ısıtma önbelleği atlayarak doğrudan modeli çalıştırır
+        warmup_image = np.zeros(self.warmup_shape, dtype=np.uint8)
+        for _ in range(self.warmup_runs):
+            detector._run_model(warmup_image)
+        
+        return detector
+    
+    def _activate(self, version, detector):
+        """
+        Hazır modeli etkin yap ve artık gerekmeyen sürümleri bellekten çıkar
+        """
+        with self._lock:
+            self._detectors[version] = detector
+            self._leases.setdefault(version, 0)
+            previous = self._active
+            self._active = version
+            
+            if version in self._recent:
+                self._recent.remove(version)
+            self._recent.append(version)
+            self._evict()
+        
+        if previous and previous != version:
+            print(f"Model sürümü değiştirildi: {previous} -> {version}")
+    
+    def _evict(self):
+        """
+        En son keep_loaded sürüm dışındaki kiralanmamış modelleri bırak (kilit tutulurken çağrılır)
+        """
+        keep = set(self._recent[-self.keep_loaded:])
+        keep.add(self._active)
+        for version in list(self._detectors):
+            if version not in keep and self._leases.get(version, 0) == 0:
+                del self._detectors[version]
+                del self._leases[version]
+                if version in self._recent:
+                    self._recent.remove(version)
+    
+    def switch_to(self, version, background=True):
+        """
+        Verilen sürümü yükleyip etkin yap
+        
+        Parametreler:
+            version: Sürüm adı
+            background: True ise yükleme ve ısıtma arka plan iş parçacığında yapılır
+            
+        Dönüş:
+            Yükleme eşzamanlıysa başarı durumu, arka plandaysa yüklemenin başlatılıp başlatılmadığı
+        """
+        with self._lock:
+            detector = self._detectors.get(version)
+        
+        # Bellekte tutulan sürüme (örneğin geri dönüşte) yükleme yapmadan geçilir
+        if detector is not None:
+            self._activate(version, detector)
+            return True
+        
+        entry = self._entry(version)
+        if entry is None:
+            print(f"Hata: Kayıtta böyle bir sürüm yok: {version}")
+            return False
+        if (version, entry['sha256']) in self._failed:
+            return False
+        
+        # Aynı anda yalnızca bir sürüm yüklenir
+        with self._lock:
+            if self._loading is not None:
+                return False
+            self._loading = version
+        
+        def load():
+            try:
+                start_time = time.time()
+                detector = self._load(entry)
+                print(f"Model sürümü {version} {time.time() - start_time:.1f} saniyede yüklendi ve ısıtıldı")
+                self._activate(version, detector)
+                return True
+            except Exception as e:
+                # Yeni sürüm yüklenemezse eski sürümle hizmet vermeye devam et
+                print(f"Hata: Model sürümü {version} yüklenemedi, {self._active} ile devam ediliyor: {str(e)}")
+                self._failed.add((version, entry['sha256']))
+                return False
+            finally:
+                self._loading = None
+        
+        if not background:
+            return load()
+        
+        threading.Thread(target=load, daemon=True).start()
+        return True
+    
+    def poll(self):
+        """
+        Sürüm listesini kontrol et; etkin sürüm değiştiyse arka planda yüklemeye başla
+        """
+        try:
+            active = read_manifest(self.registry_dir)['active']
+        except (OSError, ValueError) as e:
+            print(f"Uyarı: Model sürüm listesi okunamadı: {str(e)}")
+            return
+        
+        if active and active != self._active and active != self._loading:
+            self.switch_to(active)
+    
+    def start(self, watch=True):
+        """
+        Etkin sürümü eşzamanlı olarak yükle ve isteğe bağlı olarak sürüm listesini izlemeye başla
+        
+        Parametreler:
+            watch: True ise sürüm listesi arka planda poll_interval aralıklarla kontrol edilir
+            
+        Dönüş:
+            Etkin sürüm yüklendiyse True
+        """
+        active = read_manifest(self.registry_dir)['active']
+        if active is None:
+            print(f"Hata: Model kaydında etkin sürüm yok: {self.registry_dir}")
+            return False
+        
+        if not self.switch_to(active, background=False):
+            return False
+        print(f"Etkin model sürümü: {active}")
+        
+        if watch:
+            def run():
+                while not self._stop.wait(self.poll_interval):
+                    self.poll()
+            
+            self._watcher = threading.Thread(target=run, daemon=True)
+            self._watcher.start()
+        
+        return True
+    
+    def stop(self):
+        """
+        Sürüm listesi izlemesini durdur
+        """
+        self._stop.set()
+        if self._watcher is not None:
+            self._watcher.join()
+    
+    def rollback(self):
+        """
+        Bir önceki sürüme geri dön; sürüm bellekteyse geçiş anında olur
+        
+        Dönüş:
+            Geri dönülen sürüm veya None
+        """
+        version = rollback_version(self.registry_dir)
+        if version is None:
+            return None
+        return version if self.switch_to(version) else None
+    
+    def current(self):
+        """
+        Etkin sürümü ve modelini kiralamadan döndür (model değişirse bellekten çıkarılabilir)
+        
+        Dönüş:
+            (sürüm, PlateDetector) demeti
+        """
+        with self._lock:
+            return self._active, self._detectors[self._active]
+    
+    @contextmanager
+    def lease(self):
+        """
+        Etkin modeli bir istek (veya toplu iş) süresince kirala
+        
+        Kiralama süresince model değiştirilse bile aynı model kullanılır ve bellekten çıkarılmaz.
+        
+        Dönüş:
+            (sürüm, PlateDetector) demeti
+        """
+        with self._lock:
+            version = self._active
+            detector = self._detectors[version]
+            self._leases[version] += 1
+        
+        try:
+            yield version, detector
+        finally:
+            with self._lock:
+                self._leases[version] -= 1
+                if self._leases[version] == 0 and version != self._active:
+                    self._evict()
+    
+    def status(self):
+        """
+        Bellekteki sürümleri ve kiralama sayılarını döndür
+        """
+        with self._lock:
+            return {
+                'active': self._active,
+                'loading': self._loading,
+                'loaded': dict(self._leases)
+            }
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Model kaydı: sürüm yayınlama, etkinleştirme ve geri dönüş')
+    parser.add_argument('registry_dir', type=str, help='Model kayıt dizini')
+    parser.add_argument('--publish', type=str, metavar='WEIGHTS', help='Ağırlık dosyasını yeni sürüm olarak yayınla')
+    parser.add_argument('--no-activate', action='store_true', help='Yayınlanan sürümü etkin yapma')
+    parser.add_argument('--note', type=str, help='Yayınlanan sürümün açıklaması')
+    parser.add_argument('--activate', type=str, metavar='VERSION', help='Verilen sürümü etkin yap')
+    parser.add_argument('--rollback', action='store_true', help='Bir önceki etkin sürüme geri dön')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    if args.publish:
+        version = publish_model(args.registry_dir, args.publish, activate=not args.no_activate, note=args.note)
+        print(f"Yayınlandı: {version}")
+    elif args.activate:
+        if not set_active_version(args.registry_dir, args.activate):
+            exit(1)
+    elif args.rollback:
+        if rollback_version(args.registry_dir) is None:
+            exit(1)
+    
+    manifest = read_manifest(args.registry_dir)
+    for entry in manifest['versions']:
+        marker = '*' if entry['version'] == manifest['active'] else ' '
+        print(f"{marker} {entry['version']}  {entry['created']}  {entry['sha256'][:12]}  {entry['note'] or ''}")
@@ -0,0 +1,299 @@
+import time
+import queue
+import threading
+import multiprocessing as mp
+
+import cv2
+import numpy as np
+
+from shm_ring import SharedFrameRing, SlotHandle
+from plate_detection import PlateDetector
+from ocr import PlateOCR
+from char_recognizer import CharRecognizer
+
+# Varsayılan kare yuvası boyutu: 1080p BGR
+DEFAULT_FRAME_SHAPE = (1080, 1920, 3)
+
+# Bir karenin tüm plaka kırpıntıları tek bir kırpıntı yuvasına yazılır
+DEFAULT_CROP_SLOT_BYTES = 4 * 1024 * 1024
+
+def pipeline_settings(detector, ocr, ocr_variant='default', quality_gate=False, rectify=False, save_results=True):
+    """
+    İşçi süreçlerde tespit ve OCR nesnelerini aynı ayarlarla yeniden kurmak için ayar sözlüğü oluştur
+    
+    Parametreler:
+        detector: Ana süreçteki PlateDetector nesnesi
+        ocr: Ana süreçteki PlateOCR veya CharRecognizer nesnesi
+        ocr_variant: OCR ön işleme varyantı
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez
+        rectify: True ise plakalar köşelerinden düzeltilir
+        save_results: True ise işaretlenmiş görüntüler ve kırpıntılar kaydedilir
+        
+    Dönüş:
+        Ayar sözlüğü
+    """
+    return {
+        'model_path': detector.model_path,
+        'conf_threshold': detector.conf_threshold,
+        'iou_threshold': detector.iou_threshold,
+        'img_size': detector.img_size,
+        'cache_dir': detector.cache.cache_dir if detector.cache is not None else None,
+        'ocr_backend': ocr.backend,
+        'tesseract_path': getattr(ocr, 'tesseract_path', None),
+        'char_model_path': getattr(ocr, 'model_path', None),
+        'ocr_variant': ocr_variant,
+        'quality_gate': quality_gate,
+        'rectify': rectify,
+        'save_results': save_results
+    }
+
+def build_detector(settings):
+    """
+    Ayar sözlüğünden yapılandırılmış bir PlateDetector kopyası oluştur
+    
+    Parametreler:
+        settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+        
+    Dönüş:
+        PlateDetector nesnesi
+    """
+    detector = PlateDetector(model_path=settings['model_path'])
+    detector.set_confidence_threshold(settings['conf_threshold'])
+    detector.set_iou_threshold(settings['iou_threshold'])
+    detector.set_image_size(settings['img_size'])
+    if settings['cache_dir']:
+        detector.enable_cache(settings['cache_dir'])
+    return detector
+
+def build_ocr(settings):
+    """
+    Ayar sözlüğünden OCR arka ucunun (Tesseract veya karakter modeli) bir kopyasını oluştur
+    
+    Parametreler:
+        settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+        
+    Dönüş:
+        PlateOCR veya CharRecognizer nesnesi
+    """
+    if settings['ocr_backend'] == 'yolo':
+        return CharRecognizer(settings['char_model_path'])
+    return PlateOCR(tesseract_path=settings['tesseract_path'])
+
+def _decode_worker(image_paths, frame_ring, detect_queue, num_detectors):
+    """
+    Görüntüleri çözüp kare yuvalarına yaz; tespit işçilerine yalnızca tanıtıcıları gönder
+    """
+    for image_path in image_paths:
+        image = cv2.imread(str(image_path))
+        if image is None:
+            detect_queue.put((image_path, None, "görüntü okunamadı"))
+            continue
+        
+        # Boş yuva yoksa burada beklenir; bu, okuma hızını işleme hızına bağlar
+        slot = frame_ring.acquire()
+        try:
+            frame = frame_ring.write(slot, [image])
+        except ValueError:
+            # Yuvadan büyük kareler kuyruk üzerinden kopyalanarak gönderilir
+            frame_ring.release(slot)
+            frame = image
+        
+        detect_queue.put((image_path, frame, None))
+    
+    for _ in range(num_detectors):
+        detect_queue.put(None)
+
+def _detector_worker(settings, frame_ring, crop_ring, detect_queue, ocr_queue):
+    """
+    Kare yuvalarındaki görüntülerde plaka tespit et, kırpıntıları kırpıntı yuvasına yaz
+    """
+    from detect_and_recognize import detect_plate_regions
+    
+    detector = build_detector(settings)
+    
+    while True:
+        item = detect_queue.get()
+        if item is None:
+            break
+        
+        image_path, frame, error = item
+        if error:
+            ocr_queue.put((image_path, None, None, [], 0.0, error))
+            continue
+        
+        start = time.perf_counter()
+        image = None
+        crops = []
+        
+        try:
+            # Kare paylaşılan bellekten kopyalanmadan okunur
+            image = frame_ring.read(frame)[0] if isinstance(frame, SlotHandle) else frame
+            detected_plates, annotated_image, plate_images = detect_plate_regions(image, detector, settings['rectify'])
+        
+            # Kırpıntılar yuvaya yazıldıktan sonra orijinal kareye gerek kalmaz; işaretli görüntü aynı yuvaya yazılır
+            if plate_images:
+                crop_slot = crop_ring.acquire()
+                try:
+                    crops = crop_ring.write(crop_slot, plate_images)
+                except ValueError:
+                    # Yuvaya sığmayan kırpıntılar kuyruk üzerinden kopyalanarak gönderilir
+                    crop_ring.release(crop_slot)
+                    crops = [np.ascontiguousarray(plate_img) for plate_img in plate_images]
+        
+            if settings['save_results']:
+                image[...] = annotated_image
+        except Exception as e:
+            # Hatalı görüntünün yuvaları bırakılır ve hata OCR işçisi üzerinden sonuç olarak iletilir
+            image = None
+            if isinstance(crops, SlotHandle):
+                crop_ring.release(crops)
+            if isinstance(frame, SlotHandle):
+                frame_ring.release(frame)
+            ocr_queue.put((image_path, None, None, [], 0.0, f"tespit başarısız: {str(e)}"))
+            continue
+        
+        del image
+        
+        ocr_queue.put((image_path, frame, crops, detected_plates, time.perf_counter() - start, None))
+
+def _ocr_worker(settings, frame_ring, crop_ring, ocr_queue, result_queue):
+    """
+    Kırpıntı yuvalarındaki plakaları tanı, sonuçları kaydet ve yuvaları halkaya geri ver
+    """
+    from detect_and_recognize import recognize_plate_images, annotate_plate_texts, save_image_results
+    
+    ocr = build_ocr(settings)
+    
+    while True:
+        item = ocr_queue.get()
+        if item is None:
+            break
+        
+        image_path, frame, crops, detected_plates, detect_seconds, error = item
+        if error:
+            result_queue.put((image_path, [], 0.0, error))
+            continue
+        
+        start = time.perf_counter()
+        plate_images = annotated_image = None
+        
+        try:
+            plate_images = crop_ring.read(crops) if isinstance(crops, SlotHandle) else crops
+        
+            recognized_plates = recognize_plate_images(plate_images, detected_plates, ocr,
+                                                       settings['ocr_variant'], settings['quality_gate'])
+        
+            if settings['save_results']:
+                annotated_image = frame_ring.read(frame)[0] if isinstance(frame, SlotHandle) else frame
+                annotate_plate_texts(annotated_image, recognized_plates)
+                save_image_results(str(image_path), annotated_image, plate_images)
+        except Exception as e:
+            recognized_plates, error = [], f"OCR başarısız: {str(e)}"
+        
+        # Görünümler bırakılmadan yuvalar yeniden kullanıma açılmamalı
+        del plate_images, annotated_image
+        if isinstance(crops, SlotHandle):
+            crop_ring.release(crops)
+        if isinstance(frame, SlotHandle):
+            frame_ring.release(frame)
+        
+        seconds = 0.0 if error else detect_seconds + time.perf_counter() - start
+        result_queue.put((image_path, recognized_plates, seconds, error))
+    
+    # Ana sürece bu işçinin bittiğini bildir
+    result_queue.put(None)
+
+def run_pipeline(image_paths, settings, num_detectors=1, num_ocr=2, slots=None, frame_shape=DEFAULT_FRAME_SHAPE,
+                 crop_slot_bytes=DEFAULT_CROP_SLOT_BYTES):
+    """
+    Görüntüleri çözme, tespit ve OCR süreçlerinden oluşan hat üzerinde işle
+    
+    Kareler ve kırpıntılar paylaşılan bellek halkalarında tutulur; süreçler arasında yalnızca
+    yuva tanıtıcıları (yuva, ofset, şekil) ve tespit listeleri gönderilir. Sonuçlar
+    tamamlanma sırasıyla üretilir.
+    
+    Parametreler:
+        image_paths: İşlenecek görüntü yolları
+        settings: pipeline_settings tarafından oluşturulan ayar sözlüğü
+        num_detectors: Tespit süreci sayısı (her biri modelin bir kopyasını yükler)
+        num_ocr: OCR süreci sayısı
+        slots: Halka başına yuva sayısı (None ise işçi sayısının iki katı)
+        frame_shape: Bir kare yuvasına sığması gereken en büyük görüntü şekli
+        crop_slot_bytes: Kırpıntı yuvası başına bayt
+        
+    Dönüş:
+        (görüntü_yolu, tanınan_plakalar, işlem_süresi, hata) demetleri üreten üreteç. Tek bir görüntüdeki
+        hata o görüntünün sonucunda bildirilir
+        
+    Hata:
+        RuntimeError: Bir hat süreci beklenmedik şekilde sonlanırsa veya her görüntü için sonuç üretilmezse
+    """
+    image_paths = list(image_paths)
+    
+    # CUDA ve model iş parçacıkları fork ile güvenli kopyalanamadığı için spawn kullan
+    context = mp.get_context('spawn')
+    slots = slots or 2 * (num_detectors + num_ocr)
+    
+    frame_ring = SharedFrameRing(slots, int(np.prod(frame_shape)), context)
+    crop_ring = SharedFrameRing(slots, crop_slot_bytes, context)
+    detect_queue = context.Queue()
+    ocr_queue = context.Queue()
+    result_queue = context.Queue()
+    
+    decoder = context.Process(target=_decode_worker,
+                              args=(image_paths, frame_ring, detect_queue, num_detectors), daemon=True)
+    detectors = [context.Process(target=_detector_worker,
+                                 args=(settings, frame_ring, crop_ring, detect_queue, ocr_queue), daemon=True)
+                 for _ in range(num_detectors)]
+    ocr_workers = [context.Process(target=_ocr_worker,
+                                   args=(settings, frame_ring, crop_ring, ocr_queue, result_queue), daemon=True)
+                   for _ in range(num_ocr)]
+    processes = [decoder] + detectors + ocr_workers
+    
+    for process in processes:
+        process.start()
+    
+    def close_ocr_queue():
+        # Tüm tespit süreçleri bitince OCR süreçlerine bitiş işareti gönder
+        for process in detectors:
+            process.join()
+        for _ in range(num_ocr):
+            ocr_queue.put(None)
+    
+    closer = threading.Thread(target=close_ocr_queue, daemon=True)
+    closer.start()
+    
+    try:
+        finished_workers = 0
+        produced = 0
+        while finished_workers < num_ocr:
+            try:
+                result = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                failed = [p for p in processes if p.exitcode not in (None, 0)]
+                if failed:
+                    raise RuntimeError(f"{len(failed)} hat süreci beklenmedik şekilde sonlandı")
+                continue
+            
+            if result is None:
+                finished_workers += 1
+                continue
+            
+            produced += 1
+            yield result
+        
+        # Bir tespit süreci ölse de OCR süreçleri bitiş işaretini alıp normal sonlanır; eksik sonuçlar burada
+        # yakalanır. Çözme süreci ölü tespit sürecinin tuttuğu yuvayı bekliyor olabileceği için beklenmez
+        for process in detectors + ocr_workers:
+            process.join()
+        failed = [p for p in detectors + ocr_workers if p.exitcode != 0]
+        if failed or produced != len(image_paths):
+            raise RuntimeError(f"Hat eksik tamamlandı: {len(image_paths)} görüntünün {produced} tanesi için sonuç "
+                               f"alındı, {len(failed)} süreç hatayla sonlandı")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        frame_ring.close()
+        crop_ring.close()
@@ -1,9 +1,47 @@
+import os
 import cv2
 import numpy as np
 import pytesseract
 import re
+import threading
+
+# pytesseract Tesseract yolunu süreç genelinde tutar; aynı anda oluşturulan örnekler için
+_TESSERACT_CMD_LOCK = threading.Lock()
+
+def _set_tesseract_cmd(tesseract_path):
+    """
+    Süreç genelindeki Tesseract yolunu yalnızca değişiyorsa ayarla
+    
+    Aynı yolla oluşturulan örnekler (örneğin bir iş parçacığı havuzundaki OCR işçileri) genel
+    durumu yeniden yazmaz. Farklı bir yol, çalışan diğer örnekleri de etkileyeceği için uyarı verir.
+    
+    Parametreler:
+        tesseract_path: Tesseract uygulamasının yolu
+    """
+    with _TESSERACT_CMD_LOCK:
+        current = pytesseract.pytesseract.tesseract_cmd
+        if current == tesseract_path:
+            return
+        if current != 'tesseract':
+            print(f"Uyarı: Tesseract yolu {current} iken {tesseract_path} olarak değiştiriliyor; "
+                  f"bu süreçteki tüm PlateOCR örnekleri yeni yolu kullanacak")
+        pytesseract.pytesseract.tesseract_cmd = tesseract_path
+
+def limit_tesseract_threads():
+    """
+    Bu süreçten başlatılacak Tesseract süreçlerini tek iş parçacığıyla sınırla
+    
+    Tesseract (OpenMP) her çağrıda çekirdek sayısı kadar iş parçacığı açar; OCR birden çok iş
+    parçacığında paralel çalıştırıldığında bu çekirdekleri aşırı paylaştırır. Ortam değişkeni süreç
+    genelinde olduğu için yalnızca komut satırı giriş noktalarından çağrılır; kullanıcının verdiği
+    OMP_THREAD_LIMIT değeri korunur.
+    """
+    os.environ.setdefault('OMP_THREAD_LIMIT', '1')
 
 class PlateOCR:
+    # Komut satırı ve işçi ayarlarında arka ucu ayırt etmek için
+    backend = 'tesseract'
+    
     def __init__(self, tesseract_path=None):
         """
         Plaka OCR modülünü başlat
@@ -11,9 +49,12 @@ class PlateOCR:
         Parametreler:
             tesseract_path: Tesseract uygulamasının yolu (Windows'ta gerekli)
         """
+        # İşçi süreçlerde aynı ayarla yeniden oluşturabilmek için sakla
+        self.tesseract_path = tesseract_path
+        
         # Tesseract yolunu ayarla (eğer belirtildiyse)
         if tesseract_path:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
+            _set_tesseract_cmd(tesseract_path)
     
     def recognize_plate_v1(self, plate_image, preprocess=True):
         """
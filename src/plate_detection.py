@@ -5,9 +5,22 @@ import torch
 from ultralytics import YOLO
 from pathlib import Path
 import shutil
+import json
 from tqdm import tqdm
 import time
 
+from preprocessing import letterbox_image, order_corners, rectify_plate
+from detection_cache import DetectionCache, filter_detections
+from ufpr_annotations import parse_ufpr_annotation
+from track_sampling import subsample_track
+
+# Dışa aktarma biçimleri için OpenCV kodlama parametreleri
+EXPORT_ENCODE_PARAMS = {
+    'jpg': lambda quality: [cv2.IMWRITE_JPEG_QUALITY, quality],
+    'webp': lambda quality: [cv2.IMWRITE_WEBP_QUALITY, quality],
+    'png': lambda quality: [cv2.IMWRITE_PNG_COMPRESSION, 1]
+}
+
 class PlateDetector:
     def __init__(self, model_path=None):
         """
@@ -18,12 +31,23 @@ class PlateDetector:
         """
         if model_path and os.path.exists(model_path):
             self.model = YOLO(model_path)
+            self.model_path = model_path
         else:
             # Önceden eğitilmiş YOLOv8 modelini kullan
             self.model = YOLO('yolov8n.pt')
+            self.model_path = 'yolov8n.pt'
         
         # Varsayılan güven eşiği
         self.conf_threshold = 0.25
+        
+        # Çıkarım görüntü boyutu (None ise model varsayılanı)
+        self.img_size = None
+    
+        # NMS IoU eşiği (None ise model varsayılanı)
+        self.iou_threshold = None
+        
+        # Ham tespit önbelleği (enable_cache ile etkinleştirilir)
+        self.cache = None
     
     def set_confidence_threshold(self, conf_threshold):
         """
@@ -34,25 +58,155 @@ class PlateDetector:
         """
         self.conf_threshold = conf_threshold
     
-    def detect(self, image):
+    def set_image_size(self, img_size):
+        """
+        Çıkarım için giriş görüntüsü boyutunu ayarla
+        
+        Parametreler:
+            img_size: Giriş boyutu (piksel, 32'nin katı). None ise model varsayılanı kullanılır
+        """
+        self.img_size = img_size
+    
+    def set_iou_threshold(self, iou_threshold):
+        """
+        Tespit için NMS IoU eşiğini ayarla
+        
+        Parametreler:
+            iou_threshold: IoU eşiği değeri (0-1). None ise model varsayılanı kullanılır
+        """
+        self.iou_threshold = iou_threshold
+    
+    def enable_cache(self, cache_dir, raw_conf=0.01, raw_iou=0.95):
+        """
+        Ham tespitleri diskte önbelleğe al; eşik, NMS ve OCR denemeleri modeli yeniden çalıştırmaz
+        
+        Parametreler:
+            cache_dir: Önbellek dizini
+            raw_conf: Önbelleğe alınacak en düşük güven (daha düşük eşikler önbellekten sunulamaz)
+            raw_iou: Ham çıkarımdaki NMS IoU eşiği
+        """
+        self.cache = DetectionCache(cache_dir, raw_conf=raw_conf, raw_iou=raw_iou)
+    
+    def _inference_args(self):
+        """
+        Model çağrısı için çıkarım argümanlarını döndür
+        """
+        args = {'conf': self.conf_threshold}
+        if self.iou_threshold is not None:
+            args['iou'] = self.iou_threshold
+        if self.img_size:
+            args['imgsz'] = self.img_size
+        return args
+    
+    def _parse_result(self, result):
+        """
+        Ultralytics sonucundan kutuları ve köşe noktalarını numpy dizisi olarak çıkar
+        
+        Dönüş:
+            boxes: (N, 6) dizisi [x1, y1, x2, y2, güven, sınıf]
+            keypoints: (N, 4, 2) köşe noktası dizisi veya model köşe üretmiyorsa None
+        """
+        boxes = np.array(result.boxes.data.tolist(), dtype=np.float64).reshape(-1, 6)
+        
+        # Köşe noktası (pose) modelleri her kutu için 4 köşe üretir
+        keypoints = None
+        if getattr(result, 'keypoints', None) is not None and len(boxes) > 0:
+            keypoints = np.array(result.keypoints.xy.tolist(), dtype=np.float64).reshape(len(boxes), -1, 2)
+        
+        return boxes, keypoints
+    
+    def _run_model(self, image, **overrides):
+        """
+        Modeli çalıştır ve kutuları ile köşe noktalarını numpy dizisi olarak döndür
+        """
+        return self._parse_result(self.model(image, **dict(self._inference_args(), **overrides))[0])
+    
+    def _run_model_batch(self, images, **overrides):
+        """
+        Modeli birden çok görüntüde tek ileri geçişte çalıştır
+        
+        Dönüş:
+            Her görüntü için (boxes, keypoints) demetleri listesi
+        """
+        results = self.model(list(images), **dict(self._inference_args(), **overrides))
+        return [self._parse_result(result) for result in results]
+    
+    def _raw_detections_batch(self, images):
+        """
+        Geçerli eşik ve NMS ayarlarıyla görüntülerin tespitlerini döndür; önbellek etkinse model yalnızca
+        ıskalanan görüntülerde, hepsi birlikte tek toplu işte çalışır
+        """
+        if not images:
+            return []
+        
+        if self.cache is None or self.conf_threshold < self.cache.raw_conf:
+            return self._run_model_batch(images)
+        
+        # Görüntü özeti bir kez hesaplanır; ıskalamada aynı anahtarla yazılır
+        entry_paths = [self.cache.entry_path(self.model_path, image, self.img_size) for image in images]
+        cached = [self.cache.get(entry_path) for entry_path in entry_paths]
+        misses = [i for i, entry in enumerate(cached) if entry is None]
+        if misses:
+            computed = self._run_model_batch([images[i] for i in misses], conf=self.cache.raw_conf,
+                                             iou=self.cache.raw_iou)
+            for i, entry in zip(misses, computed):
+                self.cache.put(entry_paths[i], entry[0], entry[1])
+                cached[i] = entry
+        
+        # Ultralytics varsayılan NMS eşiği 0.7'dir
+        iou_threshold = self.iou_threshold if self.iou_threshold is not None else 0.7
+        return [filter_detections(boxes, self.conf_threshold, iou_threshold, keypoints) for boxes, keypoints in cached]
+    
+    def _raw_detections(self, image):
+        """
+        Geçerli eşik ve NMS ayarlarıyla tespitleri döndür; önbellek etkinse model yalnızca ıskalamada çalışır
+        """
+        if self.cache is None or self.conf_threshold < self.cache.raw_conf:
+            return self._run_model(image)
+        
+        return self._raw_detections_batch([image])[0]
+    
+    def detect(self, image, return_corners=False):
         """
         Görüntüdeki plakaları tespit et
         
         Parametreler:
             image: Giriş görüntüsü (BGR formatında)
+            return_corners: True ise plaka köşeleri de döndürülür (köşe noktası modeli gerekir)
             
         Dönüş:
             detected_plates: Plaka bölgelerinin listesi [x1, y1, x2, y2, güven]
             annotated_image: Tespit kutuları çizilmiş görüntü
+            corners: (return_corners=True ise) her plaka için 4 köşe noktası veya model köşe üretmiyorsa None
         """
-        # Çıkarım yap
-        results = self.model(image, conf=self.conf_threshold)[0]
+        # Çıkarım yap (veya önbellekten al)
+        boxes, keypoints = self._raw_detections(image)
+        return self._format_detections(image, boxes, keypoints, return_corners)
         
+    def detect_batch(self, images, return_corners=False):
+        """
+        Birden çok görüntüdeki plakaları tek ileri geçişte tespit et
+        
+        Parametreler:
+            images: Giriş görüntüleri listesi (BGR formatında, boyutları farklı olabilir)
+            return_corners: True ise plaka köşeleri de döndürülür (köşe noktası modeli gerekir)
+            
+        Dönüş:
+            Her görüntü için detect ile aynı biçimde demetler listesi
+        """
+        return [self._format_detections(image, boxes, keypoints, return_corners)
+                for image, (boxes, keypoints) in zip(images, self._raw_detections_batch(images))]
+    
+    def _format_detections(self, image, boxes, keypoints, return_corners=False):
+        """
+        Ham kutuları tespit listesine dönüştür ve görüntüye çiz
+        """
         detected_plates = []
         annotated_image = image.copy()
+        corners = []
         
         # Sonuçları işle
-        for result in results.boxes.data.tolist():
+        for i, result in enumerate(boxes.tolist()):
             x1, y1, x2, y2, confidence, class_id = result
             
             # Tespiti listeye ekle
@@ -63,29 +217,51 @@ class PlateDetector:
             cv2.putText(annotated_image, f"Plaka: {confidence:.2f}", (int(x1), int(y1) - 10),
                         cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
         
+            if keypoints is not None:
+                plate_corners = keypoints[i].tolist()
+                corners.append(plate_corners)
+                cv2.polylines(annotated_image, [np.array(plate_corners, dtype=np.int32)], True, (255, 0, 0), 1)
+            else:
+                corners.append(None)
+        
+        if return_corners:
+            return detected_plates, annotated_image, corners
         return detected_plates, annotated_image
     
-    def extract_plate_regions(self, image, detected_plates):
+    def extract_plate_regions(self, image, detected_plates, corners=None, rectify_size=None):
         """
         Görüntüden plaka bölgelerini çıkar
         
         Parametreler:
             image: Giriş görüntüsü
             detected_plates: Tespit edilen plaka bölgeleri listesi [x1, y1, x2, y2, güven]
+            corners: Her plaka için 4 köşe noktası veya None (detect(..., return_corners=True) çıktısı)
+            rectify_size: (genişlik, yükseklik) verilirse köşesi bilinen plakalar perspektif
+                          dönüşümüyle düzeltilir, diğerleri bu boyuta ölçeklenir
             
         Dönüş:
             Kırpılmış plaka görüntüleri listesi
         """
         plate_images = []
         
-        for plate in detected_plates:
+        for i, plate in enumerate(detected_plates):
             x1, y1, x2, y2, _ = plate
-            plate_img = image[y1:y2, x1:x2]
+            plate_corners = corners[i] if corners else None
+            
+            if rectify_size and plate_corners is not None:
+                plate_img = rectify_plate(image, plate_corners, rectify_size)
+            else:
+                plate_img = image[y1:y2, x1:x2]
+                if rectify_size and plate_img.size > 0:
+                    plate_img = cv2.resize(plate_img, rectify_size, interpolation=cv2.INTER_LINEAR)
+            
             plate_images.append(plate_img)
         
         return plate_images
     
-    def train_custom_model(self, dataset_path, epochs=50, batch_size=16, img_size=640):
+    def train_custom_model(self, dataset_path, epochs=50, batch_size=16, img_size=640, device=None, workers=None,
+                           cache=False, rect=False, amp=None, fraction=None, validate=True, update_model=True,
+                           callbacks=None, fliplr=None):
         """
         Plaka tespiti için özel YOLOv8 modeli eğit
         
@@ -94,6 +270,16 @@ class PlateDetector:
             epochs: Eğitim epoch sayısı
             batch_size: Toplu iş boyutu
             img_size: Model için giriş görüntüsü boyutu
+            device: Eğitim cihazı ('cpu', '0' vb.). None ise GPU varsa GPU kullanılır
+            workers: Veri yükleyici işçi sayısı. None ise kütüphane varsayılanı kullanılır
+            cache: Görüntü önbelleği (False, 'ram' veya 'disk')
+            rect: Dikdörtgen toplu işlerle eğitim yapılıp yapılmayacağı
+            amp: Karışık hassasiyet (AMP). None ise kütüphane varsayılanı kullanılır
+            fraction: Eğitimde kullanılacak veri oranı (0-1). None ise tüm veri kullanılır
+            validate: Her epoch sonunda doğrulama yapılıp yapılmayacağı
+            update_model: Eğitim sonrası mevcut modelin yeni ağırlıklarla değiştirilip değiştirilmeyeceği
+            callbacks: Eğitime eklenecek {olay_adı: fonksiyon} geri çağırma sözlüğü (isteğe bağlı)
+            fliplr: Yatay çevirme olasılığı. None ise kütüphane varsayılanı (karakter modellerinde 0 olmalı)
             
         Dönüş:
             Kaydedilen modelin yolu veya hata durumunda None
@@ -137,36 +323,68 @@ class PlateDetector:
         os.makedirs(output_dir, exist_ok=True)
         print(f"Eğitim çıktıları şuraya kaydedilecek: {output_dir}")
         
+        # Köşe noktalı veri setlerinde (kpt_shape) pose modeli eğit
+        base_model = 'yolov8n-pose.pt' if 'kpt_shape' in yaml_content else 'yolov8n.pt'
+        
         # Yeni bir model başlat
         try:
-            model = YOLO('yolov8n.pt')
-            print("YOLOv8n modeli başarıyla yüklendi")
+            model = YOLO(base_model)
+            print(f"{base_model} modeli başarıyla yüklendi")
         except Exception as e:
             print(f"Model yüklenirken hata: {str(e)}")
             return None
         
+        if device is None:
+            device = '0' if torch.cuda.is_available() else 'cpu'
+        
+        train_args = {
+            'data': yaml_path,  # Doğrudan yaml dosyasını kullan
+            'epochs': epochs,
+            'batch': batch_size,
+            'imgsz': img_size,
+            'save': True,
+            'project': os.path.dirname(output_dir),
+            'name': os.path.basename(output_dir),
+            'device': device,
+            'cache': cache,
+            'rect': rect,
+            'val': validate
+        }
+        
+        # Belirtilmeyen ayarlarda kütüphane varsayılanlarını koru
+        if workers is not None:
+            train_args['workers'] = workers
+        if amp is not None:
+            train_args['amp'] = amp
+        if fraction is not None:
+            train_args['fraction'] = fraction
+        if fliplr is not None:
+            train_args['fliplr'] = fliplr
+        
+        for event, callback in (callbacks or {}).items():
+            model.add_callback(event, callback)
+        
         # Modeli eğit
         try:
             print(f"Eğitim başlatılıyor: {epochs} epochs, {batch_size} batch size, {img_size} image size")
             print(f"Veri seti: {dataset_path}")
-            print(f"Cihaz: {'GPU' if torch.cuda.is_available() else 'CPU'}")
+            print(f"Cihaz: {'CPU' if device == 'cpu' else 'GPU'}")
+            print(f"Veri yükleyici: workers={workers}, cache={cache}, rect={rect}, amp={amp}")
             
-            results = model.train(
-                data=yaml_path,  # Doğrudan yaml dosyasını kullan
-                epochs=epochs,
-                batch=batch_size,
-                imgsz=img_size,
-                save=True,
-                project=os.path.dirname(output_dir),
-                name=os.path.basename(output_dir),
-                device='0' if torch.cuda.is_available() else 'cpu'
-            )
+            results = model.train(**train_args)
             
             # Kaydedilen modelin yolunu al
-            saved_model_path = str(Path(results.save_dir) / 'weights' / 'best.pt')
+            # Doğrulama kapalıyken bazı sürümler sonuç döndürmez; kayıt dizinini eğiticiden al
+            save_dir = results.save_dir if results is not None else model.trainer.save_dir
+            weights_dir = Path(save_dir) / 'weights'
+            saved_model_path = str(weights_dir / 'best.pt')
+            if not os.path.exists(saved_model_path):
+                saved_model_path = str(weights_dir / 'last.pt')
             
             # Mevcut modeli güncelle
-            self.model = YOLO(saved_model_path)
+            if update_model:
+                self.model = YOLO(saved_model_path)
+                self.model_path = saved_model_path
             
             print(f"Eğitim başarıyla tamamlandı. Model kaydedildi: {saved_model_path}")
             return saved_model_path
@@ -187,20 +405,45 @@ class PlateDetector:
             print(f"Hata türü: {type(e).__name__}")
             return None
 
-    def prepare_ufpr_dataset(self, dataset_root, output_path):
+    def prepare_ufpr_dataset(self, dataset_root, output_path, export_size=None, export_mode='letterbox',
+                             export_format='jpg', export_quality=90, keypoints=False, frames_per_track=None,
+                             subsample_method='phash', dedup_threshold=None):
         """
         UFPR-ALPR veri setini YOLO eğitimi için hazırla
         
         Parametreler:
             dataset_root: training/validation/testing klasörlerini içeren UFPR-ALPR veri seti kök dizini
             output_path: Hazırlanan veri setini kaydetmek için yol
+            export_size: Belirtilirse görüntüler bu boyuta önceden küçültülür ve yeniden kodlanır
+                         (genellikle eğitimdeki img_size). None ise orijinal PNG'ler kopyalanır
+            export_mode: 'letterbox' (kare, kenarları doldurulmuş) veya 'resize' (yalnızca uzun kenar küçültülür)
+            export_format: Yeniden kodlama biçimi ('jpg', 'webp' veya 'png')
+            export_quality: JPEG/WebP kalitesi (1-100)
+            keypoints: True ise plakanın 4 köşesi YOLO pose etiketlerine köşe noktası olarak yazılır
+            frames_per_track: Verilirse eğitim bölümünde her izlemeden (30 ardışık kare) en fazla bu kadar
+                              birbirinden farklı kare alınır. Doğrulama ve test bölümleri olduğu gibi kalır
+            subsample_method: Kare benzerliği ölçüsü: 'phash' (görüntü özeti) veya 'motion' (plaka kutusu hareketi)
+            dedup_threshold: Bir önceki kareye bu eşikten yakın kareler yakın kopya sayılır (None ise yöntem varsayılanı)
             
         Dönüş:
             Hazırlanan veri setinin yolu
         """
+        if export_format not in EXPORT_ENCODE_PARAMS:
+            print(f"Hata: Desteklenmeyen dışa aktarma biçimi: {export_format}")
+            return None
+        
         print("Veri seti hazırlama başladı...")
         start_time = time.time()
         
+        # Tespitleri orijinal görüntülere geri eşleyebilmek için uygulanan dönüşümleri kaydet
+        export_transforms = {
+            'export_size': export_size,
+            'mode': export_mode,
+            'format': export_format,
+            'quality': export_quality,
+            'images': {}
+        }
+        
         # Çıktı dizinlerini oluştur
         splits = ['train', 'val', 'test']
         for split in splits:
@@ -216,6 +459,7 @@ class PlateDetector:
         
         total_images = 0
         processed_images = 0
+        subsample_stats = {'tracks': 0, 'kept': 0, 'dropped': 0, 'deduplicated': 0}
         
         # Önce toplam görüntü sayısını hesapla
         print("Toplam görüntü sayısı hesaplanıyor...")
@@ -249,8 +493,9 @@ class PlateDetector:
                 if not os.path.isdir(track_path):
                     continue
                 
-                # İzlemedeki her bir görüntüyü işle
-                for file in os.listdir(track_path):
+                # İzlemedeki açıklamalı kareleri sırasıyla topla
+                track_frames = []
+                for file in sorted(os.listdir(track_path)):
                     if not file.endswith('.png'):
                         continue
                     
@@ -261,23 +506,23 @@ class PlateDetector:
                     if not os.path.exists(txt_path):
                         continue
                     
-                    # Açıklama dosyasını oku
-                    with open(txt_path, 'r') as f:
-                        lines = f.readlines()
-                    
-                    # Plaka köşelerini ayrıştır
-                    plate_corners = None
-                    for line in lines:
-                        if line.startswith('corners:'):
-                            corners = line.split(':')[1].strip().split()
-                            plate_corners = []
-                            for corner in corners:
-                                x, y = map(int, corner.split(','))
-                                plate_corners.append([x, y])
-                            break
-                    
-                    if plate_corners is None:
+                    # Açıklama dosyasından plaka köşelerini ayrıştır
+                    annotation = parse_ufpr_annotation(txt_path)
+                    if annotation is None or annotation['corners'] is None:
                         continue
+                    track_frames.append((file, annotation))
+                
+                # Eğitimde neredeyse aynı ardışık kareler yerine izleme başına birkaç farklı kare kullan
+                if frames_per_track and our_split == 'train' and track_frames:
+                    track_frames, track_stats = subsample_track(track_path, track_frames, frames_per_track,
+                                                                subsample_method, dedup_threshold)
+                    subsample_stats['tracks'] += 1
+                    for key, value in track_stats.items():
+                        subsample_stats[key] += value
+                
+                # İzlemedeki her bir görüntüyü işle
+                for file, annotation in track_frames:
+                    plate_corners = annotation['corners']
                     
                     # Köşelerden sınırlayıcı kutuyu hesapla
                     x_coords = [p[0] for p in plate_corners]
@@ -292,6 +537,21 @@ class PlateDetector:
                         continue
                     
                     img_height, img_width = img.shape[:2]
+                    output_file = file
+                    
+                    if export_size:
+                        # Eğitimde her epoch büyük PNG'leri çözmemek için önceden küçült
+                        img, transform = letterbox_image(img, export_size, pad=(export_mode == 'letterbox'))
+                        export_transforms['images'][f"{our_split}/{file}"] = transform
+                        
+                        # Etiketleri yeni görüntü koordinatlarına taşı
+                        scale = transform['scale']
+                        x1, x2 = x1 * scale + transform['pad_x'], x2 * scale + transform['pad_x']
+                        y1, y2 = y1 * scale + transform['pad_y'], y2 * scale + transform['pad_y']
+                        plate_corners = [[x * scale + transform['pad_x'], y * scale + transform['pad_y']]
+                                         for x, y in plate_corners]
+                        img_height, img_width = img.shape[:2]
+                        output_file = os.path.splitext(file)[0] + f'.{export_format}'
                     
                     # YOLO formatına dönüştür (normalize edilmiş merkez x, merkez y, genişlik, yükseklik)
                     center_x = (x1 + x2) / 2 / img_width
@@ -302,11 +562,19 @@ class PlateDetector:
                     # YOLO açıklaması oluştur
                     yolo_annotation = f"0 {center_x} {center_y} {width} {height}"
                     
+                    if keypoints:
+                        # Köşeleri sol-üst, sağ-üst, sağ-alt, sol-alt sırasıyla görünür (2) olarak ekle
+                        for x, y in order_corners(plate_corners):
+                            yolo_annotation += f" {x / img_width} {y / img_height} 2"
+                    
                     # Görüntüyü ve açıklamayı kaydet
-                    output_img_path = os.path.join(output_path, our_split, 'images', file)
+                    output_img_path = os.path.join(output_path, our_split, 'images', output_file)
                     output_label_path = os.path.join(output_path, our_split, 'labels', file.replace('.png', '.txt'))
                     
-                    shutil.copy2(img_path, output_img_path)
+                    if export_size:
+                        cv2.imwrite(output_img_path, img, EXPORT_ENCODE_PARAMS[export_format](export_quality))
+                    else:
+                        shutil.copy2(img_path, output_img_path)
                     with open(output_label_path, 'w') as f:
                         f.write(yolo_annotation)
                     
@@ -326,13 +594,34 @@ test: test/images
 
 nc: 1
 names: ['license_plate']
+"""
+        if keypoints:
+            # Yatay çevirmede sol ve sağ köşeler yer değiştirir
+            yaml_content += """kpt_shape: [4, 3]
+flip_idx: [1, 0, 3, 2]
 """
         with open(os.path.join(output_path, 'dataset.yaml'), 'w') as f:
             f.write(yaml_content)
         
+        if export_size:
+            transforms_path = os.path.join(output_path, 'export_transforms.json')
+            with open(transforms_path, 'w') as f:
+                json.dump(export_transforms, f)
+            print(f"Dışa aktarma dönüşümleri kaydedildi: {transforms_path}")
+        
+        if frames_per_track:
+            subsample_stats.update({'frames_per_track': frames_per_track, 'method': subsample_method,
+                                    'dedup_threshold': dedup_threshold})
+            with open(os.path.join(output_path, 'subsampling.json'), 'w') as f:
+                json.dump(subsample_stats, f, indent=2)
+        
         total_time = time.time() - start_time
         print(f"\nVeri seti hazırlama tamamlandı!")
         print(f"Toplam süre: {total_time/60:.1f} dakika")
         print(f"İşlenen toplam görüntü: {processed_images}")
+        if frames_per_track:
+            print(f"Eğitim alt örneklemesi ({subsample_method}, {subsample_stats['tracks']} izleme): "
+                  f"{subsample_stats['kept']} kare tutuldu, {subsample_stats['deduplicated']} yakın kopya atıldı, "
+                  f"{subsample_stats['dropped']} kare izleme başına {frames_per_track} sınırı nedeniyle bırakıldı")
         
         return output_path 
\ No newline at end of file
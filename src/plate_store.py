@@ -0,0 +1,398 @@
+import os
+import time
+import sqlite3
+import argparse
+
+# OCR'ın sık karıştırdığı karakterleri ortak bir biçime eşle (O/0, I/1 vb.)
+OCR_CONFUSIONS = str.maketrans({
+    'O': '0', 'Q': '0', 'D': '0',
+    'I': '1', 'L': '1',
+    'Z': '2',
+    'S': '5',
+    'G': '6',
+    'B': '8'
+})
+
+# Kalıcı silme komşuluğu dizininin kapsadığı en büyük düzenleme mesafesi; daha büyük mesafeler BK-ağacıyla aranır
+INDEXED_MAX_DISTANCE = 2
+
+def normalize_plate_text(text):
+    """
+    Plaka metnini OCR karışıklıklarına dayanıklı karşılaştırma biçimine dönüştür
+    
+    Parametreler:
+        text: Plaka metni
+        
+    Dönüş:
+        Normalize edilmiş metin
+    """
+    return ''.join(ch for ch in text.upper() if ch.isalnum()).translate(OCR_CONFUSIONS)
+
+def edit_distance(a, b):
+    """
+    İki metin arasındaki Levenshtein düzenleme mesafesini hesapla
+    
+    Parametreler:
+        a: Birinci metin
+        b: İkinci metin
+        
+    Dönüş:
+        Düzenleme mesafesi
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    
+    previous = list(range(len(b) + 1))
+    for i, ch_a in enumerate(a, 1):
+        current = [i]
+        for j, ch_b in enumerate(b, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ch_a != ch_b)
+            ))
+        previous = current
+    
+    return previous[-1]
+
+def deletion_variants(text, max_deletions):
+    """
+    Metinden en fazla max_deletions karakter silinerek elde edilen tüm metinleri üret
+    
+    Düzenleme mesafesi k'den küçük veya eşit iki metnin, en fazla k silmeyle elde edilen
+    biçimlerinden en az biri ortaktır; bu yüzden bu biçimler üzerinden yapılan arama hiçbir
+    eşleşmeyi kaçırmaz (adaylar yine de edit_distance ile doğrulanır).
+    
+    Parametreler:
+        text: Metin
+        max_deletions: En fazla silinecek karakter sayısı
+        
+    Dönüş:
+        Metnin kendisi dahil biçimler kümesi
+    """
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_deletions):
+        frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+        variants |= frontier
+    return variants
+
+class BKTree:
+    def __init__(self):
+        """
+        Düzenleme mesafesine göre yakın metin araması için BK-ağacını başlat
+        """
+        # Her düğüm: [metin, {mesafe: çocuk_düğüm}]
+        self.root = None
+        self.size = 0
+    
+    def add(self, text):
+        """
+        Ağaca yeni bir metin ekle (zaten varsa bir şey yapmaz)
+        
+        Parametreler:
+            text: Eklenecek metin
+        """
+        if self.root is None:
+            self.root = [text, {}]
+            self.size = 1
+            return
+        
+        node = self.root
+        while True:
+            distance = edit_distance(text, node[0])
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = [text, {}]
+                self.size += 1
+                return
+            node = child
+    
+    def search(self, text, max_distance):
+        """
+        Verilen mesafe içindeki tüm metinleri bul
+        
+        Parametreler:
+            text: Aranan metin
+            max_distance: İzin verilen en büyük düzenleme mesafesi
+            
+        Dönüş:
+            (mesafe, metin) demetlerinin mesafeye göre sıralı listesi
+        """
+        if self.root is None:
+            return []
+        
+        matches = []
+        candidates = [self.root]
+        
+        while candidates:
+            node_text, children = candidates.pop()
+            distance = edit_distance(text, node_text)
+            if distance <= max_distance:
+                matches.append((distance, node_text))
+            
+            # Üçgen eşitsizliği: yalnızca [d - k, d + k] aralığındaki çocuklar eşleşebilir
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    candidates.append(child)
+        
+        return sorted(matches)
+
+class PlateStore:
+    def __init__(self, db_path='results/plate_reads.db'):
+        """
+        Tanınan plakaları kalıcı olarak saklayan SQLite deposunu başlat
+        
+        Parametreler:
+            db_path: SQLite veritabanı dosyasının yolu
+        """
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        
+        # Eşzamanlı okuma ve hızlı yazma için WAL kipini kullan
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS reads (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                text TEXT NOT NULL,
+                norm_text TEXT NOT NULL,
+                x1 INTEGER, y1 INTEGER, x2 INTEGER, y2 INTEGER,
+                detection_confidence REAL,
+                ocr_confidence REAL,
+                is_valid INTEGER,
+                source TEXT,
+                timestamp REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_reads_text ON reads(text);
+            CREATE INDEX IF NOT EXISTS idx_reads_norm_text ON reads(norm_text);
+            CREATE TABLE IF NOT EXISTS norm_variants (
+                variant TEXT NOT NULL,
+                norm_text TEXT NOT NULL,
+                PRIMARY KEY (variant, norm_text)
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+        
+        # Dizin eklenmeden önce oluşturulmuş depolarda bulanık arama dizini bir kez kurulur
+        if self.conn.execute('SELECT 1 FROM norm_variants LIMIT 1').fetchone() is None and self.count() > 0:
+            print("Bulanık arama dizini oluşturuluyor...")
+            self._index_texts(norm_text for (norm_text,) in self.conn.execute('SELECT DISTINCT norm_text FROM reads'))
+            self.conn.commit()
+        
+        # BK-ağacı yalnızca INDEXED_MAX_DISTANCE'tan büyük mesafeli ilk aramada oluşturulur
+        self._tree = None
+    
+    def _index_texts(self, norm_texts):
+        """
+        Yeni normalize metinlerin silme biçimlerini kalıcı bulanık arama dizinine ekle (commit çağırana aittir)
+        """
+        for norm_text in set(norm_texts):
+            # Metnin kendisi her zaman dizindedir; varsa tüm biçimleri de eklenmiştir
+            if self.conn.execute('SELECT 1 FROM norm_variants WHERE variant = ? AND norm_text = ?',
+                                 (norm_text, norm_text)).fetchone():
+                continue
+            self.conn.executemany('INSERT OR IGNORE INTO norm_variants (variant, norm_text) VALUES (?, ?)',
+                                  [(variant, norm_text)
+                                   for variant in deletion_variants(norm_text, INDEXED_MAX_DISTANCE)])
+    
+    def add_reads(self, source, recognized_plates, timestamp=None):
+        """
+        Bir görüntüden tanınan plakaları depoya ekle
+        
+        Parametreler:
+            source: Okumanın kaynağı (görüntü yolu, kamera adı vb.)
+            recognized_plates: process_single_image tarafından döndürülen plaka listesi
+            timestamp: Okuma zamanı (Unix saniyesi). None ise şimdiki zaman kullanılır
+            
+        Dönüş:
+            Eklenen okuma sayısı
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        rows = []
+        
+        for plate in recognized_plates:
+            # Metni okunamamış tespitler aramada işe yaramaz
+            if not plate['text']:
+                continue
+            
+            x1, y1, x2, y2 = plate['position']
+            norm_text = normalize_plate_text(plate['text'])
+            rows.append((
+                plate['text'], norm_text, x1, y1, x2, y2,
+                plate['detection_confidence'], plate['ocr_confidence'],
+                int(bool(plate['is_valid'])), source, timestamp
+            ))
+            
+            if self._tree is not None:
+                self._tree.add(norm_text)
+        
+        if rows:
+            self.conn.executemany("""
+                INSERT INTO reads (text, norm_text, x1, y1, x2, y2, detection_confidence,
+                                   ocr_confidence, is_valid, source, timestamp)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._index_texts(row[1] for row in rows)
+            self.conn.commit()
+        
+        return len(rows)
+    
+    def find_exact(self, text):
+        """
+        Plaka metni birebir eşleşen okumaları bul
+        
+        Parametreler:
+            text: Aranan plaka metni
+            
+        Dönüş:
+            Okuma sözlüklerinin listesi
+        """
+        cursor = self.conn.execute(
+            'SELECT * FROM reads WHERE text = ? ORDER BY timestamp', (text.upper(),)
+        )
+        return [self._row_to_dict(row) for row in cursor]
+    
+    def find_similar(self, text, max_distance=1, limit=100):
+        """
+        OCR karışıklıklarına ve küçük hatalara dayanıklı yakın eşleşme araması yap
+        
+        O/0, I/1 gibi karışıklıklar normalize edilmiş metinde mesafe 0 sayılır. INDEXED_MAX_DISTANCE'a
+        kadarki mesafelerde adaylar veritabanındaki silme biçimleri dizininden alınır ve düzenleme
+        mesafesiyle doğrulanır; böylece her süreçte bellekte dizin kurmak gerekmez. Daha büyük
+        mesafeler BK-ağacı üzerinde aranır.
+        
+        Parametreler:
+            text: Aranan plaka metni
+            max_distance: Normalize edilmiş metinler arasında izin verilen en büyük düzenleme mesafesi
+            limit: Döndürülecek en fazla okuma sayısı
+            
+        Dönüş:
+            'distance' alanı eklenmiş okuma sözlüklerinin mesafeye göre sıralı listesi
+        """
+        norm_query = normalize_plate_text(text)
+        if max_distance <= INDEXED_MAX_DISTANCE:
+            matches = self._indexed_search(norm_query, max_distance)
+        else:
+            matches = self._get_tree().search(norm_query, max_distance)
+        
+        results = []
+        for distance, norm_text in matches:
+            cursor = self.conn.execute(
+                'SELECT * FROM reads WHERE norm_text = ? ORDER BY timestamp LIMIT ?',
+                (norm_text, limit - len(results))
+            )
+            for row in cursor:
+                read = self._row_to_dict(row)
+                read['distance'] = distance
+                results.append(read)
+            
+            if len(results) >= limit:
+                break
+        
+        return results
+    
+    def count(self):
+        """
+        Depodaki toplam okuma sayısını döndür
+        """
+        return self.conn.execute('SELECT COUNT(*) FROM reads').fetchone()[0]
+    
+    def _indexed_search(self, norm_query, max_distance):
+        """
+        Silme biçimleri dizininden adayları al ve düzenleme mesafesiyle doğrula
+        
+        Dönüş:
+            (mesafe, normalize_metin) demetlerinin mesafeye göre sıralı listesi
+        """
+        variants = list(deletion_variants(norm_query, max_distance))
+        candidates = set()
+        
+        # SQLite parametre sınırını aşmamak için biçimler parçalar halinde sorgulanır
+        for start in range(0, len(variants), 500):
+            chunk = variants[start:start + 500]
+            cursor = self.conn.execute(
+                f"SELECT DISTINCT norm_text FROM norm_variants WHERE variant IN ({','.join('?' * len(chunk))})", chunk
+            )
+            candidates.update(norm_text for (norm_text,) in cursor)
+        
+        matches = [(edit_distance(norm_query, candidate), candidate) for candidate in candidates]
+        return sorted(match for match in matches if match[0] <= max_distance)
+    
+    def _get_tree(self):
+        """
+        Farklı normalize metinler üzerinden BK-ağacını oluştur (gerekirse)
+        """
+        if self._tree is None:
+            self._tree = BKTree()
+            for (norm_text,) in self.conn.execute('SELECT DISTINCT norm_text FROM reads'):
+                self._tree.add(norm_text)
+        
+        return self._tree
+    
+    def _row_to_dict(self, row):
+        """
+        Veritabanı satırını process_single_image çıktısına benzer bir sözlüğe dönüştür
+        """
+        return {
+            'id': row['id'],
+            'text': row['text'],
+            'position': [row['x1'], row['y1'], row['x2'], row['y2']],
+            'detection_confidence': row['detection_confidence'],
+            'ocr_confidence': row['ocr_confidence'],
+            'is_valid': bool(row['is_valid']),
+            'source': row['source'],
+            'timestamp': row['timestamp']
+        }
+    
+    def close(self):
+        """
+        Veritabanı bağlantısını kapat
+        """
+        self.conn.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Plaka okuma deposunda arama')
+    parser.add_argument('--db', type=str, default='results/plate_reads.db', help='Plaka okuma veritabanının yolu')
+    parser.add_argument('--query', type=str, required=True, help='Aranacak plaka metni')
+    parser.add_argument('--max-distance', type=int, default=1,
+                        help='Bulanık arama için en büyük düzenleme mesafesi (0: yalnızca OCR karışıklıkları)')
+    parser.add_argument('--exact', action='store_true', help='Yalnızca birebir eşleşmeleri ara')
+    parser.add_argument('--limit', type=int, default=100, help='Gösterilecek en fazla sonuç sayısı')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    with PlateStore(args.db) as store:
+        start_time = time.time()
+        if args.exact:
+            reads = store.find_exact(args.query)[:args.limit]
+        else:
+            reads = store.find_similar(args.query, max_distance=args.max_distance, limit=args.limit)
+        elapsed = time.time() - start_time
+        
+        print(f"{store.count()} okuma içinde {len(reads)} eşleşme bulundu ({elapsed * 1000:.1f} ms)")
+        for read in reads:
+            distance = f" (mesafe: {read['distance']})" if 'distance' in read else ''
+            print(f"{read['text']}{distance} - {read['source']} {read['position']} "
+                  f"tespit: {read['detection_confidence']:.2f} OCR: {read['ocr_confidence']:.2f}")
@@ -0,0 +1,188 @@
+import time
+
+import cv2
+import numpy as np
+
+from preprocessing import propose_plate_regions
+
+def covered_fraction(box, region):
+    """
+    Kutunun bölge içinde kalan alan oranını hesapla
+    
+    Parametreler:
+        box: Kutu [x1, y1, x2, y2]
+        region: Bölge [x1, y1, x2, y2]
+        
+    Dönüş:
+        0-1 arası oran
+    """
+    x_left, y_top = max(box[0], region[0]), max(box[1], region[1])
+    x_right, y_bottom = min(box[2], region[2]), min(box[3], region[3])
+    if x_right <= x_left or y_bottom <= y_top:
+        return 0.0
+    
+    box_area = (box[2] - box[0]) * (box[3] - box[1])
+    return (x_right - x_left) * (y_bottom - y_top) / box_area if box_area > 0 else 0.0
+
+def detect_in_region(image, detector, region, return_corners=False, mask=None):
+    """
+    Yalnızca verilen bölgede tespit yap ve sonuçları tam kare koordinatlarına taşı
+    
+    Parametreler:
+        image: Giriş görüntüsü
+        detector: PlateDetector nesnesi
+        region: [x1, y1, x2, y2] bölge
+        return_corners: True ise köşeler de döndürülür
+        mask: Tam kare boyutunda ikili maske (isteğe bağlı). Maskenin dışındaki pikseller ağa siyah verilir
+        
+    Dönüş:
+        detected_plates, annotated_image (ve return_corners=True ise corners)
+    """
+    x1, y1, x2, y2 = region
+    crop = image[y1:y2, x1:x2]
+    crop_mask = None
+    if mask is not None:
+        crop_mask = mask[y1:y2, x1:x2]
+        crop = cv2.bitwise_and(crop, crop, mask=crop_mask)
+    
+    detected, annotated_crop, corners = detector.detect(crop, return_corners=True)
+    
+    detected_plates = [[p[0] + x1, p[1] + y1, p[2] + x1, p[3] + y1, p[4]] for p in detected]
+    corners = [None if c is None else [[x + x1, y + y1] for x, y in c] for c in corners]
+    
+    annotated_image = image.copy()
+    if crop_mask is None:
+        annotated_image[y1:y2, x1:x2] = annotated_crop
+    else:
+        # Maskelenmiş (siyah) alanlar işaretli görüntüye taşınmaz
+        inside = crop_mask > 0
+        annotated_image[y1:y2, x1:x2][inside] = annotated_crop[inside]
+    
+    if return_corners:
+        return detected_plates, annotated_image, corners
+    return detected_plates, annotated_image
+
+class RegionPrefilter:
+    def __init__(self, mode='skip', margin=1.0, min_coverage=0.9):
+        """
+        YOLO'dan önce klasik kenar/morfoloji adımlarıyla aday bölge ön filtresini başlat
+        
+        Parametreler:
+            mode: 'skip' ise aday bulunmayan karelerde YOLO hiç çalıştırılmaz,
+                  'crop' ise ayrıca YOLO yalnızca adayları kapsayan bölgede çalıştırılır
+            margin: Adaylar her yönde aday yüksekliğinin bu katı kadar genişletilir
+            min_coverage: Gerçek plakanın kapsanmış sayılması için bölge içinde kalması gereken alan oranı
+        """
+        if mode not in ('skip', 'crop'):
+            raise ValueError(f"Geçersiz ön filtre modu: {mode}")
+        
+        self.mode = mode
+        self.margin = margin
+        self.min_coverage = min_coverage
+        
+        # Geri çağırma kaybını raporlamak için görüntü başına arama bölgesi (None: kare atlandı)
+        self.regions = {}
+        self.stats = {'frames': 0, 'skipped': 0, 'cropped_area': 0.0, 'seconds': 0.0}
+    
+    def search_region(self, candidates, image_shape):
+        """
+        Adayları genişletip hepsini kapsayan tek bir arama bölgesi oluştur
+        
+        Dönüş:
+            [x1, y1, x2, y2] tamsayı bölge veya aday yoksa None
+        """
+        if not candidates:
+            return None
+        
+        height, width = image_shape[:2]
+        boxes = np.array([c[:4] for c in candidates], dtype=np.float64)
+        pad = (boxes[:, 3] - boxes[:, 1])[:, None] * self.margin
+        
+        # Kenardaki plakaların kesilmemesi için genişlikte yüksekliğin iki katı pay bırak
+        expanded = boxes + np.hstack([-2 * pad, -pad, 2 * pad, pad])
+        x1, y1 = expanded[:, :2].min(axis=0)
+        x2, y2 = expanded[:, 2:].max(axis=0)
+        
+        return [int(max(x1, 0)), int(max(y1, 0)), int(min(x2, width)), int(min(y2, height))]
+    
+    def record(self, image_name, region, image_shape, seconds):
+        """
+        Bir karenin ön filtre sonucunu kaydet
+        """
+        self.stats['frames'] += 1
+        self.stats['seconds'] += seconds
+        if region is None:
+            self.stats['skipped'] += 1
+        else:
+            region_area = (region[2] - region[0]) * (region[3] - region[1])
+            self.stats['cropped_area'] += region_area / (image_shape[0] * image_shape[1])
+        self.regions[image_name] = region
+    
+    def recall_report(self, gt_data):
+        """
+        Ön filtrenin gerçek plakalardan kaçını YOLO'nun göremeyeceği şekilde dışarıda bıraktığını raporla
+        
+        'skip' modunda yalnızca atlanan karelerdeki plakalar, 'crop' modunda ayrıca arama
+        bölgesinin dışında kalan plakalar kayıp sayılır.
+        
+        Parametreler:
+            gt_data: Görüntü adından gerçek etiketlere sözlük (veya UFPRIndex)
+            
+        Dönüş:
+            {'gt_plates', 'lost_plates', 'prefilter_recall', 'skip_rate', 'mean_area_ratio', 'mean_ms'} sözlüğü
+        """
+        gt_plates = 0
+        lost_plates = 0
+        
+        for image_name, region in self.regions.items():
+            if image_name not in gt_data:
+                continue
+            
+            for plate in gt_data[image_name]['plates']:
+                gt_plates += 1
+                if region is None:
+                    lost_plates += 1
+                elif self.mode == 'crop' and covered_fraction(plate['position'], region) < self.min_coverage:
+                    lost_plates += 1
+        
+        frames = max(self.stats['frames'], 1)
+        processed = max(self.stats['frames'] - self.stats['skipped'], 1)
+        
+        return {
+            'gt_plates': gt_plates,
+            'lost_plates': lost_plates,
+            'prefilter_recall': (gt_plates - lost_plates) / gt_plates if gt_plates else None,
+            'skip_rate': self.stats['skipped'] / frames,
+            'mean_area_ratio': self.stats['cropped_area'] / processed if self.mode == 'crop' else 1.0,
+            'mean_ms': self.stats['seconds'] / frames * 1000
+        }
+    
+    def detect(self, image, detector, image_name=None, return_corners=False):
+        """
+        Ön filtreyi uygulayarak plakaları tespit et (PlateDetector.detect ile aynı dönüş biçimi)
+        
+        Parametreler:
+            image: Giriş görüntüsü
+            detector: PlateDetector nesnesi
+            image_name: Raporlama için görüntü adı
+            return_corners: True ise köşeler de döndürülür
+            
+        Dönüş:
+            detected_plates, annotated_image (ve return_corners=True ise corners)
+        """
+        start = time.perf_counter()
+        candidates = propose_plate_regions(image)
+        region = self.search_region(candidates, image.shape)
+        self.record(image_name, region, image.shape, time.perf_counter() - start)
+        
+        if region is None:
+            # Aday yok: ağ çalıştırılmaz
+            empty = ([], image.copy(), []) if return_corners else ([], image.copy())
+            return empty
+        
+        if self.mode == 'skip':
+            return detector.detect(image, return_corners=return_corners)
+        
+        # Yalnızca arama bölgesinde tespit yap
+        return detect_in_region(image, detector, region, return_corners)
+        
\ No newline at end of file
@@ -77,6 +77,266 @@ def apply_morphological_operations(image, operation='close', kernel_size=5):
     else:
         return image
 
+def letterbox_image(image, target_size, pad=True, color=(114, 114, 114)):
+    """
+    Görüntüyü en-boy oranını koruyarak hedef boyuta sığdır ve gerekirse kenarlarını doldur
+    
+    Parametreler:
+        image: Giriş görüntüsü
+        target_size: Hedef kare boyutu (piksel)
+        pad: True ise görüntü target_size x target_size olacak şekilde ortalanıp doldurulur,
+             False ise yalnızca uzun kenar target_size olacak şekilde küçültülür
+        color: Doldurma rengi (YOLO varsayılanı gri)
+        
+    Dönüş:
+        resized: Dönüştürülmüş görüntü
+        transform: Kutuları geri eşlemek için {'scale', 'pad_x', 'pad_y', 'orig_width', 'orig_height'} sözlüğü
+    """
+    height, width = image.shape[:2]
+    scale = min(target_size / width, target_size / height)
+    new_width, new_height = int(round(width * scale)), int(round(height * scale))
+    
+    # Küçültmede alan ortalaması daha az bozulma yaratır
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_LINEAR
+    resized = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+    
+    pad_x, pad_y = 0, 0
+    if pad:
+        pad_x = (target_size - new_width) // 2
+        pad_y = (target_size - new_height) // 2
+        resized = cv2.copyMakeBorder(
+            resized, pad_y, target_size - new_height - pad_y, pad_x, target_size - new_width - pad_x,
+            cv2.BORDER_CONSTANT, value=color
+        )
+    
+    transform = {
+        'scale': scale,
+        'pad_x': pad_x,
+        'pad_y': pad_y,
+        'orig_width': width,
+        'orig_height': height
+    }
+    
+    return resized, transform
+
+def map_boxes_from_letterbox(boxes, transform):
+    """
+    Dönüştürülmüş görüntüdeki kutuları orijinal görüntü koordinatlarına geri eşle
+    
+    Parametreler:
+        boxes: [x1, y1, x2, y2, ...] biçiminde kutular listesi (ek alanlar korunur)
+        transform: letterbox_image tarafından döndürülen dönüşüm sözlüğü
+        
+    Dönüş:
+        Orijinal koordinatlardaki kutular listesi
+    """
+    scale = transform['scale']
+    max_x, max_y = transform['orig_width'], transform['orig_height']
+    
+    mapped = []
+    for box in boxes:
+        x1 = (box[0] - transform['pad_x']) / scale
+        y1 = (box[1] - transform['pad_y']) / scale
+        x2 = (box[2] - transform['pad_x']) / scale
+        y2 = (box[3] - transform['pad_y']) / scale
+        
+        mapped.append([
+            int(round(min(max(x1, 0), max_x))), int(round(min(max(y1, 0), max_y))),
+            int(round(min(max(x2, 0), max_x))), int(round(min(max(y2, 0), max_y)))
+        ] + list(box[4:]))
+    
+    return mapped
+
+def order_corners(corners):
+    """
+    Dört köşe noktasını sol-üst, sağ-üst, sağ-alt, sol-alt sırasına diz
+    
+    Parametreler:
+        corners: Herhangi bir sıradaki 4 köşe noktası [[x, y], ...]
+        
+    Dönüş:
+        Sıralanmış köşeler (4x2 float32 numpy dizisi)
+    """
+    points = np.array(corners, dtype=np.float32).reshape(4, 2)
+    
+    # Sol-üst en küçük x+y, sağ-alt en büyük x+y; sağ-üst en küçük y-x, sol-alt en büyük y-x
+    sums = points.sum(axis=1)
+    diffs = points[:, 1] - points[:, 0]
+    
+    return np.array([
+        points[np.argmin(sums)],
+        points[np.argmin(diffs)],
+        points[np.argmax(sums)],
+        points[np.argmax(diffs)]
+    ], dtype=np.float32)
+
+def rectify_plate(image, corners, output_size=(240, 80)):
+    """
+    Eğik plakayı köşelerinden perspektif dönüşümüyle düz ve sabit boyutlu hale getir
+    
+    Parametreler:
+        image: Tam giriş görüntüsü
+        corners: Plakanın 4 köşe noktası [[x, y], ...]
+        output_size: Çıktı boyutu (genişlik, yükseklik)
+        
+    Dönüş:
+        Düzeltilmiş plaka görüntüsü
+    """
+    width, height = output_size
+    source = order_corners(corners)
+    target = np.array([[0, 0], [width - 1, 0], [width - 1, height - 1], [0, height - 1]], dtype=np.float32)
+    
+    matrix = cv2.getPerspectiveTransform(source, target)
+    return cv2.warpPerspective(image, matrix, (width, height), flags=cv2.INTER_LINEAR,
+                               borderMode=cv2.BORDER_REPLICATE)
+
+def propose_plate_regions(image, work_width=640, min_aspect=1.5, max_aspect=6.0, min_area_ratio=0.0003,
+                          max_area_ratio=0.05, min_fill=0.4, min_edge_density=0.15):
+    """
+    Kenar yoğunluğu ve plaka en-boy oranına sahip dikdörtgen konturlarla aday plaka bölgeleri öner
+    
+    Parametreler:
+        image: Giriş görüntüsü
+        work_width: İşlemin yapılacağı genişlik (büyük kareler bu genişliğe küçültülür)
+        min_aspect, max_aspect: Kabul edilen genişlik/yükseklik oranı aralığı
+        min_area_ratio, max_area_ratio: Aday alanının kare alanına oranı için sınırlar
+        min_fill: Kontur alanının sınırlayıcı dikdörtgen alanına en düşük oranı (dikdörtgensilik)
+        min_edge_density: Aday içindeki kenar piksellerinin en düşük oranı
+        
+    Dönüş:
+        Orijinal koordinatlarda aday bölgeler listesi [x1, y1, x2, y2, kenar_yoğunluğu]
+    """
+    gray = grayscale(image)
+    scale = min(1.0, work_width / gray.shape[1])
+    if scale < 1.0:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
+    # Karakterlerin kenarlarını birleştirerek plakayı tek bir bloba dönüştür
+    edges = detect_edges(apply_gaussian_blur(gray, (3, 3)), 100, 200)
+    closed = apply_morphological_operations(edges, 'close', 5)
+    
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    frame_area = gray.shape[0] * gray.shape[1]
+    
+    candidates = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        area = w * h
+        if not min_area_ratio * frame_area <= area <= max_area_ratio * frame_area:
+            continue
+        if not min_aspect <= w / h <= max_aspect:
+            continue
+        if cv2.contourArea(contour) < min_fill * area:
+            continue
+        
+        density = cv2.countNonZero(edges[y:y + h, x:x + w]) / area
+        if density < min_edge_density:
+            continue
+        
+        candidates.append([x / scale, y / scale, (x + w) / scale, (y + h) / scale, density])
+    
+    return candidates
+
+# OCR öncesi kırpıntı kalite kapısının eşikleri
+CROP_QUALITY_THRESHOLDS = {
+    'min_width': 30,        # piksel
+    'min_height': 10,       # piksel
+    'min_sharpness': 60.0,  # normalize kırpıntıda Laplasyen varyansı
+    'min_contrast': 18.0,   # normalize kırpıntıda gri seviye standart sapması
+    'min_components': 3,    # karakter boyutlu bağlı bileşen sayısı
+    'max_components': 15
+}
+
+# Kalite ölçümlerinin yapıldığı ortak kırpıntı boyutu (genişlik, yükseklik)
+QUALITY_SAMPLE_SIZE = (120, 40)
+
+def _count_character_components(binary):
+    """
+    İkili kırpıntıdaki karakter boyutlu bağlı bileşenleri say
+    
+    Parametreler:
+        binary: Karakterleri beyaz olan ikili görüntü
+        
+    Dönüş:
+        Karakter olabilecek bileşen sayısı
+    """
+    _, _, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    height = binary.shape[0]
+    heights, widths = stats[1:, cv2.CC_STAT_HEIGHT], stats[1:, cv2.CC_STAT_WIDTH]
+    
+    # Karakterler kırpıntı yüksekliğinin kabaca üçte biri ile tamamı arasındadır ve geniş değildir
+    is_character = (heights >= 0.3 * height) & (heights <= 0.95 * height) & (widths <= heights * 1.5)
+    return int(np.count_nonzero(is_character))
+
+def assess_crop_quality(plate_images, thresholds=None):
+    """
+    Bir görüntünün (veya toplu işin) tüm plaka kırpıntılarını OCR öncesi ucuz ölçütlerle değerlendir
+    
+    Kırpıntılar ortak bir boyuta getirilip tek bir dizide toplanır; keskinlik ve kontrast
+    tüm kırpıntılar için tek seferde hesaplanır. Bağlı bileşen sayımı yalnızca ilk ölçütleri
+    geçen kırpıntılarda yapılır.
+    
+    Parametreler:
+        plate_images: Kırpılmış plaka görüntüleri listesi
+        thresholds: Eşik sözlüğü (None ise CROP_QUALITY_THRESHOLDS)
+        
+    Dönüş:
+        Her kırpıntı için {'ok', 'reason', 'width', 'height', 'sharpness', 'contrast', 'components'} sözlükleri listesi
+    """
+    thresholds = dict(CROP_QUALITY_THRESHOLDS, **(thresholds or {}))
+    reports = [{'ok': False, 'reason': 'empty', 'width': 0, 'height': 0,
+                'sharpness': 0.0, 'contrast': 0.0, 'components': 0} for _ in plate_images]
+    
+    # Boyut kontrolü ve ortak boyuta getirme
+    samples, indices = [], []
+    for i, plate_img in enumerate(plate_images):
+        if plate_img is None or plate_img.size == 0:
+            continue
+        
+        height, width = plate_img.shape[:2]
+        reports[i].update(width=width, height=height)
+        if width < thresholds['min_width'] or height < thresholds['min_height']:
+            reports[i]['reason'] = 'too_small'
+            continue
+        
+        samples.append(cv2.resize(grayscale(plate_img), QUALITY_SAMPLE_SIZE, interpolation=cv2.INTER_AREA))
+        indices.append(i)
+    
+    if not samples:
+        return reports
+    
+    stack = np.stack(samples).astype(np.float32)
+    
+    # Tüm kırpıntılar için Laplasyen (4-komşu) varyansı ve kontrast
+    laplacian = (4 * stack[:, 1:-1, 1:-1] - stack[:, :-2, 1:-1] - stack[:, 2:, 1:-1]
+                 - stack[:, 1:-1, :-2] - stack[:, 1:-1, 2:])
+    sharpness = laplacian.var(axis=(1, 2))
+    contrast = stack.std(axis=(1, 2))
+    
+    for k, i in enumerate(indices):
+        report = reports[i]
+        report.update(sharpness=float(sharpness[k]), contrast=float(contrast[k]))
+        
+        if contrast[k] < thresholds['min_contrast']:
+            report['reason'] = 'low_contrast'
+            continue
+        if sharpness[k] < thresholds['min_sharpness']:
+            report['reason'] = 'blurry'
+            continue
+        
+        # Koyu karakter / açık zemin varsayımıyla karakterleri beyaz yap
+        _, binary = cv2.threshold(samples[k], 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        components = _count_character_components(binary)
+        report['components'] = components
+        
+        if not thresholds['min_components'] <= components <= thresholds['max_components']:
+            report['reason'] = 'no_characters'
+            continue
+        
+        report.update(ok=True, reason=None)
+    
+    return reports
+
 def preprocess_image_for_plate_detection(image):
     """
     Plaka tespiti için görüntüyü ön işle
@@ -166,4 +426,11 @@ def preprocess_plate_for_ocr(plate_img):
     # binary_plate = cv2.erode(binary_plate, kernel, iterations = 1)
     # binary_plate = cv2.dilate(binary_plate, kernel, iterations = 1)
 
-    return binary_plate    
\ No newline at end of file
+    return binary_plate
+
+# OCR ön işleme varyantları (ayar taramaları ve komut satırı seçimi için)
+OCR_PREPROCESSING_VARIANTS = {
+    'default': preprocess_plate_for_ocr,
+    'v1': preprocess_plate_for_ocr_v1,
+    'none': lambda plate_img: plate_img
+}
@@ -0,0 +1,272 @@
+import os
+import re
+import sys
+import time
+import zlib
+import linecache
+import threading
+from collections import Counter
+from xml.sax.saxutils import escape
+
+# Kilit, kuyruk veya olay beklerken alınan örnekler boşta sayılır ve varsayılan olarak profile eklenmez
+IDLE_FRAMES = {
+    ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock'), ('queue.py', 'get'),
+    ('selectors.py', 'select'), ('thread.py', '_worker'), ('connection.py', '_recv'),
+    ('connection.py', 'poll'), ('base_events.py', '_run_once')
+}
+
+# Yaprak satırdaki yerel (C) çağrıyı ayrı bir kare olarak göstermek için: cv2.resize(...), np.dot(...)
+NATIVE_CALL = re.compile(r'\b(cv2|np|numpy|torch|pytesseract)\.([A-Za-z_][\w.]*)\s*\(')
+
+class SamplingProfiler:
+    def __init__(self, interval=0.005, include_idle=False, max_depth=128):
+        """
+        Çalışan süreçteki tüm iş parçacıklarının yığınlarını düzenli aralıklarla örnekleyen profil çıkarıcı
+        
+        Örnekleme ayrı bir iş parçacığında sys._current_frames ile yapılır; izlenen koda hiçbir kanca
+        eklenmez, bu yüzden ek yük örnekleme aralığıyla sınırlıdır (5 ms'de tipik olarak %1-3).
+        Örnekler duvar saatine göredir; OpenCV, numpy ve Tesseract gibi yerel çağrılar yaprak satırdan
+        çıkarılan "[cv2.resize]" biçimindeki sahte karelerle gösterilir. Çok süreçli hatta yalnızca bu
+        süreç örneklenir.
+        
+        Parametreler:
+            interval: Örnekleme aralığı (saniye)
+            include_idle: True ise kilit/kuyruk bekleyen iş parçacıklarının örnekleri de eklenir
+            max_depth: Örneklenen en fazla yığın derinliği
+        """
+        self.interval = interval
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        
+        self.samples = Counter()
+        self.stats = {'samples': 0, 'idle': 0, 'sampler_seconds': 0.0, 'wall_seconds': 0.0}
+        
+        self._labels = {}
+        self._native = {}
+        self._thread_names = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_time = None
+    
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            # co_qualname (Sınıf.metot) Python 3.11 ile geldi; eski sürümlerde yalnızca fonksiyon adı kullanılır
+            label = f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+            self._labels[code] = label
+        return label
+    
+    def _native_call(self, frame):
+        """
+        Yaprak karenin satırında çağrılan yerel fonksiyonu bul (satır başına önbellekli)
+        """
+        key = (frame.f_code.co_filename, frame.f_lineno)
+        if key not in self._native:
+            match = NATIVE_CALL.search(linecache.getline(*key))
+            self._native[key] = f"[{match.group(1)}.{match.group(2)}]" if match else None
+        return self._native[key]
+    
+    def _refresh_thread_names(self):
+        # Havuz iş parçacıklarının adlarındaki sıra numaraları atılır; aynı havuz tek kök altında toplanır
+        self._thread_names = {thread.ident: re.sub(r'[_-]\d+$', '', thread.name)
+                              for thread in threading.enumerate()}
+    
+    def _sample(self, own_ident):
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            
+            leaf = frame
+            if (os.path.basename(leaf.f_code.co_filename), leaf.f_code.co_name) in IDLE_FRAMES:
+                self.stats['idle'] += 1
+                if not self.include_idle:
+                    continue
+            
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            stack.reverse()
+            
+            native = self._native_call(leaf)
+            if native:
+                stack.append(native)
+            
+            if ident not in self._thread_names:
+                self._refresh_thread_names()
+            root = f"thread:{self._thread_names.get(ident, ident)}"
+            
+            self.samples[(root, *stack)] += 1
+            self.stats['samples'] += 1
+    
+    def _run(self):
+        own_ident = threading.get_ident()
+        self._refresh_thread_names()
+        while not self._stop.wait(self.interval):
+            start = time.perf_counter()
+            self._sample(own_ident)
+            self.stats['sampler_seconds'] += time.perf_counter() - start
+    
+    def start(self):
+        """
+        Örneklemeyi arka planda başlat
+        
+        Dönüş:
+            self (zincirleme kullanım için)
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._start_time = time.perf_counter()
+            self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        """
+        Örneklemeyi durdur
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.stats['wall_seconds'] += time.perf_counter() - self._start_time
+    
+    def __enter__(self):
+        return self.start()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+    
+    def collapsed(self):
+        """
+        Örnekleri katlanmış yığın biçiminde döndür ("kök;çağıran;çağrılan sayı"; flamegraph.pl ve speedscope ile uyumlu)
+        """
+        return [f"{';'.join(stack)} {count}" for stack, count in sorted(self.samples.items())]
+    
+    def top_functions(self, limit=20):
+        """
+        En çok zaman alan fonksiyonları bul
+        
+        Dönüş:
+            (fonksiyon, kendi_örnekleri, toplam_örnekler) listesi; kendi örneklerine göre azalan sırada.
+            Toplam örnekler fonksiyonun yığında bulunduğu (çağırdıkları dahil) örneklerdir
+        """
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.samples.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack[1:]):
+                total_counts[label] += count
+        
+        return [(label, count, total_counts[label]) for label, count in self_counts.most_common(limit)]
+    
+    def write_flamegraph(self, path, title="Plaka Tanıma Profili", width=1200, frame_height=16):
+        """
+        Örneklerden etkileşimli (fareyle üzerine gelince ayrıntı gösteren) SVG flamegraph oluştur
+        """
+        # Yığınlardan çağrı ağacı kur
+        tree = {'count': 0, 'children': {}}
+        for stack, count in self.samples.items():
+            node = tree
+            node['count'] += count
+            for label in stack:
+                node = node['children'].setdefault(label, {'count': 0, 'children': {}})
+                node['count'] += count
+        
+        total = max(tree['count'], 1)
+        depth = max((len(stack) for stack in self.samples), default=0)
+        header = 40
+        height = header + (depth + 1) * frame_height + 10
+        rects = []
+        
+        def layout(node, label, x, level):
+            node_width = node['count'] / total * (width - 20)
+            if node_width < 0.3:
+                return
+            y = height - 10 - (level + 1) * frame_height
+            hashed = zlib.crc32(label.encode('utf-8'))
+            color = (205 + hashed % 50, (hashed >> 8) % 200, (hashed >> 16) % 55)
+            text = label if node_width >= 7 * len(label) else label[:max(int(node_width / 7) - 2, 0)] + '..'
+            rects.append(
+                f'<g><title>{escape(label)} ({node["count"]} örnek, %{node["count"] / total * 100:.2f})</title>'
+                f'<rect x="{x:.1f}" y="{y}" width="{node_width:.1f}" height="{frame_height - 1}" '
+                f'fill="rgb{color}" rx="2"/>'
+                + (f'<text x="{x + 3:.1f}" y="{y + frame_height - 4}">{escape(text)}</text>' if node_width > 21 else '')
+                + '</g>'
+            )
+            
+            child_x = x
+            for child_label, child in sorted(node['children'].items()):
+                layout(child, child_label, child_x, level + 1)
+                child_x += child['count'] / total * (width - 20)
+        
+        layout(tree, 'tüm örnekler', 10, 0)
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                    f'font-family="monospace" font-size="11">\n')
+            f.write('<rect width="100%" height="100%" fill="#f8f8f8"/>\n')
+            f.write(f'<text x="{width / 2}" y="24" font-size="16" text-anchor="middle">{escape(title)} '
+                    f'({total} örnek)</text>\n')
+            f.write('\n'.join(rects))
+            f.write('\n</svg>\n')
+    
+    def save(self, output_dir, prefix='profile'):
+        """
+        Katlanmış yığınları, SVG flamegraph'ı ve en çok zaman alan fonksiyonlar özetini kaydet
+        
+        Parametreler:
+            output_dir: Çıktı dizini (örneğin results/profile)
+            prefix: Dosya adı öneki
+            
+        Dönüş:
+            {'collapsed', 'flamegraph', 'top'} dosya yolları sözlüğü
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        paths = {
+            'collapsed': os.path.join(output_dir, f"{prefix}.collapsed"),
+            'flamegraph': os.path.join(output_dir, f"{prefix}.svg"),
+            'top': os.path.join(output_dir, f"{prefix}_top.txt")
+        }
+        
+        with open(paths['collapsed'], 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed()) + '\n')
+        
+        self.write_flamegraph(paths['flamegraph'])
+        
+        samples = max(self.stats['samples'], 1)
+        with open(paths['top'], 'w', encoding='utf-8') as f:
+            f.write(f"{self.stats['samples']} örnek, {self.stats['idle']} boşta örnek, "
+                    f"{self.stats['wall_seconds']:.1f} saniye, örnekleme aralığı {self.interval * 1000:.1f} ms\n\n")
+            f.write(f"{'kendi %':>8} {'toplam %':>9}  fonksiyon\n")
+            for label, own, total in self.top_functions(limit=50):
+                f.write(f"{own / samples * 100:8.2f} {total / samples * 100:9.2f}  {label}\n")
+        
+        return paths
+    
+    def report(self, limit=15):
+        """
+        En çok zaman alan fonksiyonları ve örnekleme ek yükünü yazdır
+        """
+        samples = max(self.stats['samples'], 1)
+        overhead = self.stats['sampler_seconds'] / max(self.stats['wall_seconds'], 1e-9)
+        print(f"Profil: {self.stats['samples']} örnek ({self.stats['idle']} boşta), "
+              f"örnekleme ek yükü %{overhead * 100:.1f}")
+        for label, own, total in self.top_functions(limit):
+            print(f"  {own / samples * 100:6.2f}% kendi {total / samples * 100:6.2f}% toplam  {label}")
+
+def finish_profile(profiler, output_dir):
+    """
+    Profil çıkarıcıyı durdur, çıktıları kaydet ve özeti yazdır (komut satırı araçları için)
+    
+    Parametreler:
+        profiler: SamplingProfiler nesnesi veya None (profil istenmediyse hiçbir şey yapılmaz)
+        output_dir: Çıktı dizini
+    """
+    if profiler is None:
+        return
+    
+    profiler.stop()
+    paths = profiler.save(output_dir)
+    profiler.report()
+    print(f"Profil çıktıları: {paths['flamegraph']}, {paths['collapsed']}, {paths['top']}")
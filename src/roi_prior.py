@@ -0,0 +1,345 @@
+import os
+import json
+import threading
+
+import cv2
+import numpy as np
+
+from journal import atomic_write_json
+from prefilter import covered_fraction, detect_in_region
+from tracker import SOURCE_PATTERN, image_source
+
+class ROIPrior:
+    def __init__(self, grid_size=32, warmup_frames=20, min_detections=10, full_frame_interval=50, coverage=0.99,
+                 margin=1.0, decay=0.995, max_area_ratio=0.8, masks=None, source_pattern=SOURCE_PATTERN,
+                 min_coverage=0.9, record_regions=False):
+        """
+        Sabit kameralar için geçmiş tespitlerden öğrenilen ilgi bölgesi (ROI)
+        
+        Her kaynak (kamera) için tespit kutuları kaba bir ısı haritasında biriktirilir. Isı kütlesinin
+        coverage kadarını kapsayan hücrelerin sınırları plaka boyuna göre genişletilerek arama bölgesi
+        çıkarılır ve YOLO yalnızca bu bölgede çalıştırılır. Kapsamın kaymaması için her
+        full_frame_interval karede bir tam kare kontrolü yapılır; bu kontrolde bölgenin dışında plaka
+        bulunursa kaynak yeniden ısınma dönemine alınır.
+        
+        Parametreler:
+            grid_size: Isı haritasının kenar başına hücre sayısı (kare boyutundan bağımsızdır)
+            warmup_frames: Bölge kullanılmadan önce tam karede işlenecek en az kare sayısı
+            min_detections: Bölge kullanılmadan önce görülmesi gereken en az plaka sayısı
+            full_frame_interval: Bölge kullanılırken kaç karede bir tam kare kontrolü yapılacağı
+            coverage: Bölgenin kapsaması gereken ısı kütlesi oranı (tek tük yanlış tespitleri dışarıda bırakır)
+            margin: Bölge her yönde ortalama plaka yüksekliğinin bu katı kadar (yatayda iki katı) genişletilir
+            decay: Her karede ısı haritasının çarpıldığı sönümleme katsayısı (eski konumlar zamanla unutulur)
+            max_area_ratio: Bölge karenin bu oranından büyükse doğrudan tam kare işlenir
+            masks: Kaynak adından piksel koordinatlı çokgen listesine sözlük ('*' tüm kaynaklar için).
+                   Plakalar yalnızca çokgenlerin içinde aranır; dışarıdaki pikseller ağa siyah verilir
+            source_pattern: Görüntü adından kaynak adını çıkaran düzenli ifade (ilk grup). Eşleşmezse
+                            tüm görüntüler 'default' kaynağına yazılır
+            min_coverage: Gerçek plakanın bölgede sayılması için bölge içinde kalması gereken alan oranı
+            record_regions: True ise recall_report için her görüntünün bölgesi saklanır. Bellek işlenen
+                            görüntü sayısıyla büyüdüğünden yalnızca gerçek etiketli veri setlerinde açılmalı
+        """
+        self.grid_size = grid_size
+        self.warmup_frames = warmup_frames
+        self.min_detections = min_detections
+        self.full_frame_interval = full_frame_interval
+        self.coverage = coverage
+        self.margin = margin
+        self.decay = decay
+        self.max_area_ratio = max_area_ratio
+        self.masks = masks or {}
+        self.source_pattern = source_pattern
+        self.min_coverage = min_coverage
+        
+        self.sources = {}
+        self._mask_cache = {}
+        self._lock = threading.Lock()
+        
+        # Rapor için görüntü başına işlenen bölge (None: tam kare); yalnızca record_regions açıkken doldurulur
+        self.record_regions = record_regions
+        self.regions = {}
+        self.stats = {'frames': 0, 'full_frame': 0, 'area_ratio': 0.0, 'drift_checks': 0, 'drift_plates': 0}
+    
+    def source_of(self, image_name):
+        """
+        Görüntü adından kaynak (kamera) adını çıkar
+        """
+        return image_source(image_name, self.source_pattern)
+    
+    def _state(self, source):
+        if source not in self.sources:
+            self.sources[source] = {
+                'heat': np.zeros((self.grid_size, self.grid_size), dtype=np.float64),
+                'frames': 0,
+                'detections': 0,
+                'plate_height': None,   # kare yüksekliğine oranla ortalama plaka yüksekliği
+                'since_full': 0,
+                'warmup_left': self.warmup_frames
+            }
+        return self.sources[source]
+    
+    def _mask(self, source, image_shape):
+        """
+        Kaynağın statik çokgen maskesini kare boyutunda oluştur (önbellekli)
+        
+        Dönüş:
+            (ikili maske, [x1, y1, x2, y2] maske sınırı) veya maske yoksa (None, None)
+        """
+        polygons = self.masks.get(source, self.masks.get('*'))
+        if not polygons:
+            return None, None
+        
+        key = (source, image_shape[:2])
+        if key not in self._mask_cache:
+            mask = np.zeros(image_shape[:2], dtype=np.uint8)
+            cv2.fillPoly(mask, [np.array(polygon, dtype=np.int32) for polygon in polygons], 255)
+            ys, xs = np.nonzero(mask)
+            bounds = [int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1] if len(xs) else None
+            self._mask_cache[key] = (mask, bounds)
+        return self._mask_cache[key]
+    
+    def learned_region(self, source, image_shape):
+        """
+        Kaynağın ısı haritasından genişletilmiş arama bölgesini çıkar
+        
+        Dönüş:
+            [x1, y1, x2, y2] tamsayı bölge veya henüz yeterli veri yoksa None
+        """
+        state = self.sources.get(source)
+        if state is None or state['heat'].sum() <= 0:
+            return None
+        
+        height, width = image_shape[:2]
+        heat = state['heat']
+        
+        # Isı kütlesinin coverage kadarını taşıyan en sıcak hücreler
+        values = np.sort(heat[heat > 0])[::-1]
+        cutoff = values[min(np.searchsorted(np.cumsum(values), self.coverage * values.sum()), values.size - 1)]
+        rows, cols = np.nonzero(heat >= cutoff)
+        
+        cell_width, cell_height = width / self.grid_size, height / self.grid_size
+        pad = state['plate_height'] * height * self.margin
+        
+        x1 = cols.min() * cell_width - 2 * pad
+        y1 = rows.min() * cell_height - pad
+        x2 = (cols.max() + 1) * cell_width + 2 * pad
+        y2 = (rows.max() + 1) * cell_height + pad
+        
+        return [int(max(x1, 0)), int(max(y1, 0)), int(min(x2, width)), int(min(y2, height))]
+    
+    def update(self, source, detected_plates, image_shape):
+        """
+        Tam kare koordinatlı tespitleri kaynağın ısı haritasına ekle
+        
+        Her plaka kapladığı hücrelere toplam 1 birim ısı dağıtır.
+        """
+        state = self._state(source)
+        height, width = image_shape[:2]
+        
+        state['heat'] *= self.decay
+        for plate in detected_plates:
+            x1, y1, x2, y2 = plate[:4]
+            col1 = int(np.clip(x1 / width * self.grid_size, 0, self.grid_size - 1))
+            row1 = int(np.clip(y1 / height * self.grid_size, 0, self.grid_size - 1))
+            col2 = int(np.clip(x2 / width * self.grid_size, 0, self.grid_size - 1))
+            row2 = int(np.clip(y2 / height * self.grid_size, 0, self.grid_size - 1))
+            state['heat'][row1:row2 + 1, col1:col2 + 1] += 1.0 / ((row2 - row1 + 1) * (col2 - col1 + 1))
+            
+            # Ortalama plaka yüksekliği (bölge payı için)
+            relative_height = (y2 - y1) / height
+            previous = state['plate_height']
+            state['plate_height'] = relative_height if previous is None else 0.9 * previous + 0.1 * relative_height
+            state['detections'] += 1
+    
+    def plan(self, image_name, image_shape):
+        """
+        Bu kare için arama bölgesini belirle
+        
+        Dönüş:
+            (kaynak, bölge veya tam kare için None, tam_kare_kontrolü_mü) demeti
+        """
+        source = self.source_of(image_name)
+        with self._lock:
+            state = self._state(source)
+            state['frames'] += 1
+            
+            warming_up = state['warmup_left'] > 0 or state['detections'] < self.min_detections
+            if warming_up or state['since_full'] + 1 >= self.full_frame_interval:
+                state['warmup_left'] = max(state['warmup_left'] - 1, 0)
+                state['since_full'] = 0
+                return source, None, not warming_up
+            
+            state['since_full'] += 1
+            region = self.learned_region(source, image_shape)
+        
+        if region is not None:
+            area = (region[2] - region[0]) * (region[3] - region[1])
+            if area > self.max_area_ratio * image_shape[0] * image_shape[1]:
+                region = None
+        return source, region, False
+    
+    def detect(self, image, detector, image_name=None, return_corners=False):
+        """
+        Öğrenilen bölgede plakaları tespit et (PlateDetector.detect ile aynı dönüş biçimi)
+        
+        Parametreler:
+            image: Giriş görüntüsü
+            detector: PlateDetector nesnesi
+            image_name: Kaynağın ve rapor kaydının belirlendiği görüntü adı veya yolu
+            return_corners: True ise köşeler de döndürülür
+            
+        Dönüş:
+            detected_plates, annotated_image (ve return_corners=True ise corners)
+        """
+        source, region, drift_check = self.plan(image_name, image.shape)
+        mask, mask_bounds = self._mask(source, image.shape)
+        
+        search_region = region
+        if mask_bounds is not None:
+            # Statik maske her zaman uygulanır; öğrenilen bölge maske sınırıyla kesiştirilir
+            if region is None:
+                search_region = mask_bounds
+            else:
+                search_region = [max(region[0], mask_bounds[0]), max(region[1], mask_bounds[1]),
+                                 min(region[2], mask_bounds[2]), min(region[3], mask_bounds[3])]
+                if search_region[2] <= search_region[0] or search_region[3] <= search_region[1]:
+                    search_region = mask_bounds
+        
+        if search_region is None:
+            result = detector.detect(image, return_corners=True)
+        else:
+            result = detect_in_region(image, detector, search_region, True, mask)
+        detected_plates = result[0]
+        
+        height, width = image.shape[:2]
+        with self._lock:
+            if drift_check:
+                # Tam kare kontrolünde öğrenilen bölgenin dışında kalan plakalar kaymaya işaret eder
+                expected = self.learned_region(source, image.shape)
+                outside = [p for p in detected_plates
+                           if expected is None or covered_fraction(p[:4], expected) < self.min_coverage]
+                self.stats['drift_checks'] += 1
+                if outside:
+                    self.stats['drift_plates'] += len(outside)
+                    self.sources[source]['warmup_left'] = self.warmup_frames
+            
+            self.update(source, detected_plates, image.shape)
+            
+            self.stats['frames'] += 1
+            if region is None:
+                self.stats['full_frame'] += 1
+            if search_region is None:
+                self.stats['area_ratio'] += 1.0
+            else:
+                self.stats['area_ratio'] += ((search_region[2] - search_region[0]) *
+                                             (search_region[3] - search_region[1])) / (width * height)
+            if self.record_regions:
+                self.regions[os.path.basename(image_name) if image_name else None] = search_region
+        
+        if return_corners:
+            return result
+        return result[0], result[1]
+    
+    def recall_report(self, gt_data):
+        """
+        Bölge dışında kaldığı için YOLO'nun göremediği gerçek plakaları raporla
+        
+        Parametreler:
+            gt_data: Görüntü adından gerçek etiketlere sözlük (veya UFPRIndex)
+            
+        Dönüş:
+            {'gt_plates', 'lost_plates', 'roi_recall', 'full_frame_rate', 'mean_area_ratio',
+             'drift_checks', 'drift_plates'} sözlüğü
+        """
+        gt_plates = 0
+        lost_plates = 0
+        
+        for image_name, region in self.regions.items():
+            if image_name not in gt_data:
+                continue
+            
+            # Tam karede işlenen karelerde plaka kaybedilmez
+            for plate in gt_data[image_name]['plates']:
+                gt_plates += 1
+                if region is not None and covered_fraction(plate['position'], region) < self.min_coverage:
+                    lost_plates += 1
+        
+        frames = max(self.stats['frames'], 1)
+        
+        return {
+            'gt_plates': gt_plates,
+            'lost_plates': lost_plates,
+            'roi_recall': (gt_plates - lost_plates) / gt_plates if gt_plates else None,
+            'full_frame_rate': self.stats['full_frame'] / frames,
+            'mean_area_ratio': self.stats['area_ratio'] / frames,
+            'drift_checks': self.stats['drift_checks'],
+            'drift_plates': self.stats['drift_plates']
+        }
+    
+    def report(self, gt_data=None):
+        """
+        Bölge kullanım özetini yazdır
+        """
+        report = self.recall_report(gt_data or {})
+        print(f"İlgi bölgesi: {len(self.sources)} kaynak, karelerin %{report['full_frame_rate'] * 100:.1f}'i tam karede "
+              f"işlendi; YOLO'ya verilen ortalama alan karenin %{report['mean_area_ratio'] * 100:.1f}'i")
+        if report['drift_checks']:
+            print(f"  {report['drift_checks']} tam kare kontrolünde bölge dışında {report['drift_plates']} plaka bulundu")
+        if report['roi_recall'] is not None:
+            print(f"  Gerçek plakaların {report['lost_plates']}/{report['gt_plates']} tanesi bölge dışında kaldı "
+                  f"(bölge geri çağırması: {report['roi_recall']:.3f})")
+    
+    def save(self, path):
+        """
+        Kaynakların ısı haritalarını JSON olarak kaydet (sonraki çalıştırmada ısınma gerekmez)
+        """
+        with self._lock:
+            atomic_write_json(path, {
+                'grid_size': self.grid_size,
+                'sources': {
+                    source: {
+                        'heat': state['heat'].tolist(),
+                        'detections': state['detections'],
+                        'plate_height': state['plate_height']
+                    }
+                    for source, state in self.sources.items()
+                }
+            })
+    
+    def load(self, path):
+        """
+        Kaydedilmiş ısı haritalarını yükle
+        
+        Dönüş:
+            Yüklenen kaynak sayısı (dosya yoksa veya ızgara boyutu farklıysa 0)
+        """
+        if not os.path.exists(path):
+            return 0
+        
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        if data.get('grid_size') != self.grid_size:
+            print(f"Uyarı: {path} farklı ızgara boyutuyla kaydedilmiş; ilgi bölgeleri yeniden öğrenilecek")
+            return 0
+        
+        with self._lock:
+            for source, saved in data['sources'].items():
+                state = self._state(source)
+                state['heat'] = np.array(saved['heat'], dtype=np.float64)
+                state['detections'] = saved['detections']
+                state['plate_height'] = saved['plate_height']
+                state['warmup_left'] = 0
+        return len(data['sources'])
+
+def load_masks(path):
+    """
+    Statik çokgen maskelerini JSON dosyasından yükle
+    
+    Dosya biçimi: {"kamera1": [[[x, y], [x, y], ...], ...], "*": [...]}
+    
+    Dönüş:
+        Kaynak adından çokgen listesine sözlük
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
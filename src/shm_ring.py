@@ -0,0 +1,147 @@
+import queue
+from multiprocessing import shared_memory
+
+import numpy as np
+
+class SlotHandle:
+    def __init__(self, slot, arrays):
+        """
+        Paylaşılan bellekteki bir yuvanın ve içindeki dizilerin tanımı (süreçler arasında bu gönderilir)
+        
+        Parametreler:
+            slot: Yuva indeksi
+            arrays: Yuvadaki diziler için (ofset, şekil, veri tipi) demetleri listesi
+        """
+        self.slot = slot
+        self.arrays = arrays
+    
+    def __len__(self):
+        return len(self.arrays)
+
+class SharedFrameRing:
+    def __init__(self, slot_count, slot_bytes, context=None):
+        """
+        Kareler ve kırpıntılar için sabit boyutlu yuvalardan oluşan paylaşılan bellek halkasını oluştur
+        
+        Halkanın sahibi bellek bloğunu oluşturur; işçi süreçlere halka nesnesi gönderildiğinde
+        yalnızca bloğun adı ve boş yuva kuyruğu taşınır, işçiler aynı bloğa bağlanır. Her yuvanın
+        bir anda tek sahibi vardır: acquire ile alınır, tanıtıcısı bir sonraki aşamaya gönderilerek
+        sahiplik devredilir ve son kullanan release ile yuvayı geri verir.
+        
+        Parametreler:
+            slot_count: Yuva sayısı (aynı anda işlenebilecek en fazla öğe; geri basıncı belirler)
+            slot_bytes: Yuva başına bayt
+            context: multiprocessing bağlamı (boş yuva kuyruğu için). None ise varsayılan bağlam
+        """
+        if context is None:
+            import multiprocessing as context
+        
+        self.slot_count = slot_count
+        self.slot_bytes = slot_bytes
+        self._shm = shared_memory.SharedMemory(create=True, size=slot_count * slot_bytes)
+        self._owner = True
+        
+        self._free_slots = context.Queue()
+        for slot in range(slot_count):
+            self._free_slots.put(slot)
+    
+    def __getstate__(self):
+        # Bellek bloğunun kendisi değil, yalnızca adı gönderilir
+        return {
+            'slot_count': self.slot_count,
+            'slot_bytes': self.slot_bytes,
+            'name': self._shm.name,
+            'free_slots': self._free_slots
+        }
+    
+    def __setstate__(self, state):
+        self.slot_count = state['slot_count']
+        self.slot_bytes = state['slot_bytes']
+        self._free_slots = state['free_slots']
+        self._shm = shared_memory.SharedMemory(name=state['name'])
+        self._owner = False
+    
+    def acquire(self, timeout=None):
+        """
+        Boş bir yuva al; tüm yuvalar kullanımdaysa biri serbest kalana kadar bekle
+        
+        Parametreler:
+            timeout: En fazla bekleme süresi (saniye). None ise süresiz
+            
+        Dönüş:
+            Yuva indeksi veya süre dolduysa None
+        """
+        try:
+            return self._free_slots.get(timeout=timeout)
+        except queue.Empty:
+            return None
+    
+    def release(self, handle):
+        """
+        Yuvayı yeniden kullanılmak üzere halkaya geri ver
+        
+        Parametreler:
+            handle: SlotHandle nesnesi veya yuva indeksi
+        """
+        self._free_slots.put(handle.slot if isinstance(handle, SlotHandle) else handle)
+    
+    def write(self, slot, arrays):
+        """
+        Dizileri yuvaya art arda kopyala
+        
+        Parametreler:
+            slot: acquire ile alınmış yuva indeksi
+            arrays: Yazılacak numpy dizileri listesi
+            
+        Dönüş:
+            SlotHandle nesnesi
+            
+        Hata:
+            ValueError: Diziler yuvaya sığmıyorsa
+        """
+        base = slot * self.slot_bytes
+        offset = 0
+        layout = []
+        
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            if offset + array.nbytes > self.slot_bytes:
+                raise ValueError(f"Veri yuvaya sığmıyor ({offset + array.nbytes} > {self.slot_bytes} bayt)")
+            
+            target = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=base + offset)
+            target[...] = array
+            layout.append((offset, array.shape, array.dtype.str))
+            
+            # Sonraki diziyi 64 bayt sınırına hizala
+            offset += (array.nbytes + 63) // 64 * 64
+        
+        return SlotHandle(slot, layout)
+    
+    def read(self, handle, copy=False):
+        """
+        Yuvadaki dizileri kopyalamadan görünüm olarak döndür
+        
+        Görünümler yalnızca yuva release edilene kadar geçerlidir; daha uzun yaşaması
+        gereken veriler için copy=True kullanılmalıdır.
+        
+        Parametreler:
+            handle: write tarafından döndürülen SlotHandle
+            copy: True ise diziler kopyalanır
+            
+        Dönüş:
+            numpy dizileri listesi
+        """
+        base = handle.slot * self.slot_bytes
+        arrays = []
+        for offset, shape, dtype in handle.arrays:
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=self._shm.buf, offset=base + offset)
+            arrays.append(array.copy() if copy else array)
+        return arrays
+    
+    def close(self):
+        """
+        Bu süreçteki bağlantıyı kapat; sahibi ise bellek bloğunu da sil
+        """
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
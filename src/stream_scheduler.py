@@ -0,0 +1,506 @@
+import os
+import time
+import argparse
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from plate_detection import PlateDetector
+from ocr import PlateOCR, limit_tesseract_threads
+from char_recognizer import CharRecognizer
+from plate_store import PlateStore
+from preprocessing import OCR_PREPROCESSING_VARIANTS
+from detect_and_recognize import recognize_plate_images, list_dataset_images, RECTIFIED_PLATE_SIZE
+
+# Yüzdelik gecikmeler için akış başına tutulan en fazla örnek
+LATENCY_WINDOW = 1000
+
+class StreamScheduler:
+    def __init__(self, max_batch=8, max_wait_ms=20.0, queue_size=4, policy='round_robin'):
+        """
+        Birden çok adlandırılmış akıştan gelen kareleri adil tespit toplu işlerine dönüştüren zamanlayıcı
+        
+        Her akışın kendi sınırlı kuyruğu vardır; kuyruk doluyken gelen kare en eski kareyi düşürür, böylece
+        yoğun bir kamera diğerlerinin gecikmesini büyütemez ve her kameranın gecikmesi kuyruk boyuyla sınırlı
+        kalır. Toplu iş, max_batch kare birikince veya bekleyen en eski kare max_wait_ms kadar beklediğinde
+        oluşturulur. Kareler akışlar arasında sırayla (round_robin) veya ağırlıklarla orantılı olarak
+        (weighted, eksik sayaçlı sıralı dağıtım) seçilir; her toplu işte başlangıç akışı döndürülür.
+        
+        Parametreler:
+            max_batch: Toplu iş başına en fazla kare
+            max_wait_ms: Toplu iş dolmadan önce bekleyen en eski karenin en fazla bekleme süresi (ms)
+            queue_size: Akış başına varsayılan kuyruk uzunluğu
+            policy: 'round_robin' veya 'weighted'
+        """
+        if policy not in ('round_robin', 'weighted'):
+            raise ValueError(f"Bilinmeyen zamanlama politikası: {policy}")
+        
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.queue_size = queue_size
+        self.policy = policy
+        
+        self.streams = {}
+        self.batch_stats = {'batches': 0, 'frames': 0}
+        
+        self._order = []
+        self._cursor = 0
+        self._queued = 0
+        self._closed = False
+        self._cond = threading.Condition()
+    
+    def add_stream(self, name, weight=1.0, queue_size=None):
+        """
+        Akışı kaydet (submit ilk karede varsayılan ayarlarla kendisi de kaydeder)
+        
+        Parametreler:
+            name: Akış (kamera) adı
+            weight: weighted politikasında akışın toplu işlerdeki payı
+            queue_size: Akışın kuyruk uzunluğu (None ise varsayılan)
+        """
+        if weight <= 0:
+            raise ValueError(f"Akış ağırlığı pozitif olmalı: {name}")
+        
+        with self._cond:
+            if name in self.streams:
+                self.streams[name].update({'weight': weight, 'queue_size': queue_size or self.queue_size})
+                return
+            
+            self.streams[name] = {
+                'queue': deque(),
+                'weight': weight,
+                'queue_size': queue_size or self.queue_size,
+                'credit': 0.0,
+                'sequence': 0,
+                'submitted': 0,
+                'dropped': 0,
+                'dispatched': 0,
+                'completed': 0,
+                'wait': deque(maxlen=LATENCY_WINDOW),
+                'latency': deque(maxlen=LATENCY_WINDOW)
+            }
+            self._order.append(name)
+    
+    def submit(self, name, image, meta=None):
+        """
+        Akışa kare ekle; kuyruk doluysa akışın en eski karesi düşürülür
+        
+        Parametreler:
+            name: Akış adı
+            image: Kare (BGR)
+            meta: Sonuçla birlikte geri verilecek isteğe bağlı bilgi
+            
+        Dönüş:
+            Düşürülen kare sayısı (0 veya 1)
+        """
+        if name not in self.streams:
+            self.add_stream(name)
+        
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Zamanlayıcı kapatıldı")
+            
+            stream = self.streams[name]
+            dropped = 0
+            if len(stream['queue']) >= stream['queue_size']:
+                stream['queue'].popleft()
+                stream['dropped'] += 1
+                self._queued -= 1
+                dropped = 1
+            
+            stream['queue'].append({
+                'stream': name,
+                'sequence': stream['sequence'],
+                'image': image,
+                'meta': meta,
+                'submitted': time.perf_counter(),
+                'timestamp': time.time()
+            })
+            stream['sequence'] += 1
+            stream['submitted'] += 1
+            self._queued += 1
+            
+            if self._queued >= self.max_batch or self._queued == 1:
+                self._cond.notify_all()
+            return dropped
+    
+    def _oldest_submit_time(self):
+        return min(stream['queue'][0]['submitted'] for stream in self.streams.values() if stream['queue'])
+    
+    def _select(self):
+        """
+        Kuyruklardan bir toplu iş seç (kilit tutulurken çağrılır)
+        """
+        batch = []
+        names = self._order[self._cursor:] + self._order[:self._cursor]
+        self._cursor = (self._cursor + 1) % len(self._order)
+        
+        while len(batch) < self.max_batch:
+            progressed = False
+            for name in names:
+                stream = self.streams[name]
+                if not stream['queue']:
+                    # Boş kuyruklar birikmiş paylarını kaybeder; sonradan gelen akış patlama yapamaz
+                    stream['credit'] = 0.0
+                    continue
+                
+                progressed = True
+                stream['credit'] += stream['weight'] if self.policy == 'weighted' else 1.0
+                while stream['credit'] >= 1.0 and stream['queue'] and len(batch) < self.max_batch:
+                    batch.append(stream['queue'].popleft())
+                    stream['credit'] -= 1.0
+                
+                if len(batch) >= self.max_batch:
+                    break
+            
+            if not progressed:
+                break
+        
+        now = time.perf_counter()
+        for frame in batch:
+            stream = self.streams[frame['stream']]
+            stream['dispatched'] += 1
+            stream['wait'].append(now - frame['submitted'])
+        
+        self._queued -= len(batch)
+        self.batch_stats['batches'] += 1
+        self.batch_stats['frames'] += len(batch)
+        return batch
+    
+    def next_batch(self, timeout=None):
+        """
+        Bir sonraki toplu işi bekle ve döndür
+        
+        Parametreler:
+            timeout: En fazla bekleme süresi (saniye). None ise kare gelene kadar beklenir
+            
+        Dönüş:
+            Kare sözlükleri listesi ({'stream', 'sequence', 'image', 'meta', 'submitted', 'timestamp'});
+            süre dolduysa boş liste, zamanlayıcı kapatılıp kuyruklar boşaldıysa None
+        """
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        
+        with self._cond:
+            while True:
+                if self._queued >= self.max_batch or (self._queued > 0 and self._closed):
+                    break
+                if self._closed:
+                    return None
+                
+                now = time.perf_counter()
+                wait_for = None
+                if self._queued > 0:
+                    wait_for = self._oldest_submit_time() + self.max_wait - now
+                    if wait_for <= 0:
+                        break
+                if deadline is not None:
+                    if deadline <= now:
+                        return []
+                    wait_for = deadline - now if wait_for is None else min(wait_for, deadline - now)
+                
+                self._cond.wait(wait_for)
+            
+            return self._select()
+    
+    def complete(self, batch):
+        """
+        Toplu işteki karelerin işlenmesinin bittiğini bildir (uçtan uca gecikme ölçümü için)
+        """
+        now = time.perf_counter()
+        with self._cond:
+            for frame in batch:
+                stream = self.streams[frame['stream']]
+                stream['completed'] += 1
+                stream['latency'].append(now - frame['submitted'])
+    
+    def close(self):
+        """
+        Yeni kare kabulünü durdur; kuyruklarda kalan kareler next_batch ile boşaltılabilir
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+    
+    def metrics(self):
+        """
+        Akış başına gecikme ve kuyruk metriklerini döndür
+        
+        Dönüş:
+            Akış adından {'submitted', 'dropped', 'dispatched', 'completed', 'drop_rate', 'queue_depth',
+            'lag_ms', 'wait_ms', 'wait_p95_ms', 'latency_ms', 'latency_p95_ms', 'latency_max_ms'} sözlüğüne
+            eşleme. lag_ms kuyrukta bekleyen en eski karenin şu anki yaşıdır (kuyruk boşsa 0)
+        """
+        now = time.perf_counter()
+        metrics = {}
+        with self._cond:
+            for name in self._order:
+                stream = self.streams[name]
+                wait = np.array(stream['wait']) * 1000
+                latency = np.array(stream['latency']) * 1000
+                metrics[name] = {
+                    'submitted': stream['submitted'],
+                    'dropped': stream['dropped'],
+                    'dispatched': stream['dispatched'],
+                    'completed': stream['completed'],
+                    'drop_rate': stream['dropped'] / max(stream['submitted'], 1),
+                    'queue_depth': len(stream['queue']),
+                    'lag_ms': (now - stream['queue'][0]['submitted']) * 1000 if stream['queue'] else 0.0,
+                    'wait_ms': float(wait.mean()) if len(wait) else 0.0,
+                    'wait_p95_ms': float(np.percentile(wait, 95)) if len(wait) else 0.0,
+                    'latency_ms': float(latency.mean()) if len(latency) else 0.0,
+                    'latency_p95_ms': float(np.percentile(latency, 95)) if len(latency) else 0.0,
+                    'latency_max_ms': float(latency.max()) if len(latency) else 0.0
+                }
+        return metrics
+    
+    def report(self):
+        """
+        Toplu iş verimini ve akış başına gecikme metriklerini yazdır
+        """
+        batches = max(self.batch_stats['batches'], 1)
+        mean_batch = self.batch_stats['frames'] / batches
+        print(f"Zamanlayıcı ({self.policy}): {self.batch_stats['batches']} toplu iş, ortalama {mean_batch:.1f} kare "
+              f"(doluluk %{mean_batch / self.max_batch * 100:.0f})")
+        print(f"  {'akış':<16} {'gelen':>7} {'düşen':>7} {'işlenen':>8} {'kuyruk':>7} {'gecikme':>9} "
+              f"{'bekleme p95':>12} {'uçtan uca p95':>14} {'en fazla':>9}")
+        for name, stats in self.metrics().items():
+            print(f"  {name:<16} {stats['submitted']:>7} {stats['dropped']:>7} {stats['completed']:>8} "
+                  f"{stats['queue_depth']:>7} {stats['lag_ms']:>7.0f}ms {stats['wait_p95_ms']:>10.0f}ms "
+                  f"{stats['latency_p95_ms']:>12.0f}ms {stats['latency_max_ms']:>7.0f}ms")
+
+def serve_streams(scheduler, detector, ocr, on_result=None, ocr_variant='default', rectify=False,
+                  quality_gate=False, ocr_workers=1):
+    """
+    Zamanlayıcıdan gelen toplu işlerde plakaları tespit et ve tanı (zamanlayıcı kapatılıp boşalana kadar)
+    
+    Tespit her toplu işte tek ileri geçişte yapılır. OCR iş parçacıklarında çalışır ve bir sonraki toplu işin
+    tespitiyle örtüşür; sonuçlar toplu iş sırasıyla on_result'a verilir.
+    
+    Parametreler:
+        scheduler: StreamScheduler nesnesi
+        detector: PlateDetector nesnesi
+        ocr: PlateOCR veya CharRecognizer nesnesi
+        on_result: Her kare için on_result(kare, tanınan_plakalar) çağrılır (isteğe bağlı)
+        ocr_variant: OCR ön işleme varyantı
+        rectify: True ise plakalar köşelerinden düzeltilir
+        quality_gate: True ise okunamayacak kırpıntılar OCR'a verilmez
+        ocr_workers: Paralel OCR iş parçacığı sayısı (karakter modeli paylaşılamadığı için 1'e indirilir)
+    """
+    if hasattr(ocr, 'recognize_batch'):
+        ocr_workers = 1
+    
+    def recognize(frame, detection):
+        if rectify:
+            detected_plates, _, corners = detection
+            plate_images = detector.extract_plate_regions(frame['image'], detected_plates, corners,
+                                                          rectify_size=RECTIFIED_PLATE_SIZE)
+        else:
+            detected_plates, _ = detection
+            plate_images = detector.extract_plate_regions(frame['image'], detected_plates)
+        return recognize_plate_images(plate_images, detected_plates, ocr, ocr_variant, quality_gate)
+    
+    def finish(batch, futures):
+        results = [future.result() for future in futures]
+        scheduler.complete(batch)
+        if on_result:
+            for frame, recognized_plates in zip(batch, results):
+                on_result(frame, recognized_plates)
+    
+    pending = None
+    with ThreadPoolExecutor(ocr_workers, thread_name_prefix='stream-ocr') as executor:
+        while True:
+            batch = scheduler.next_batch(timeout=0.1)
+            if batch is None:
+                break
+            
+            submitted = None
+            if batch:
+                detections = detector.detect_batch([frame['image'] for frame in batch], return_corners=rectify)
+                submitted = (batch, [executor.submit(recognize, frame, detection)
+                                     for frame, detection in zip(batch, detections)])
+            
+            # Önceki toplu işin OCR'ı bu toplu işin tespitiyle paralel yürüdü
+            if pending:
+                finish(*pending)
+            pending = submitted
+        
+        if pending:
+            finish(*pending)
+
+def read_stream(scheduler, name, source, fps=None, stop=None):
+    """
+    Bir kaynağın karelerini zamanlayıcıya gönder
+    
+    Parametreler:
+        scheduler: StreamScheduler nesnesi
+        name: Akış adı
+        source: Görüntü dizini, video dosyası veya akış adresi (cv2.VideoCapture ile açılır)
+        fps: Verilirse kareler bu hızla gönderilir (dizin ve dosyalarla gerçek kamerayı taklit etmek için)
+        stop: Ayarlandığında okumayı durduran threading.Event
+    """
+    if os.path.isdir(source):
+        frames = (cv2.imread(str(path)) for path in list_dataset_images(source))
+    else:
+        capture = cv2.VideoCapture(source)
+        if not capture.isOpened():
+            print(f"Hata: {name} akışı açılamadı: {source}")
+            return
+        
+        def capture_frames():
+            while True:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield frame
+            capture.release()
+        frames = capture_frames()
+    
+    next_time = time.perf_counter()
+    for frame in frames:
+        if stop is not None and stop.is_set():
+            break
+        if frame is None:
+            continue
+        
+        if fps:
+            next_time += 1 / fps
+            time.sleep(max(next_time - time.perf_counter(), 0))
+        
+        try:
+            scheduler.submit(name, frame)
+        except RuntimeError:
+            # Zamanlayıcı kapatıldı (örneğin Ctrl+C)
+            break
+
+def parse_stream_spec(spec):
+    """
+    "ad[:ağırlık]=kaynak" biçimindeki akış tanımını ayrıştır
+    
+    Dönüş:
+        (ad, ağırlık, kaynak) demeti
+    """
+    if '=' not in spec:
+        raise argparse.ArgumentTypeError(f"Akış tanımı 'ad[:ağırlık]=kaynak' biçiminde olmalı: {spec}")
+    
+    name, source = spec.split('=', 1)
+    weight = 1.0
+    if ':' in name:
+        name, weight_text = name.rsplit(':', 1)
+        try:
+            weight = float(weight_text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Geçersiz akış ağırlığı: {spec}")
+        if weight <= 0:
+            raise argparse.ArgumentTypeError(f"Akış ağırlığı pozitif olmalı: {spec}")
+    
+    return name, weight, source
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Birden çok kameradan gelen kareleri adil toplu işlerle işle')
+    parser.add_argument('--stream', type=parse_stream_spec, action='append', required=True, metavar='NAME[:WEIGHT]=SOURCE',
+                        help='Akış adı, isteğe bağlı ağırlığı ve kaynağı (görüntü dizini, video dosyası veya akış adresi); '
+                             'birden çok kez verilebilir')
+    parser.add_argument('--model', type=str, help='YOLOv8 model dosyasının yolu')
+    parser.add_argument('--conf-threshold', type=float, default=0.25, help='Tespit için güven eşiği')
+    parser.add_argument('--img-size', type=int, help='Tespit çıkarımı giriş boyutu')
+    parser.add_argument('--max-batch', type=int, default=8, help='Toplu iş başına en fazla kare')
+    parser.add_argument('--max-wait-ms', type=float, default=20.0,
+                        help='Toplu iş dolmadan önce bekleyen en eski karenin en fazla bekleme süresi (ms)')
+    parser.add_argument('--queue-size', type=int, default=4,
+                        help='Akış başına kuyruk uzunluğu; kuyruk doluyken en eski kare düşürülür')
+    parser.add_argument('--policy', type=str, default='round_robin', choices=['round_robin', 'weighted'],
+                        help='Akışlar arasında kare seçme politikası')
+    parser.add_argument('--fps', type=float,
+                        help='Dizin ve video kaynaklarını bu hızla oynat (verilmezse okunabildiği kadar hızlı)')
+    parser.add_argument('--ocr-backend', type=str, default='tesseract', choices=['tesseract', 'yolo'],
+                        help='Karakter tanıma arka ucu')
+    parser.add_argument('--char-model', type=str, help='YOLO karakter modeli (--ocr-backend yolo için)')
+    parser.add_argument('--tesseract-path', type=str, help='Tesseract uygulamasının yolu')
+    parser.add_argument('--ocr-variant', type=str, default='default', choices=sorted(OCR_PREPROCESSING_VARIANTS),
+                        help='OCR ön işleme varyantı')
+    parser.add_argument('--ocr-workers', type=int, default=4, help='Paralel Tesseract iş parçacığı sayısı')
+    parser.add_argument('--rectify', action='store_true', help='Plakaları köşelerinden perspektif düzeltmesiyle düzelt')
+    parser.add_argument('--quality-gate', action='store_true', help='Okunamayacak kırpıntılarda OCR\'ı atla')
+    parser.add_argument('--store', type=str, help='Okumaların kaydedileceği SQLite veritabanı')
+    parser.add_argument('--report-interval', type=float, default=10.0, help='Metriklerin kaç saniyede bir yazdırılacağı')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    detector = PlateDetector(model_path=args.model)
+    detector.set_confidence_threshold(args.conf_threshold)
+    detector.set_image_size(args.img_size)
+    
+    if args.ocr_backend == 'yolo':
+        if not args.char_model:
+            print("Hata: --ocr-backend yolo için --char-model belirtilmeli")
+            exit(1)
+        ocr = CharRecognizer(args.char_model)
+        args.ocr_variant = 'none'
+    else:
+        ocr = PlateOCR(tesseract_path=args.tesseract_path)
+    
+        # Paralellik iş parçacığı sayısıyla sağlandığı için her Tesseract süreci tek iş parçacığıyla sınırlanır
+        if args.ocr_workers > 1:
+            limit_tesseract_threads()
+    
+    store = PlateStore(args.store) if args.store else None
+    
+    scheduler = StreamScheduler(max_batch=args.max_batch, max_wait_ms=args.max_wait_ms, queue_size=args.queue_size,
+                                policy=args.policy)
+    for name, weight, _ in args.stream:
+        scheduler.add_stream(name, weight)
+    
+    def on_result(frame, recognized_plates):
+        if store:
+            store.add_reads(frame['stream'], recognized_plates, timestamp=frame['timestamp'])
+        texts = ', '.join(plate['text'] for plate in recognized_plates if plate['text'])
+        if texts:
+            print(f"[{frame['stream']}] kare {frame['sequence']}: {texts}")
+    
+    stop = threading.Event()
+    readers = [threading.Thread(target=read_stream, args=(scheduler, name, source, args.fps, stop),
+                                name=f"stream-{name}", daemon=True)
+               for name, _, source in args.stream]
+    for reader in readers:
+        reader.start()
+    
+    # Tüm kaynaklar bittiğinde zamanlayıcı kapatılır; kalan kareler işlenir
+    def close_when_done():
+        for reader in readers:
+            reader.join()
+        scheduler.close()
+    
+    def report_periodically():
+        while not stop.wait(args.report_interval):
+            scheduler.report()
+    
+    threading.Thread(target=close_when_done, name='stream-closer', daemon=True).start()
+    threading.Thread(target=report_periodically, name='stream-report', daemon=True).start()
+    
+    print(f"{len(args.stream)} akış işleniyor (Ctrl+C ile durur)...")
+    start_time = time.time()
+    try:
+        serve_streams(scheduler, detector, ocr, on_result, ocr_variant=args.ocr_variant, rectify=args.rectify,
+                      quality_gate=args.quality_gate, ocr_workers=args.ocr_workers)
+    except KeyboardInterrupt:
+        print("\nAkışlar durduruluyor...")
+    finally:
+        stop.set()
+        scheduler.close()
+        if store:
+            store.close()
+    
+    print(f"İşlem {time.time() - start_time:.1f} saniyede tamamlandı")
+    scheduler.report()
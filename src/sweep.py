@@ -0,0 +1,247 @@
+import os
+import csv
+import time
+import argparse
+import itertools
+from datetime import datetime
+
+import cv2
+import numpy as np
+import matplotlib.pyplot as plt
+
+from plate_detection import PlateDetector
+from ocr import PlateOCR
+from evaluate import EvaluationMetrics
+from preprocessing import OCR_PREPROCESSING_VARIANTS
+from ufpr_annotations import UFPRIndex
+from detect_and_recognize import list_dataset_images, load_ground_truth, update_metrics, recognize_plate_images
+from profiler import SamplingProfiler, finish_profile
+
+def pareto_front(configs, accuracy_key, latency_key='mean_latency_ms'):
+    """
+    Gecikme (küçük daha iyi) ve doğruluk (büyük daha iyi) açısından baskın olmayan ayarları bul
+    
+    Parametreler:
+        configs: Ayar sonuç sözlükleri listesi
+        accuracy_key: Doğruluk metriğinin anahtarı
+        latency_key: Gecikme metriğinin anahtarı
+        
+    Dönüş:
+        Pareto-optimal ayarların gecikmeye göre sıralı listesi
+    """
+    front = []
+    best_accuracy = -1.0
+    
+    # Gecikmeye göre sırala; eşit gecikmede doğruluğu yüksek olan önce gelsin
+    for config in sorted(configs, key=lambda c: (c[latency_key], -c[accuracy_key])):
+        if config[accuracy_key] > best_accuracy:
+            front.append(config)
+            best_accuracy = config[accuracy_key]
+    
+    return front
+
+def run_sweep(dataset_path, ground_truth, weights_list, img_sizes, conf_thresholds, ocr_variants,
+              tesseract_path=None, max_images=None, warmup_images=2, detection_cache=None):
+    """
+    Ayar ızgarasını sabit bir görüntü kümesi üzerinde değerlendir
+    
+    Tespit her (ağırlık, görüntü boyutu, güven eşiği) için bir kez çalıştırılır ve aynı
+    kırpıntılar tüm OCR varyantlarında kullanılır; bir ayarın gecikmesi tespit süresi ile
+    o varyantın OCR süresinin toplamıdır.
+    
+    Parametreler:
+        dataset_path: Görüntü dizininin yolu
+        ground_truth: Gerçek etiket dosyasının yolu
+        weights_list: Denenecek model ağırlık dosyaları
+        img_sizes: Denenecek tespit giriş boyutları
+        conf_thresholds: Denenecek güven eşikleri
+        ocr_variants: Denenecek OCR ön işleme varyantları
+        tesseract_path: Tesseract uygulamasının yolu
+        max_images: Kullanılacak en fazla görüntü sayısı (None ise hepsi)
+        warmup_images: Ölçümden önce ısınma için işlenecek görüntü sayısı
+        detection_cache: Ham tespit önbelleği dizini. Verilirse güven eşikleri modeli yeniden
+                         çalıştırmadan önbellekten değerlendirilir (ölçülen tespit süresi önbellek süresidir)
+        
+    Dönüş:
+        Her ayar için metrikleri içeren sözlükler listesi
+    """
+    gt_data = load_ground_truth(ground_truth)
+    recursive = isinstance(gt_data, UFPRIndex)
+    image_files = [p for p in list_dataset_images(dataset_path, recursive) if p.name in gt_data]
+    if max_images:
+        image_files = image_files[:max_images]
+    
+    if not image_files:
+        print("Hata: Gerçek etiketi olan görüntü bulunamadı")
+        return []
+    
+    # Ölçümlere disk okuma süresi karışmasın diye görüntüleri bir kez belleğe al
+    images = [(p.name, cv2.imread(str(p))) for p in image_files]
+    images = [(name, image) for name, image in images if image is not None]
+    
+    ocr = PlateOCR(tesseract_path=tesseract_path)
+    configs = []
+    
+    print(f"{len(images)} görüntü üzerinde {len(weights_list) * len(img_sizes) * len(conf_thresholds) * len(ocr_variants)} ayar değerlendirilecek")
+    
+    for weights in weights_list:
+        detector = PlateDetector(model_path=weights)
+        if detection_cache:
+            detector.enable_cache(detection_cache)
+        
+        for img_size, conf_threshold in itertools.product(img_sizes, conf_thresholds):
+            detector.set_image_size(img_size)
+            detector.set_confidence_threshold(conf_threshold)
+            
+            # Isınma (ilk çağrılardaki model hazırlığı ölçümü bozmasın)
+            for _, image in images[:warmup_images]:
+                detector.detect(image)
+            
+            evaluators = {variant: EvaluationMetrics(save_dir=os.path.join('results', 'sweep')) for variant in ocr_variants}
+            detect_times = []
+            ocr_times = {variant: [] for variant in ocr_variants}
+            
+            for name, image in images:
+                start = time.perf_counter()
+                detected_plates, _ = detector.detect(image)
+                plate_images = detector.extract_plate_regions(image, detected_plates)
+                detect_time = time.perf_counter() - start
+                detect_times.append(detect_time)
+                
+                for variant in ocr_variants:
+                    start = time.perf_counter()
+                    recognized_plates = recognize_plate_images(plate_images, detected_plates, ocr, variant)
+                    ocr_time = time.perf_counter() - start
+                    ocr_times[variant].append(ocr_time)
+                    
+                    evaluators[variant].add_timing(detect_time + ocr_time)
+                    update_metrics(evaluators[variant], name, recognized_plates, gt_data)
+            
+            for variant in ocr_variants:
+                metrics = evaluators[variant]._calculate_overall_metrics()
+                config = {
+                    'weights': os.path.basename(weights),
+                    'img_size': img_size,
+                    'conf_threshold': conf_threshold,
+                    'ocr_variant': variant,
+                    'mean_detect_ms': float(np.mean(detect_times)) * 1000,
+                    'mean_ocr_ms': float(np.mean(ocr_times[variant])) * 1000
+                }
+                config.update(metrics)
+                configs.append(config)
+                
+                print(f"{config['weights']} img={img_size} conf={conf_threshold} ocr={variant}: "
+                      f"F1={config['f1']:.3f} tam eşleşme={config['exact_match_accuracy']:.3f} "
+                      f"gecikme={config['mean_latency_ms']:.1f} ms ({config['throughput_fps']:.1f} görüntü/sn)")
+    
+    return configs
+
+def save_sweep_report(configs, accuracy_key='exact_match_accuracy', save_dir='results'):
+    """
+    Tarama sonuçlarını CSV'ye kaydet, Pareto kümesini tablo ve grafik olarak üret
+    
+    Parametreler:
+        configs: run_sweep tarafından döndürülen ayar sonuçları
+        accuracy_key: Pareto analizinde kullanılacak doğruluk metriği
+        save_dir: Çıktıların kaydedileceği dizin
+        
+    Dönüş:
+        Kaydedilen CSV ve grafik dosyalarının yolları
+    """
+    os.makedirs(save_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    front = pareto_front(configs, accuracy_key)
+    front_ids = {id(config) for config in front}
+    
+    # Tüm ayarları Pareto işaretiyle birlikte kaydet
+    csv_path = os.path.join(save_dir, f'sweep_{timestamp}.csv')
+    columns = list(configs[0].keys()) + ['pareto']
+    with open(csv_path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=columns)
+        writer.writeheader()
+        for config in configs:
+            writer.writerow(dict(config, pareto=id(config) in front_ids))
+    
+    # Pareto tablosu
+    print(f"\nPareto-optimal ayarlar ({accuracy_key} / ortalama gecikme):")
+    print(f"{'ağırlık':<20} {'img':>5} {'conf':>5} {'ocr':>8} {accuracy_key[:12]:>12} {'ms':>8} {'p95 ms':>8} {'görüntü/sn':>11}")
+    for config in front:
+        print(f"{config['weights']:<20} {str(config['img_size']):>5} {config['conf_threshold']:>5.2f} "
+              f"{config['ocr_variant']:>8} {config[accuracy_key]:>12.3f} {config['mean_latency_ms']:>8.1f} "
+              f"{config['p95_latency_ms']:>8.1f} {config['throughput_fps']:>11.1f}")
+    
+    # Gecikme-doğruluk grafiği
+    plt.figure(figsize=(10, 7))
+    plt.scatter([c['mean_latency_ms'] for c in configs], [c[accuracy_key] for c in configs],
+                color='#95a5a6', label='Tüm ayarlar')
+    plt.plot([c['mean_latency_ms'] for c in front], [c[accuracy_key] for c in front],
+             'o-', color='#e74c3c', label='Pareto sınırı')
+    for config in front:
+        plt.annotate(f"{config['weights']}\nimg={config['img_size']} conf={config['conf_threshold']} {config['ocr_variant']}",
+                     (config['mean_latency_ms'], config[accuracy_key]), fontsize=7,
+                     textcoords='offset points', xytext=(5, 5))
+    plt.xlabel('Ortalama gecikme (ms/görüntü)')
+    plt.ylabel(accuracy_key)
+    plt.title('Hız / Doğruluk Taraması')
+    plt.legend()
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+    
+    plot_path = os.path.join(save_dir, f'sweep_pareto_{timestamp}.png')
+    plt.savefig(plot_path)
+    plt.close()
+    
+    return csv_path, plot_path
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Hız/doğruluk ayar taraması')
+    parser.add_argument('--dataset', type=str, required=True, help='Sabit değerlendirme görüntülerinin dizini')
+    parser.add_argument('--ground-truth', type=str, required=True, help='Gerçek etiket JSON dosyasının veya UFPR-ALPR dizininin yolu')
+    parser.add_argument('--weights', type=str, nargs='+', default=['yolov8n.pt'], help='Denenecek model ağırlıkları')
+    parser.add_argument('--img-sizes', type=int, nargs='+', default=[320, 480, 640], help='Denenecek tespit giriş boyutları')
+    parser.add_argument('--conf-thresholds', type=float, nargs='+', default=[0.25], help='Denenecek güven eşikleri')
+    parser.add_argument('--ocr-variants', type=str, nargs='+', default=['default'],
+                        choices=sorted(OCR_PREPROCESSING_VARIANTS), help='Denenecek OCR ön işleme varyantları')
+    parser.add_argument('--objective', type=str, default='exact_match_accuracy',
+                        choices=['exact_match_accuracy', 'character_accuracy', 'f1', 'precision', 'recall'],
+                        help='Pareto analizinde kullanılacak doğruluk metriği')
+    parser.add_argument('--max-images', type=int, help='Kullanılacak en fazla görüntü sayısı')
+    parser.add_argument('--tesseract-path', type=str, help='Tesseract uygulamasının yolu')
+    parser.add_argument('--detection-cache', type=str, metavar='CACHE_DIR',
+                        help='Ham tespit önbelleği dizini (OCR ve eşik değerlendirmesi için; gecikme ölçümü anlamını yitirir)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Tarama boyunca yığın örnekleyerek profil çıkar (results/sweep/profile altına)')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    profiler = SamplingProfiler().start() if args.profile else None
+    
+    configs = run_sweep(
+        args.dataset,
+        args.ground_truth,
+        args.weights,
+        args.img_sizes,
+        args.conf_thresholds,
+        args.ocr_variants,
+        tesseract_path=args.tesseract_path,
+        max_images=args.max_images,
+        detection_cache=args.detection_cache
+    )
+    
+    finish_profile(profiler, os.path.join('results', 'sweep', 'profile'))
+    
+    if not configs:
+        exit(1)
+    
+    csv_path, plot_path = save_sweep_report(configs, accuracy_key=args.objective)
+    print(f"\nTarama sonuçları {csv_path} ve {plot_path} konumlarına kaydedildi")
@@ -0,0 +1,334 @@
+import os
+import time
+import string
+import argparse
+from multiprocessing import Pool
+
+import cv2
+import numpy as np
+
+from journal import atomic_write_json
+
+# Düz plaka görüntüsünün boyutu (genişlik, yükseklik); Brezilya plakaları 400x130 mm
+PLATE_SIZE = (400, 130)
+
+# analyze_results tarafından kabul edilen iki Brezilya biçimi
+PLATE_FORMATS = {
+    'old': 'LLLDDDD',       # ABC1234
+    'mercosur': 'LLLDLDD'   # ABC1D23
+}
+
+def random_plate_text(rng, plate_format):
+    """
+    Verilen biçimde rastgele plaka metni üret
+    
+    Parametreler:
+        rng: numpy Generator
+        plate_format: 'old' veya 'mercosur'
+        
+    Dönüş:
+        Plaka metni (örneğin "ABC1234" veya "ABC1D23")
+    """
+    pattern = PLATE_FORMATS[plate_format]
+    return ''.join(rng.choice(list(string.ascii_uppercase if c == 'L' else string.digits)) for c in pattern)
+
+def render_plate(text, plate_format):
+    """
+    Plakayı önden, düz olarak çiz
+    
+    Eski biçim gri zemin üzerine koyu karakterlerle, Mercosur biçimi beyaz zemin ve üstte mavi
+    şeritle çizilir.
+    
+    Parametreler:
+        text: Plaka metni
+        plate_format: 'old' veya 'mercosur'
+        
+    Dönüş:
+        PLATE_SIZE boyutunda BGR plaka görüntüsü
+    """
+    width, height = PLATE_SIZE
+    top = 0
+    
+    if plate_format == 'mercosur':
+        plate = np.full((height, width, 3), 245, dtype=np.uint8)
+        top = 30
+        cv2.rectangle(plate, (0, 0), (width, top), (150, 60, 0), -1)
+        cv2.putText(plate, 'BRASIL', (width // 2 - 40, 22), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+        display_text = text
+    else:
+        plate = np.full((height, width, 3), 190, dtype=np.uint8)
+        display_text = f"{text[:3]}-{text[3:]}"
+    
+    cv2.rectangle(plate, (2, 2), (width - 3, height - 3), (30, 30, 30), 3)
+    
+    # Metni plakanın kalan alanına sığacak şekilde ölçekle
+    font = cv2.FONT_HERSHEY_DUPLEX
+    thickness = 6
+    (text_width, text_height), _ = cv2.getTextSize(display_text, font, 1.0, thickness)
+    scale = min((width - 40) / text_width, (height - top - 30) / text_height)
+    (text_width, text_height), _ = cv2.getTextSize(display_text, font, scale, thickness)
+    
+    origin = ((width - text_width) // 2, top + (height - top + text_height) // 2)
+    cv2.putText(plate, display_text, origin, font, scale, (20, 20, 20), thickness, cv2.LINE_AA)
+    
+    return plate
+
+def random_background(rng, size, backgrounds=None):
+    """
+    Sahne arka planı oluştur: verilen görüntülerden biri veya rastgele renk geçişi ve şekiller
+    
+    Parametreler:
+        rng: numpy Generator
+        size: (genişlik, yükseklik)
+        backgrounds: Arka plan görüntü yolları listesi (isteğe bağlı)
+        
+    Dönüş:
+        BGR sahne görüntüsü
+    """
+    width, height = size
+    
+    if backgrounds:
+        image = cv2.imread(backgrounds[rng.integers(len(backgrounds))])
+        if image is not None:
+            return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+    
+    # Dikey renk geçişi (gökyüzünden yola)
+    top_color = rng.integers(60, 220, 3)
+    bottom_color = rng.integers(20, 120, 3)
+    ratio = np.linspace(0, 1, height, dtype=np.float32)[:, None, None]
+    image = (top_color * (1 - ratio) + bottom_color * ratio).astype(np.uint8)
+    image = np.repeat(image, width, axis=1)
+    
+    # Araç gövdesi ve şeritleri andıran rastgele dikdörtgenler
+    for _ in range(rng.integers(3, 9)):
+        x1, y1 = int(rng.integers(0, width)), int(rng.integers(0, height))
+        x2, y2 = x1 + int(rng.integers(width // 10, width // 2)), y1 + int(rng.integers(height // 10, height // 2))
+        cv2.rectangle(image, (x1, y1), (x2, y2), tuple(int(c) for c in rng.integers(0, 255, 3)), -1)
+    
+    return image
+
+def place_plate(scene, plate, rng, width_range=(0.08, 0.25), max_tilt=0.15, occupied=()):
+    """
+    Plakayı rastgele konum, boyut ve perspektifle sahneye yerleştir
+    
+    Parametreler:
+        scene: Sahne görüntüsü (yerinde değiştirilir)
+        plate: Düz plaka görüntüsü
+        rng: numpy Generator
+        width_range: Plaka genişliğinin sahne genişliğine oranı aralığı
+        max_tilt: Köşelerin plaka boyutuna oranla en fazla kayması (perspektif)
+        occupied: Daha önce yerleştirilmiş plaka kutuları (çakışma önlemek için)
+        
+    Dönüş:
+        {'position': [x1, y1, x2, y2], 'corners': 4 köşe} veya yer bulunamazsa None
+    """
+    scene_height, scene_width = scene.shape[:2]
+    plate_height, plate_width = plate.shape[:2]
+    
+    for _ in range(20):
+        target_width = scene_width * rng.uniform(*width_range)
+        target_height = target_width * plate_height / plate_width
+        
+        x = rng.uniform(0, scene_width - target_width)
+        y = rng.uniform(0, scene_height - target_height)
+        corners = np.array([[x, y], [x + target_width, y], [x + target_width, y + target_height],
+                            [x, y + target_height]], dtype=np.float32)
+        
+        # Her köşeyi bağımsız kaydırarak perspektif ve eğim ver
+        jitter = rng.uniform(-max_tilt, max_tilt, (4, 2)) * [target_width, target_height]
+        corners = corners + jitter.astype(np.float32)
+        corners[:, 0] = np.clip(corners[:, 0], 0, scene_width - 1)
+        corners[:, 1] = np.clip(corners[:, 1], 0, scene_height - 1)
+        
+        x1, y1 = corners.min(axis=0).astype(int)
+        x2, y2 = corners.max(axis=0).astype(int)
+        if any(x1 < ox2 and ox1 < x2 and y1 < oy2 and oy1 < y2 for ox1, oy1, ox2, oy2 in occupied):
+            continue
+        
+        # Yalnızca plakanın kapladığı kutu bükülür; tüm sahneyi bükmek gereksiz yere yavaştır
+        source = np.array([[0, 0], [plate_width, 0], [plate_width, plate_height], [0, plate_height]], dtype=np.float32)
+        matrix = cv2.getPerspectiveTransform(source, corners - np.float32([x1, y1]))
+        box_size = (int(x2 - x1 + 1), int(y2 - y1 + 1))
+        warped = cv2.warpPerspective(plate, matrix, box_size)
+        mask = cv2.warpPerspective(np.full((plate_height, plate_width), 255, np.uint8), matrix, box_size) > 0
+        region = scene[y1:y2 + 1, x1:x2 + 1]
+        region[mask] = warped[mask]
+        
+        return {'position': [int(x1), int(y1), int(x2), int(y2)], 'corners': corners.round().astype(int).tolist()}
+    
+    return None
+
+def degrade(image, rng, max_blur=2.0, noise_std=8.0):
+    """
+    Görüntüye rastgele bulanıklık (Gaussian veya hareket) ve gürültü ekle
+    
+    Parametreler:
+        image: BGR görüntü
+        rng: numpy Generator
+        max_blur: En büyük Gaussian sigma
+        noise_std: Gaussian gürültünün en büyük standart sapması
+        
+    Dönüş:
+        Bozulmuş görüntü
+    """
+    if rng.random() < 0.3:
+        # Yatay hareket bulanıklığı
+        length = int(rng.integers(3, 12))
+        kernel = np.zeros((length, length), np.float32)
+        kernel[length // 2, :] = 1.0 / length
+        image = cv2.filter2D(image, -1, kernel)
+    else:
+        sigma = rng.uniform(0, max_blur)
+        if sigma > 0.3:
+            image = cv2.GaussianBlur(image, (0, 0), sigma)
+    
+    # OpenCV gürültü üreteci numpy'dan çok daha hızlıdır; tohumu rng'den alınarak tekrarlanabilir kalır
+    cv2.setRNGSeed(int(rng.integers(2 ** 31)))
+    noise = np.empty(image.shape, np.int16)
+    cv2.randn(noise, 0, rng.uniform(0, noise_std))
+    return cv2.add(image, noise, dtype=cv2.CV_8U)
+
+def generate_image(index, seed=0, size=(1280, 720), plates_per_image=(1, 1), mercosur_ratio=0.5,
+                   backgrounds=None, width_range=(0.08, 0.25)):
+    """
+    Tek bir sentetik sahne ve gerçek etiketlerini üret
+    
+    Rastgele üreteç (seed, index) çiftinden türetilir; aynı indeks işçi sayısından bağımsız olarak
+    her zaman aynı görüntüyü verir.
+    
+    Parametreler:
+        index: Görüntü indeksi
+        seed: Temel tohum
+        size: Sahne boyutu (genişlik, yükseklik)
+        plates_per_image: Görüntü başına plaka sayısı aralığı (en az, en çok)
+        mercosur_ratio: Mercosur biçimindeki plakaların oranı
+        backgrounds: Arka plan görüntü yolları (isteğe bağlı)
+        width_range: Plaka genişliğinin sahne genişliğine oranı aralığı
+        
+    Dönüş:
+        (görüntü, {'plates': [{'text', 'position', 'corners', 'format'}]}) demeti
+    """
+    rng = np.random.default_rng([seed, index])
+    scene = random_background(rng, size, backgrounds)
+    
+    plates = []
+    for _ in range(rng.integers(plates_per_image[0], plates_per_image[1] + 1)):
+        plate_format = 'mercosur' if rng.random() < mercosur_ratio else 'old'
+        text = random_plate_text(rng, plate_format)
+        
+        placed = place_plate(scene, render_plate(text, plate_format), rng, width_range,
+                             occupied=[plate['position'] for plate in plates])
+        if placed is not None:
+            plates.append({'text': text, 'format': plate_format, **placed})
+    
+    # Etiketler sahnedeki soldan sağa sırayla tutulur
+    plates.sort(key=lambda plate: plate['position'][0])
+    return degrade(scene, rng), {'plates': plates}
+
+def _generate_and_save(job):
+    index, output_dir, image_format, quality, options = job
+    image, ground_truth = generate_image(index, **options)
+    
+    file_name = f"synthetic_{index:07d}.{image_format}"
+    params = [cv2.IMWRITE_JPEG_QUALITY, quality] if image_format == 'jpg' else []
+    cv2.imwrite(os.path.join(output_dir, 'images', file_name), image, params)
+    return file_name, ground_truth
+
+def generate_dataset(output_dir, count, seed=0, size=(1280, 720), plates_per_image=(1, 1), mercosur_ratio=0.5,
+                     backgrounds_dir=None, image_format='jpg', quality=90, workers=1):
+    """
+    Sentetik veri seti üret: output_dir/images altında görüntüler ve output_dir/ground_truth.json
+    
+    Gerçek etiket dosyası process_dataset'in beklediği biçimdedir
+    ({görüntü_adı: {'plates': [{'text', 'position', 'corners'}]}}).
+    
+    Parametreler:
+        output_dir: Çıktı dizini
+        count: Görüntü sayısı
+        seed: Tekrarlanabilirlik için tohum
+        size: Sahne boyutu (genişlik, yükseklik)
+        plates_per_image: Görüntü başına plaka sayısı aralığı (en az, en çok)
+        mercosur_ratio: Mercosur biçimindeki plakaların oranı
+        backgrounds_dir: Arka plan görüntülerinin bulunduğu dizin (isteğe bağlı)
+        image_format: 'jpg' veya 'png'
+        quality: JPEG kalitesi
+        workers: Paralel üretim süreç sayısı
+        
+    Dönüş:
+        Gerçek etiket dosyasının yolu
+    """
+    os.makedirs(os.path.join(output_dir, 'images'), exist_ok=True)
+    
+    backgrounds = None
+    if backgrounds_dir:
+        backgrounds = sorted(os.path.join(backgrounds_dir, f) for f in os.listdir(backgrounds_dir)
+                             if f.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp')))
+    
+    options = {
+        'seed': seed,
+        'size': size,
+        'plates_per_image': plates_per_image,
+        'mercosur_ratio': mercosur_ratio,
+        'backgrounds': backgrounds
+    }
+    jobs = ((index, output_dir, image_format, quality, options) for index in range(count))
+    
+    start_time = time.time()
+    ground_truth = {}
+    
+    if workers > 1:
+        with Pool(workers) as pool:
+            for file_name, labels in pool.imap(_generate_and_save, jobs, chunksize=16):
+                ground_truth[file_name] = labels
+    else:
+        for job in jobs:
+            file_name, labels = _generate_and_save(job)
+            ground_truth[file_name] = labels
+    
+    gt_path = os.path.join(output_dir, 'ground_truth.json')
+    atomic_write_json(gt_path, ground_truth)
+    
+    elapsed = time.time() - start_time
+    print(f"{count} sentetik görüntü {elapsed:.1f} saniyede üretildi ({count / max(elapsed, 1e-9):.1f} görüntü/saniye)")
+    print(f"Görüntüler: {os.path.join(output_dir, 'images')}, gerçek etiketler: {gt_path}")
+    return gt_path
+
+def parse_size(size_spec):
+    """
+    "GENİŞLİKxYÜKSEKLİK" biçimindeki boyutu ayrıştır
+    """
+    try:
+        width, height = (int(part) for part in size_spec.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Geçersiz boyut: {size_spec} (beklenen biçim: 1280x720)")
+    return width, height
+
+def parse_arguments():
+    """
+    Komut satırı argümanlarını ayrıştır
+    
+    Dönüş:
+        Ayrıştırılmış argümanlar
+    """
+    parser = argparse.ArgumentParser(description='Yük testleri için sentetik Brezilya plakası veri seti üret')
+    parser.add_argument('--output', type=str, required=True, help='Çıktı dizini')
+    parser.add_argument('--count', type=int, default=1000, help='Üretilecek görüntü sayısı')
+    parser.add_argument('--seed', type=int, default=0, help='Tekrarlanabilirlik için tohum')
+    parser.add_argument('--size', type=parse_size, default=(1280, 720), help='Sahne boyutu (örneğin 1920x1080)')
+    parser.add_argument('--plates-per-image', type=int, nargs=2, default=[1, 1], metavar=('MIN', 'MAX'),
+                        help='Görüntü başına plaka sayısı aralığı')
+    parser.add_argument('--mercosur-ratio', type=float, default=0.5, help='Mercosur (ABC1D23) biçimindeki plakaların oranı')
+    parser.add_argument('--backgrounds', type=str, help='Arka plan görüntülerinin bulunduğu dizin')
+    parser.add_argument('--format', type=str, default='jpg', choices=['jpg', 'png'], help='Görüntü biçimi')
+    parser.add_argument('--quality', type=int, default=90, help='JPEG kalitesi (1-100)')
+    parser.add_argument('--workers', type=int, default=1, help='Paralel üretim süreç sayısı')
+    
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    
+    generate_dataset(args.output, args.count, seed=args.seed, size=args.size,
+                     plates_per_image=tuple(args.plates_per_image), mercosur_ratio=args.mercosur_ratio,
+                     backgrounds_dir=args.backgrounds, image_format=args.format, quality=args.quality,
+                     workers=args.workers)
@@ -0,0 +1,131 @@
+import os
+
+import cv2
+import numpy as np
+
+# Yöntem başına varsayılan yakın kopya eşikleri
+DEFAULT_DEDUP_THRESHOLDS = {
+    'phash': 0.03,   # farklı bit oranı (256 bitte ~8 bit)
+    'motion': 0.1    # plaka genişliğine oranla kutu kayması
+}
+
+def perceptual_hash(image, hash_size=16):
+    """
+    Görüntünün fark özetini (dHash) hesapla
+    
+    Görüntü (hash_size + 1) x hash_size boyutuna küçültülür ve yan yana piksellerin parlaklık
+    farklarının işaretleri bitlere dönüştürülür; neredeyse aynı kareler neredeyse aynı özeti verir.
+    
+    Parametreler:
+        image: Gri tonlamalı veya BGR görüntü
+        hash_size: Özet kenar uzunluğu (hash_size * hash_size bit)
+        
+    Dönüş:
+        Bit dizisi (bool numpy dizisi)
+    """
+    if len(image.shape) == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    return (small[:, 1:] > small[:, :-1]).flatten()
+
+def hash_distance(hash_a, hash_b):
+    """
+    İki özet arasındaki farklı bit oranı (0: aynı, 1: tamamen farklı)
+    """
+    return np.count_nonzero(hash_a != hash_b) / hash_a.size
+
+def motion_distance(box_a, box_b):
+    """
+    İki kare arasındaki plaka hareketini plaka genişliğine oranla ölç
+    
+    Merkez kayması ve ölçek değişimi birlikte hesaba katılır; araç durduğunda 0'a yakındır.
+    
+    Parametreler:
+        box_a, box_b: [x1, y1, x2, y2] kutuları
+        
+    Dönüş:
+        Hareket ölçüsü
+    """
+    width_a = max(box_a[2] - box_a[0], 1)
+    width_b = max(box_b[2] - box_b[0], 1)
+    
+    shift_x = ((box_a[0] + box_a[2]) - (box_b[0] + box_b[2])) / 2
+    shift_y = ((box_a[1] + box_a[3]) - (box_b[1] + box_b[3])) / 2
+    shift = np.hypot(shift_x, shift_y) / max(width_a, width_b)
+    
+    return shift + abs(np.log(width_a / width_b))
+
+def subsample_track(track_path, frames, max_frames, method='phash', dedup_threshold=None):
+    """
+    Bir izlemedeki birbirine en az benzeyen kareleri seç
+    
+    Önce ardışık karelerden bir öncekine eşikten daha yakın olanlar yakın kopya olarak atılır.
+    Kalan kare sayısı max_frames'i aşarsa seçilmiş karelere en uzak kare tekrar tekrar eklenerek
+    (en uzak nokta örneklemesi) birbirinden farklı max_frames kare bırakılır.
+    
+    Parametreler:
+        track_path: İzleme klasörü (phash yönteminde görüntüler buradan okunur)
+        frames: Kare sırasına göre (dosya_adı, açıklama) listesi; açıklamada 'box' bulunur
+        max_frames: İzleme başına tutulacak en fazla kare
+        method: 'phash' (görüntü benzerliği) veya 'motion' (yalnızca açıklamalardaki kutu hareketi)
+        dedup_threshold: Yakın kopya eşiği (None ise DEFAULT_DEDUP_THRESHOLDS)
+        
+    Dönüş:
+        kept_frames: Tutulan kareler (orijinal sırasıyla)
+        stats: {'kept', 'dropped', 'deduplicated'} sayıları
+    """
+    if method not in DEFAULT_DEDUP_THRESHOLDS:
+        raise ValueError(f"Geçersiz alt örnekleme yöntemi: {method}")
+    
+    threshold = DEFAULT_DEDUP_THRESHOLDS[method] if dedup_threshold is None else dedup_threshold
+    
+    if method == 'phash':
+        # Özet için tam çözünürlüğe gerek yok; küçültülmüş gri okuma çözmeyi hızlandırır
+        signatures = []
+        for file, _ in frames:
+            image = cv2.imread(os.path.join(track_path, file), cv2.IMREAD_REDUCED_GRAYSCALE_4)
+            signatures.append(perceptual_hash(image) if image is not None else None)
+        distance = hash_distance
+    else:
+        signatures = [annotation['box'] for _, annotation in frames]
+        distance = motion_distance
+    
+    # Okunamayan kareler her zaman farklı sayılır ve dışa aktarmada atlanır
+    candidates = []
+    for i, signature in enumerate(signatures):
+        if signature is None or not candidates:
+            candidates.append(i)
+            continue
+        last = signatures[candidates[-1]]
+        if last is None or distance(signature, last) >= threshold:
+            candidates.append(i)
+    
+    deduplicated = len(frames) - len(candidates)
+    
+    if len(candidates) > max_frames:
+        # Matris küçük (izleme başına ~30 kare); tüm çiftler için uzaklık hesaplanır
+        count = len(candidates)
+        distances = np.ones((count, count))
+        for a in range(count):
+            for b in range(a + 1, count):
+                sig_a, sig_b = signatures[candidates[a]], signatures[candidates[b]]
+                if sig_a is not None and sig_b is not None:
+                    distances[a, b] = distances[b, a] = distance(sig_a, sig_b)
+        
+        selected = [0]
+        nearest = distances[0].copy()
+        while len(selected) < max_frames:
+            nearest[selected] = -1
+            choice = int(np.argmax(nearest))
+            selected.append(choice)
+            nearest = np.minimum(nearest, distances[choice])
+        
+        candidates = [candidates[i] for i in sorted(selected)]
+    
+    kept_frames = [frames[i] for i in candidates]
+    stats = {
+        'kept': len(kept_frames),
+        'dropped': len(frames) - deduplicated - len(kept_frames),
+        'deduplicated': deduplicated
+    }
+    return kept_frames, stats
@@ -0,0 +1,296 @@
+import os
+import re
+from collections import defaultdict
+
+import cv2
+import numpy as np
+
+# Kamera adı dosya adının ilk "_" veya "-" karakterinden önceki kısmıdır (cam1_000123.jpg -> cam1)
+SOURCE_PATTERN = r'^(.+?)[_-]'
+
+def image_source(image_name, pattern=SOURCE_PATTERN):
+    """
+    Görüntü adından kaynak (kamera) adını çıkar
+    
+    Parametreler:
+        image_name: Görüntü adı veya yolu
+        pattern: Kaynak adını ilk grupta yakalayan düzenli ifade (None ise tüm görüntüler 'default')
+        
+    Dönüş:
+        Kaynak adı; eşleşme yoksa 'default'
+    """
+    match = re.match(pattern, os.path.basename(image_name)) if image_name and pattern else None
+    return match.group(1) if match else 'default'
+
+def box_iou(box1, box2):
+    """
+    İki kutu arasındaki Kesişim/Birleşim (IoU) oranını hesapla
+    
+    Parametreler:
+        box1: Birinci kutu [x1, y1, x2, y2]
+        box2: İkinci kutu [x1, y1, x2, y2]
+        
+    Dönüş:
+        IoU değeri
+    """
+    x_left = max(box1[0], box2[0])
+    y_top = max(box1[1], box2[1])
+    x_right = min(box1[2], box2[2])
+    y_bottom = min(box1[3], box2[3])
+    
+    if x_right <= x_left or y_bottom <= y_top:
+        return 0.0
+    
+    intersection = (x_right - x_left) * (y_bottom - y_top)
+    union = (box1[2] - box1[0]) * (box1[3] - box1[1]) + (box2[2] - box2[0]) * (box2[3] - box2[1]) - intersection
+    
+    return intersection / union if union > 0 else 0.0
+
+def crop_quality_score(plate_img, detection_confidence):
+    """
+    OCR için kırpıntının ne kadar umut verici olduğunu puanla (büyüklük, keskinlik ve tespit güveni)
+    
+    Parametreler:
+        plate_img: Kırpılmış plaka görüntüsü
+        detection_confidence: Tespit güveni
+        
+    Dönüş:
+        Karşılaştırma için puan (büyük daha iyi)
+    """
+    if plate_img is None or plate_img.size == 0:
+        return 0.0
+    
+    gray = cv2.cvtColor(plate_img, cv2.COLOR_BGR2GRAY) if len(plate_img.shape) == 3 else plate_img
+    sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
+    
+    # Yükseklik karakter boyutunu belirler; keskinlik bulanık kareleri eler
+    return detection_confidence * gray.shape[0] * np.log1p(sharpness)
+
+def vote_plate_text(reads):
+    """
+    Bir izlemenin OCR okumalarını karakter bazında oylayarak birleştir
+    
+    Önce en çok ağırlık toplayan metin uzunluğu seçilir, ardından bu uzunluktaki
+    okumalar arasında her konum için ağırlıklı çoğunluk oyu alınır.
+    
+    Parametreler:
+        reads: (metin, güven, geçerli_mi) demetleri listesi
+        
+    Dönüş:
+        voted_text: Birleştirilmiş plaka metni
+        confidence: Kazanan karakterlerin ortalama oy payı (0-1)
+    """
+    reads = [read for read in reads if read[0]]
+    if not reads:
+        return '', 0.0
+    
+    def weight(read):
+        # Geçerli biçimdeki okumalara daha fazla güven
+        return (read[1] + 0.1) * (2.0 if read[2] else 1.0)
+    
+    length_weights = defaultdict(float)
+    for read in reads:
+        length_weights[len(read[0])] += weight(read)
+    best_length = max(length_weights, key=length_weights.get)
+    
+    same_length = [read for read in reads if len(read[0]) == best_length]
+    total_weight = sum(weight(read) for read in same_length)
+    
+    voted_chars = []
+    shares = []
+    for position in range(best_length):
+        char_weights = defaultdict(float)
+        for read in same_length:
+            char_weights[read[0][position]] += weight(read)
+        best_char = max(char_weights, key=char_weights.get)
+        voted_chars.append(best_char)
+        shares.append(char_weights[best_char] / total_weight)
+    
+    return ''.join(voted_chars), float(np.mean(shares))
+
+class PlateTrack:
+    def __init__(self, track_id, detection, frame_index):
+        """
+        Tek bir plakanın ardışık karelerdeki izlemesini başlat
+        
+        Parametreler:
+            track_id: İzleme kimliği
+            detection: İlk tespit [x1, y1, x2, y2, güven]
+            frame_index: İlk görüldüğü kare
+        """
+        self.track_id = track_id
+        self.box = [float(v) for v in detection[:4]]
+        self.velocity = [0.0, 0.0]
+        self.last_frame = frame_index
+        self.hits = 1
+        self.misses = 0
+        
+        self.reads = []
+        self.ocr_calls = 0
+        self.best_ocr_score = 0.0
+        self.text = ''
+        self.confidence = 0.0
+        self.stable = False
+    
+    def predicted_box(self, frame_index):
+        """
+        Sabit hız varsayımıyla verilen karedeki kutuyu tahmin et
+        """
+        steps = frame_index - self.last_frame
+        dx, dy = self.velocity[0] * steps, self.velocity[1] * steps
+        return [self.box[0] + dx, self.box[1] + dy, self.box[2] + dx, self.box[3] + dy]
+    
+    def update(self, detection, frame_index):
+        """
+        İzlemeyi yeni bir tespitle güncelle
+        """
+        steps = max(frame_index - self.last_frame, 1)
+        new_box = [float(v) for v in detection[:4]]
+        
+        # Kutu merkezinin kare başına hareketini yumuşatarak takip et
+        dx = ((new_box[0] + new_box[2]) - (self.box[0] + self.box[2])) / 2 / steps
+        dy = ((new_box[1] + new_box[3]) - (self.box[1] + self.box[3])) / 2 / steps
+        self.velocity = [0.5 * self.velocity[0] + 0.5 * dx, 0.5 * self.velocity[1] + 0.5 * dy]
+        
+        self.box = new_box
+        self.last_frame = frame_index
+        self.hits += 1
+        self.misses = 0
+
+class PlateTracker:
+    def __init__(self, iou_threshold=0.3, max_missed=5, max_ocr_per_track=3, stable_reads=2, rescore_margin=1.2):
+        """
+        Kareler arası IoU/hareket tabanlı plaka izleyicisini başlat
+        
+        Parametreler:
+            iou_threshold: Tespitin izlemeyle eşleşmesi için gereken en düşük IoU
+            max_missed: İzlemenin silinmeden önce kaç kare görülmeyebileceği
+            max_ocr_per_track: Bir izleme için yapılacak en fazla OCR çağrısı
+            stable_reads: Okumanın kararlı sayılması için oylanan metinle aynı olması gereken okuma sayısı
+            rescore_margin: Yeniden OCR için kırpıntı puanının okunan en iyi puandan en fazla kaç kat düşük olabileceği
+        """
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.max_ocr_per_track = max_ocr_per_track
+        self.stable_reads = stable_reads
+        self.rescore_margin = rescore_margin
+        
+        self.tracks = {}
+        self.next_track_id = 1
+        self.frame_index = -1
+        
+        # OCR tasarrufunu raporlamak için sayaçlar
+        self.stats = {'frames': 0, 'detections': 0, 'ocr_calls': 0, 'tracks': 0}
+    
+    def update(self, detected_plates):
+        """
+        Yeni karenin tespitlerini mevcut izlemelerle eşleştir
+        
+        Parametreler:
+            detected_plates: Tespit listesi [x1, y1, x2, y2, güven]
+            
+        Dönüş:
+            Tespitlerle aynı sırada izleme kimlikleri listesi
+        """
+        self.frame_index += 1
+        self.stats['frames'] += 1
+        self.stats['detections'] += len(detected_plates)
+        
+        # Tüm (izleme, tespit) çiftlerinin tahmini kutularla IoU'sunu hesapla
+        pairs = []
+        for track_id, track in self.tracks.items():
+            predicted = track.predicted_box(self.frame_index)
+            for det_index, detection in enumerate(detected_plates):
+                iou = box_iou(predicted, detection[:4])
+                if iou >= self.iou_threshold:
+                    pairs.append((iou, track_id, det_index))
+        
+        # Açgözlü eşleştirme: en yüksek IoU'lu çiftler önce
+        assigned_tracks = set()
+        track_ids = [None] * len(detected_plates)
+        for iou, track_id, det_index in sorted(pairs, reverse=True):
+            if track_id in assigned_tracks or track_ids[det_index] is not None:
+                continue
+            self.tracks[track_id].update(detected_plates[det_index], self.frame_index)
+            assigned_tracks.add(track_id)
+            track_ids[det_index] = track_id
+        
+        # Eşleşmeyen tespitler için yeni izleme başlat
+        for det_index, detection in enumerate(detected_plates):
+            if track_ids[det_index] is None:
+                track = PlateTrack(self.next_track_id, detection, self.frame_index)
+                self.tracks[track.track_id] = track
+                track_ids[det_index] = track.track_id
+                self.next_track_id += 1
+                self.stats['tracks'] += 1
+        
+        # Uzun süre görülmeyen izlemeleri sil
+        for track_id in list(self.tracks):
+            if track_id not in assigned_tracks and track_id not in track_ids:
+                track = self.tracks[track_id]
+                track.misses += 1
+                if track.misses > self.max_missed:
+                    del self.tracks[track_id]
+        
+        return track_ids
+    
+    def should_ocr(self, track_id, plate_img, detection_confidence):
+        """
+        Bu karedeki kırpıntı için OCR çalıştırılıp çalıştırılmayacağına karar ver
+        
+        Kararlı veya OCR bütçesini doldurmuş izlemelerde OCR atlanır. Oylama için gereken
+        ilk stable_reads okuma toplandıktan sonra, okunan en iyi kırpıntıdan belirgin şekilde
+        kötü olan kırpıntılar (bulanık, küçük) okunmaz.
+        
+        Parametreler:
+            track_id: İzleme kimliği
+            plate_img: Bu karedeki kırpılmış plaka görüntüsü
+            detection_confidence: Tespit güveni
+            
+        Dönüş:
+            OCR gerekiyorsa True
+        """
+        track = self.tracks[track_id]
+        if track.stable or track.ocr_calls >= self.max_ocr_per_track:
+            return False
+        
+        score = crop_quality_score(plate_img, detection_confidence)
+        if track.ocr_calls >= self.stable_reads and score * self.rescore_margin < track.best_ocr_score:
+            return False
+        
+        track.best_ocr_score = max(track.best_ocr_score, score)
+        return True
+    
+    def add_read(self, track_id, text, confidence, is_valid):
+        """
+        İzlemeye yeni bir OCR okuması ekle ve oylamayı güncelle
+        
+        Parametreler:
+            track_id: İzleme kimliği
+            text: OCR metni
+            confidence: OCR güveni
+            is_valid: Metnin plaka biçimine uygun olup olmadığı
+        """
+        track = self.tracks[track_id]
+        track.ocr_calls += 1
+        self.stats['ocr_calls'] += 1
+        
+        track.reads.append((text, confidence, is_valid))
+        track.text, track.confidence = vote_plate_text(track.reads)
+        
+        # Oylanan metinle birebir aynı yeterli sayıda okuma varsa OCR'ı durdur
+        agreeing = sum(1 for read in track.reads if read[0] == track.text)
+        track.stable = bool(track.text) and agreeing >= self.stable_reads
+    
+    def get_track(self, track_id):
+        """
+        İzleme nesnesini döndür
+        """
+        return self.tracks[track_id]
+    
+    def reset(self):
+        """
+        Tüm izlemeleri temizle (örneğin sahne değiştiğinde)
+        """
+        self.tracks = {}
+        self.frame_index = -1
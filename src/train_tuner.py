@@ -0,0 +1,282 @@
+import os
+import csv
+import time
+import threading
+from datetime import datetime
+
+import psutil
+import torch
+
+# Ayarların tek tek ayarlanma sırası (koordinat araması)
+TUNED_KNOBS = ['batch_size', 'workers', 'cache', 'rect', 'amp']
+
+def count_training_images(dataset_path, split='train'):
+    """
+    Hazırlanmış YOLO veri setindeki eğitim görüntülerini say
+    
+    Parametreler:
+        dataset_path: YOLO formatında veri seti yolu
+        split: Sayılacak bölüm
+        
+    Dönüş:
+        Görüntü sayısı
+    """
+    images_dir = os.path.join(dataset_path, split, 'images')
+    if not os.path.exists(images_dir):
+        return 0
+    
+    with os.scandir(images_dir) as entries:
+        return sum(1 for entry in entries if entry.is_file())
+
+def estimate_cache_bytes(num_images, img_size, fraction=1.0):
+    """
+    cache='ram' için gereken yaklaşık belleği tahmin et (img_size'a küçültülmüş BGR görüntüler)
+    
+    Parametreler:
+        num_images: Veri setindeki eğitim görüntüsü sayısı
+        img_size: Eğitim görüntü boyutu
+        fraction: Eğitimde kullanılan veri oranı (deneme eğitimleri yalnızca bu kadarını önbelleğe alır)
+        
+    Dönüş:
+        Tahmini bayt sayısı
+    """
+    return int(num_images * fraction) * img_size * img_size * 3
+
+def default_worker_options():
+    """
+    Bu makinedeki çekirdek sayısına göre denenecek veri yükleyici işçi sayılarını döndür
+    """
+    cpu_count = os.cpu_count() or 1
+    return sorted({0, min(2, cpu_count), max(cpu_count // 2, 1), cpu_count})
+
+class _ProbeMonitor:
+    def __init__(self, sample_interval=0.5):
+        """
+        Deneme eğitimi sırasında epoch sürelerini ve en yüksek bellek kullanımını izle
+        
+        Parametreler:
+            sample_interval: Bellek örnekleme aralığı (saniye)
+        """
+        self.sample_interval = sample_interval
+        self.epoch_times = []
+        self.peak_rss = 0
+        self._epoch_start = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_memory, daemon=True)
+    
+    def _sample_memory(self):
+        process = psutil.Process()
+        while not self._stop.is_set():
+            try:
+                # Veri yükleyici işçileri ayrı süreçlerdir; onları da say
+                rss = process.memory_info().rss
+                for child in process.children(recursive=True):
+                    rss += child.memory_info().rss
+                self.peak_rss = max(self.peak_rss, rss)
+            except psutil.Error:
+                pass
+            self._stop.wait(self.sample_interval)
+    
+    def on_epoch_start(self, trainer):
+        self._epoch_start = time.perf_counter()
+    
+    def on_epoch_end(self, trainer):
+        if self._epoch_start is not None:
+            self.epoch_times.append(time.perf_counter() - self._epoch_start)
+    
+    def callbacks(self):
+        return {
+            'on_train_epoch_start': self.on_epoch_start,
+            'on_train_epoch_end': self.on_epoch_end
+        }
+    
+    def __enter__(self):
+        self._thread.start()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+def run_probe(detector, dataset_path, config, img_size, num_images, probe_fraction=0.1, probe_epochs=2,
+              memory_budget_bytes=None):
+    """
+    Verilen ayarlarla kısa, zamanlı bir deneme eğitimi çalıştır
+    
+    Parametreler:
+        detector: PlateDetector nesnesi
+        dataset_path: YOLO formatında veri seti yolu
+        config: batch_size, workers, cache, rect, amp anahtarlarını içeren ayar sözlüğü
+        img_size: Eğitim görüntü boyutu
+        num_images: Veri setindeki eğitim görüntüsü sayısı
+        probe_fraction: Denemede kullanılacak veri oranı
+        probe_epochs: Deneme epoch sayısı (önbellek etkisini görmek için en az 2 önerilir)
+        memory_budget_bytes: Bellek bütçesi (bayt). None ise sınır yok
+        
+    Dönüş:
+        Ayarları ve ölçümleri içeren deneme sonucu sözlüğü
+    """
+    probe = dict(config, images_per_sec=0.0, epoch_seconds=None, peak_rss_gb=0.0, status='tamam')
+    
+    with _ProbeMonitor() as monitor:
+        model_path = detector.train_custom_model(
+            dataset_path,
+            epochs=probe_epochs,
+            batch_size=config['batch_size'],
+            img_size=img_size,
+            workers=config['workers'],
+            cache=config['cache'],
+            rect=config['rect'],
+            amp=config['amp'],
+            fraction=probe_fraction,
+            validate=False,
+            update_model=False,
+            callbacks=monitor.callbacks()
+        )
+    
+    probe['peak_rss_gb'] = monitor.peak_rss / 1024 ** 3
+    
+    if model_path is None or not monitor.epoch_times:
+        probe['status'] = 'hata'
+        return probe
+    
+    # Deneme verinin yalnızca probe_fraction kadarını RAM'de önbelleğe aldı; tam eğitimde kalan görüntüler de
+    # önbelleğe alınacağı için bütçe, ölçülen tepe belleğe kalan kısmın tahmini eklenerek karşılaştırılır
+    projected_rss = monitor.peak_rss
+    if config['cache'] == 'ram':
+        projected_rss += estimate_cache_bytes(num_images, img_size, 1 - probe_fraction)
+    
+    if memory_budget_bytes and projected_rss > memory_budget_bytes:
+        probe['status'] = 'bellek bütçesi aşıldı' if monitor.peak_rss > memory_budget_bytes else \
+            'bellek bütçesi aşılır (tahmini)'
+    
+    # İlk epoch önbellek doldurma ve ısınma içerdiği için son epoch'u kararlı hız olarak al
+    probe['epoch_seconds'] = monitor.epoch_times[-1]
+    probe['images_per_sec'] = num_images * probe_fraction / monitor.epoch_times[-1]
+    
+    return probe
+
+def tune_training(detector, dataset_path, img_size=640, batch_sizes=(8, 16, 32), workers_options=None,
+                  cache_options=(False, 'disk', 'ram'), rect_options=(False, True), amp_options=None,
+                  probe_fraction=0.1, probe_epochs=2, memory_budget_gb=None, results_dir='results'):
+    """
+    Eğitim hızını etkileyen ayarları bu makinede kısa denemelerle ayarla
+    
+    Ayarlar TUNED_KNOBS sırasıyla tek tek denenir; her adımda diğer ayarlar o ana
+    kadarki en hızlı kararlı değerde tutulur.
+    
+    Parametreler:
+        detector: PlateDetector nesnesi
+        dataset_path: YOLO formatında veri seti yolu
+        img_size: Eğitim görüntü boyutu
+        batch_sizes: Denenecek toplu iş boyutları
+        workers_options: Denenecek veri yükleyici işçi sayıları. None ise çekirdek sayısından türetilir
+        cache_options: Denenecek önbellek seçenekleri
+        rect_options: Denenecek dikdörtgen toplu iş seçenekleri
+        amp_options: Denenecek AMP seçenekleri. None ise yalnızca GPU varsa AMP denenir
+        probe_fraction: Her denemede kullanılacak veri oranı
+        probe_epochs: Her denemenin epoch sayısı
+        memory_budget_gb: Bellek bütçesi (GB). None ise sınır yok
+        results_dir: Ayar raporunun kaydedileceği dizin
+        
+    Dönüş:
+        best_config: En hızlı kararlı ayarlar (train_custom_model argümanları) veya hiçbiri başarılı olmazsa None
+        probes: Tüm deneme sonuçlarının listesi
+    """
+    num_images = count_training_images(dataset_path)
+    if num_images == 0:
+        print(f"Hata: {dataset_path} içinde eğitim görüntüsü bulunamadı")
+        return None, []
+    
+    if workers_options is None:
+        workers_options = default_worker_options()
+    if amp_options is None:
+        amp_options = (False, True) if torch.cuda.is_available() else (None,)
+    
+    options = {
+        'batch_size': list(batch_sizes),
+        'workers': list(workers_options),
+        'cache': list(cache_options),
+        'rect': list(rect_options),
+        'amp': list(amp_options)
+    }
+    memory_budget_bytes = memory_budget_gb * 1024 ** 3 if memory_budget_gb else None
+    
+    # Başlangıç noktası: her ayarın ilk seçeneği, işçi sayısı için ortadaki değer
+    best_config = {knob: values[0] for knob, values in options.items()}
+    best_config['workers'] = options['workers'][len(options['workers']) // 2]
+    best_probe = None
+    
+    probes = []
+    probed = {}
+    
+    print(f"Eğitim ayarı başlatılıyor: {num_images} görüntü, deneme oranı {probe_fraction}, {probe_epochs} epoch")
+    
+    for knob in TUNED_KNOBS:
+        for value in options[knob]:
+            config = dict(best_config, **{knob: value})
+            key = tuple(config[k] for k in TUNED_KNOBS)
+            if key in probed:
+                continue
+            
+            # Tam eğitimde tüm veri setinin RAM önbelleği tek başına bütçeye sığmıyorsa denemeye gerek yok;
+            # sığıyorsa denemenin ölçtüğü bellek run_probe içinde tam veri setine ölçeklenir
+            if (config['cache'] == 'ram' and memory_budget_bytes
+                    and estimate_cache_bytes(num_images, img_size) > memory_budget_bytes):
+                probe = dict(config, images_per_sec=0.0, epoch_seconds=None, peak_rss_gb=0.0,
+                             status='bellek bütçesi aşılır (tahmini)')
+            else:
+                print(f"\nDeneme: {config}")
+                probe = run_probe(detector, dataset_path, config, img_size, num_images,
+                                  probe_fraction, probe_epochs, memory_budget_bytes)
+                print(f"Sonuç: {probe['images_per_sec']:.1f} görüntü/sn ({probe['status']})")
+            
+            probed[key] = probe
+            probes.append(probe)
+            
+            if probe['status'] == 'tamam' and (best_probe is None or
+                                               probe['images_per_sec'] > best_probe['images_per_sec']):
+                best_probe = probe
+        
+        if best_probe is not None:
+            best_config = {k: best_probe[k] for k in TUNED_KNOBS}
+    
+    save_tuning_report(probes, results_dir)
+    
+    if best_probe is None:
+        print("Hata: Hiçbir deneme ayarı başarıyla tamamlanamadı")
+        return None, probes
+    
+    print(f"\nEn hızlı kararlı ayar: {best_config} ({best_probe['images_per_sec']:.1f} görüntü/sn)")
+    return best_config, probes
+
+def save_tuning_report(probes, results_dir='results'):
+    """
+    Deneme sonuçlarını tablo olarak yazdır ve CSV dosyasına kaydet
+    
+    Parametreler:
+        probes: tune_training tarafından üretilen deneme sonuçları
+        results_dir: CSV dosyasının kaydedileceği dizin
+        
+    Dönüş:
+        Kaydedilen CSV dosyasının yolu
+    """
+    os.makedirs(results_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    csv_path = os.path.join(results_dir, f'train_tuning_{timestamp}.csv')
+    
+    columns = TUNED_KNOBS + ['images_per_sec', 'epoch_seconds', 'peak_rss_gb', 'status']
+    
+    print(f"\n{'batch':>6} {'workers':>8} {'cache':>6} {'rect':>6} {'amp':>6} {'görüntü/sn':>11} {'RSS(GB)':>8}  durum")
+    for probe in sorted(probes, key=lambda p: p['images_per_sec'], reverse=True):
+        print(f"{probe['batch_size']:>6} {probe['workers']:>8} {str(probe['cache']):>6} {str(probe['rect']):>6} "
+              f"{str(probe['amp']):>6} {probe['images_per_sec']:>11.1f} {probe['peak_rss_gb']:>8.2f}  {probe['status']}")
+    
+    with open(csv_path, 'w', newline='') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=columns)
+        writer.writeheader()
+        for probe in probes:
+            writer.writerow({column: probe[column] for column in columns})
+    
+    print(f"Ayar raporu kaydedildi: {csv_path}")
+    return csv_path
@@ -0,0 +1,214 @@
+import os
+import re
+
+import numpy as np
+
+# İndeks biçimi değiştiğinde eski önbellek dosyalarını geçersiz kılmak için
+INDEX_VERSION = 1
+
+def parse_ufpr_annotation(txt_path):
+    """
+    Tek bir UFPR-ALPR kare açıklama dosyasını ayrıştır
+    
+    Parametreler:
+        txt_path: Karenin .txt açıklama dosyasının yolu
+        
+    Dönüş:
+        {'text', 'box', 'corners', 'chars'} sözlüğü; box [x1, y1, x2, y2], corners 4 köşe noktası
+        (dosyada yoksa None), chars sırasıyla karakter kutuları [x1, y1, x2, y2]. Plaka bilgisi bulunamazsa None
+    """
+    text = None
+    box = None
+    corners = None
+    chars = []
+    
+    with open(txt_path, 'r') as f:
+        for line in f:
+            key, _, value = line.strip().partition(':')
+            value = value.strip()
+            
+            if key == 'plate':
+                text = value
+            elif key == 'position_plate':
+                x, y, w, h = map(int, value.split())
+                box = [x, y, x + w, y + h]
+            elif key == 'corners':
+                corners = [list(map(int, corner.split(','))) for corner in value.split()]
+            elif key.startswith('char '):
+                x, y, w, h = map(int, value.split())
+                chars.append([x, y, x + w, y + h])
+    
+    if text is None and corners is None:
+        return None
+    
+    # Konum satırı yoksa kutuyu köşelerden türet
+    if box is None and corners is not None:
+        x_coords = [p[0] for p in corners]
+        y_coords = [p[1] for p in corners]
+        box = [min(x_coords), min(y_coords), max(x_coords), max(y_coords)]
+    
+    return {'text': text or '', 'box': box, 'corners': corners, 'chars': chars}
+
+def find_ufpr_annotations(dataset_root):
+    """
+    Veri seti altındaki tüm (görüntü, açıklama) çiftlerini bul
+    
+    Parametreler:
+        dataset_root: UFPR-ALPR kökü veya training/validation/testing bölümlerinden biri
+        
+    Dönüş:
+        (göreli_görüntü_yolu, açıklama_yolu, değiştirilme_zamanı) demetleri listesi
+    """
+    pairs = []
+    for folder, _, files in os.walk(dataset_root):
+        file_set = set(files)
+        for file in files:
+            if not file.endswith('.txt'):
+                continue
+            image_file = file[:-4] + '.png'
+            if image_file not in file_set:
+                continue
+            
+            txt_path = os.path.join(folder, file)
+            relative_image = os.path.relpath(os.path.join(folder, image_file), dataset_root)
+            pairs.append((relative_image, txt_path, os.stat(txt_path).st_mtime_ns))
+    
+    return sorted(pairs)
+
+def _track_id(relative_image):
+    """
+    "track0091" klasör adından izleme numarasını çıkar (bulunamazsa -1)
+    """
+    match = re.search(r'track(\d+)', relative_image)
+    return int(match.group(1)) if match else -1
+
+class UFPRIndex:
+    def __init__(self, columns):
+        """
+        UFPR açıklamalarının sütun tabanlı indeksi
+        
+        Her sütun bir numpy dizisidir (görüntü adı, göreli yol, bölüm, izleme numarası, plaka metni,
+        kutu, köşeler). Görüntü adından satıra sözlük bir kez kurulur, aramalar O(1)'dir.
+        Nesne, değerlendirme kodunun beklediği gerçek etiket sözlüğü gibi kullanılabilir.
+        
+        Parametreler:
+            columns: Sütun adından numpy dizisine sözlük
+        """
+        self.columns = columns
+        self.row_by_name = {name: row for row, name in enumerate(columns['names'].tolist())}
+    
+    @classmethod
+    def build(cls, dataset_root):
+        """
+        Açıklama dosyalarını ayrıştırarak indeksi oluştur
+        
+        Parametreler:
+            dataset_root: UFPR-ALPR kökü veya bir bölüm dizini
+            
+        Dönüş:
+            UFPRIndex nesnesi
+        """
+        names, paths, splits, track_ids, texts, boxes, corners = [], [], [], [], [], [], []
+        
+        for relative_image, txt_path, _ in find_ufpr_annotations(dataset_root):
+            annotation = parse_ufpr_annotation(txt_path)
+            if annotation is None or annotation['box'] is None:
+                continue
+            
+            parts = relative_image.split(os.sep)
+            names.append(parts[-1])
+            paths.append(relative_image)
+            splits.append(parts[0] if parts[0] in ('training', 'validation', 'testing') else '')
+            track_ids.append(_track_id(relative_image))
+            # OCR çıktısıyla karşılaştırılabilmesi için tireyi ve boşlukları kaldır (AYO-9034 -> AYO9034)
+            texts.append(re.sub(r'[^A-Z0-9]', '', annotation['text'].upper()))
+            boxes.append(annotation['box'])
+            corners.append(annotation['corners'] if annotation['corners'] and len(annotation['corners']) == 4
+                           else [[np.nan, np.nan]] * 4)
+        
+        columns = {
+            'names': np.array(names, dtype=str),
+            'paths': np.array(paths, dtype=str),
+            'splits': np.array(splits, dtype=str),
+            'track_ids': np.array(track_ids, dtype=np.int32),
+            'texts': np.array(texts, dtype=str),
+            'boxes': np.array(boxes, dtype=np.int32).reshape(-1, 4),
+            'corners': np.array(corners, dtype=np.float32).reshape(-1, 4, 2)
+        }
+        return cls(columns)
+    
+    @classmethod
+    def load_or_build(cls, dataset_root, cache_path=None):
+        """
+        İndeksi diskteki önbellekten yükle; açıklamalar değişmişse yeniden oluşturup kaydet
+        
+        Önbelleğin geçerliliği açıklama dosyalarının sayısı ve en son değiştirilme zamanıyla
+        kontrol edilir; bunun için dosyalar yalnızca listelenir, ayrıştırılmaz.
+        
+        Parametreler:
+            dataset_root: UFPR-ALPR kökü veya bir bölüm dizini
+            cache_path: Önbellek dosyası (None ise dataset_root/.ufpr_index.npz)
+            
+        Dönüş:
+            UFPRIndex nesnesi
+        """
+        cache_path = cache_path or os.path.join(dataset_root, '.ufpr_index.npz')
+        pairs = find_ufpr_annotations(dataset_root)
+        signature = np.array([INDEX_VERSION, len(pairs), max((p[2] for p in pairs), default=0)], dtype=np.int64)
+        
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cached:
+                    if np.array_equal(cached['signature'], signature):
+                        return cls({key: cached[key] for key in cached.files if key != 'signature'})
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Uyarı: UFPR indeks önbelleği okunamadı, yeniden oluşturulacak: {str(e)}")
+        
+        print(f"UFPR açıklama indeksi oluşturuluyor: {dataset_root}")
+        index = cls.build(dataset_root)
+        
+        try:
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, signature=signature, **index.columns)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            # Salt okunur veri seti dizinlerinde önbelleksiz devam et
+            print(f"Uyarı: UFPR indeks önbelleği kaydedilemedi: {str(e)}")
+        
+        return index
+    
+    def __len__(self):
+        return len(self.row_by_name)
+    
+    def __contains__(self, image_name):
+        return image_name in self.row_by_name
+    
+    def __getitem__(self, image_name):
+        """
+        Görüntünün gerçek etiketini değerlendirme biçiminde döndür
+        
+        Dönüş:
+            {'plates': [{'text', 'position', 'corners'}], 'track_id', 'path'} sözlüğü
+        """
+        row = self.row_by_name[image_name]
+        corners = self.columns['corners'][row]
+        
+        return {
+            'plates': [{
+                'text': str(self.columns['texts'][row]),
+                'position': self.columns['boxes'][row].tolist(),
+                'corners': None if np.isnan(corners).any() else corners.tolist()
+            }],
+            'track_id': int(self.columns['track_ids'][row]),
+            'path': str(self.columns['paths'][row])
+        }
+    
+    def get(self, image_name, default=None):
+        return self[image_name] if image_name in self else default
+    
+    def track_rows(self, track_id):
+        """
+        Bir izlemeye ait satır indekslerini döndür
+        """
+        return np.flatnonzero(self.columns['track_ids'] == track_id)
@@ -0,0 +1,252 @@
+import os
+import time
+import queue
+import shutil
+import threading
+
+from journal import ProcessingJournal
+
+# Kameraların yazma sırasında kullandığı geçici dosya uzantıları
+PARTIAL_SUFFIXES = ('.tmp', '.part', '.partial', '.crdownload')
+
+def is_complete_image(path):
+    """
+    Görüntü dosyasının tamamen yazılıp yazılmadığını dosya sonu işaretinden kontrol et
+    
+    JPEG dosyaları FF D9 ile, PNG dosyaları IEND parçasıyla biter; diğer biçimlerde
+    yalnızca boyut ve değişiklik zamanının sabitliğine güvenilir.
+    
+    Parametreler:
+        path: Görüntü yolu
+        
+    Dönüş:
+        Dosya tamamsa True
+    """
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            if ext in ('.jpg', '.jpeg'):
+                if size < 4:
+                    return False
+                # Bazı kameralar EOI işaretinden sonra birkaç dolgu baytı bırakır
+                f.seek(max(size - 16, 0))
+                return b'\xff\xd9' in f.read()
+            if ext == '.png':
+                if size < 12:
+                    return False
+                f.seek(size - 12)
+                return f.read()[4:8] == b'IEND'
+    except OSError:
+        return False
+    return True
+
+class SpoolWatcher:
+    def __init__(self, spool_dir, extensions=('.jpg', '.jpeg', '.png', '.bmp'), settle_seconds=1.0):
+        """
+        Bir biriktirme dizinindeki yeni görüntüleri os.scandir taramasıyla bul
+        
+        İşlenen dosyalar dizinden taşındığı için her tarama yalnızca henüz işlenmemiş dosyaları
+        görür; büyük dizinlerin tamamı yeniden taranmaz.
+        
+        Parametreler:
+            spool_dir: İzlenecek dizin
+            extensions: Kabul edilen dosya uzantıları
+            settle_seconds: Dosyanın hazır sayılması için boyutunun ve değişiklik zamanının
+                            sabit kalması gereken süre (saniye)
+        """
+        self.spool_dir = spool_dir
+        self.extensions = tuple(ext.lower() for ext in extensions)
+        self.settle_seconds = settle_seconds
+        
+        # Dosya adından (boyut, değişiklik zamanı, sabit görülmeye başladığı an)
+        self._pending = {}
+    
+    def poll(self):
+        """
+        Dizini bir kez tara ve işlenmeye hazır dosyaları döndür
+        
+        Dönüş:
+            Hazır dosya yolları listesi (değişiklik zamanına göre sıralı)
+        """
+        now = time.monotonic()
+        ready = []
+        seen = set()
+        
+        with os.scandir(self.spool_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.') or name.lower().endswith(PARTIAL_SUFFIXES):
+                    continue
+                if not name.lower().endswith(self.extensions):
+                    continue
+                
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    # Tarama sırasında taşınmış veya silinmiş
+                    continue
+                
+                seen.add(name)
+                signature = (stat.st_size, stat.st_mtime_ns)
+                previous = self._pending.get(name)
+                
+                if previous is None or previous[:2] != signature:
+                    # Yeni dosya veya hâlâ yazılıyor
+                    self._pending[name] = signature + (now,)
+                    continue
+                
+                if stat.st_size > 0 and now - previous[2] >= self.settle_seconds and is_complete_image(entry.path):
+                    ready.append((stat.st_mtime_ns, entry.path))
+        
+        # Dizinden kaybolan dosyaları unut
+        for name in list(self._pending):
+            if name not in seen:
+                del self._pending[name]
+        
+        for _, path in ready:
+            del self._pending[os.path.basename(path)]
+        
+        return [path for _, path in sorted(ready)]
+
+def move_file(path, target_dir):
+    """
+    Dosyayı hedef dizine taşı; aynı adda dosya varsa adın sonuna sayı ekle
+    
+    Parametreler:
+        path: Taşınacak dosya
+        target_dir: Hedef dizin
+        
+    Dönüş:
+        Dosyanın yeni yolu
+    """
+    os.makedirs(target_dir, exist_ok=True)
+    root, ext = os.path.splitext(os.path.basename(path))
+    target = os.path.join(target_dir, root + ext)
+    
+    counter = 1
+    while os.path.exists(target):
+        target = os.path.join(target_dir, f"{root}_{counter}{ext}")
+        counter += 1
+    
+    shutil.move(path, target)
+    return target
+
+def watch_folder(spool_dir, process_image, output_dir=None, max_in_flight=8, poll_interval=0.5,
+                 settle_seconds=1.0, max_idle_seconds=None):
+    """
+    Biriktirme dizinini sürekli izle ve gelen görüntüleri işle
+    
+    Tarayıcı iş parçacığı hazır dosyaları inprogress/ dizinine taşıyarak sahiplenir ve işleme
+    kuyruğuna koyar; işlemdeki dosya sayısı max_in_flight'a ulaştığında yeni dosya sahiplenmez,
+    dosyalar biriktirme dizininde bekler. İşlenen dosyalar processed/, okunamayanlar failed/ altına taşınır ve sonuçlar
+    bir günlüğe yazılır. Önceki çalıştırmadan inprogress/ dizininde kalan dosyalar yeniden işlenir.
+    
+    Parametreler:
+        spool_dir: İzlenecek dizin
+        process_image: Görüntü yolunu ve dosyanın hazır olduğu anı (time.monotonic) alıp
+                       (tanınan_plakalar, başarılı_mı) döndüren fonksiyon
+        output_dir: processed/, failed/, inprogress/ ve günlüğün tutulacağı dizin (None ise spool_dir)
+        max_in_flight: Sahiplenilmiş ama tamamlanmamış en fazla dosya sayısı
+        poll_interval: Taramalar arası bekleme (saniye)
+        settle_seconds: Dosyanın hazır sayılması için sabit kalması gereken süre (saniye)
+        max_idle_seconds: Bu kadar süre yeni dosya gelmezse dur (None ise Ctrl+C'ye kadar çalış)
+        
+    Dönüş:
+        İşlenen dosya sayısı
+    """
+    output_dir = output_dir or spool_dir
+    inprogress_dir = os.path.join(output_dir, 'inprogress')
+    processed_dir = os.path.join(output_dir, 'processed')
+    failed_dir = os.path.join(output_dir, 'failed')
+    os.makedirs(inprogress_dir, exist_ok=True)
+    
+    # Kayıtlar bellekte tutulmaz; sürekli çalışan izlemede bellek ve açılış süresi günlükle büyümez
+    journal = ProcessingJournal(os.path.join(output_dir, 'watch_journal.jsonl'), resume=True, retain=False)
+    watcher = SpoolWatcher(spool_dir, settle_seconds=settle_seconds)
+    in_flight = queue.Queue()
+    slots = threading.Semaphore(max_in_flight)
+    stop = threading.Event()
+    
+    # Önceki çalıştırmadan yarım kalan dosyaları öne al
+    leftovers = sorted(entry.path for entry in os.scandir(inprogress_dir) if entry.is_file())
+    
+    def acquire_slot():
+        # İşlemdeki dosya sayısı sınırdaysa yer açılana kadar bekle (geri basınç)
+        while not stop.is_set():
+            if slots.acquire(timeout=poll_interval):
+                return True
+        return False
+    
+    def scan():
+        for path in leftovers:
+            if not acquire_slot():
+                return
+            in_flight.put((path, time.monotonic()))
+        
+        while not stop.is_set():
+            for path in watcher.poll():
+                if not acquire_slot():
+                    return
+                
+                try:
+                    claimed = move_file(path, inprogress_dir)
+                except OSError as e:
+                    print(f"Uyarı: {path} sahiplenilemedi: {str(e)}")
+                    slots.release()
+                    continue
+                in_flight.put((claimed, time.monotonic()))
+            
+            stop.wait(poll_interval)
+    
+    scanner = threading.Thread(target=scan, daemon=True)
+    scanner.start()
+    
+    print(f"{spool_dir} izleniyor (en fazla {max_in_flight} dosya işlemde). Durdurmak için Ctrl+C")
+    
+    processed = 0
+    last_activity = time.monotonic()
+    
+    try:
+        while True:
+            try:
+                item = in_flight.get(timeout=poll_interval)
+            except queue.Empty:
+                if max_idle_seconds is not None and time.monotonic() - last_activity > max_idle_seconds:
+                    break
+                continue
+            
+            path, ready_time = item
+            try:
+                recognized_plates, success = process_image(path, ready_time)
+            except Exception as e:
+                # Tek bir dosyadaki hata (bozuk görüntü, Tesseract/model hatası) servisi durdurmamalı;
+                # dosya inprogress/ içinde kalırsa yeniden başlatmada tekrar alınıp döngüye girer
+                print(f"Hata: {os.path.basename(path)} işlenemedi: {type(e).__name__}: {str(e)}")
+                recognized_plates, success = [], False
+            
+            try:
+                target = move_file(path, processed_dir if success else failed_dir)
+                journal.record(os.path.basename(target), recognized_plates)
+            except OSError as e:
+                print(f"Hata: {os.path.basename(path)} taşınamadı: {str(e)}")
+                target = path
+            finally:
+                slots.release()
+            
+            processed += 1
+            last_activity = time.monotonic()
+            texts = ', '.join(plate['text'] for plate in recognized_plates if plate['text']) or '-'
+            print(f"{os.path.basename(target)}: {texts} ({(last_activity - ready_time) * 1000:.0f} ms)")
+    except KeyboardInterrupt:
+        print("\nİzleme durduruluyor...")
+    finally:
+        stop.set()
+        scanner.join()
+        journal.close()
+    
+    print(f"İzleme sona erdi: {processed} dosya işlendi")
+    return processed
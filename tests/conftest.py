@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Kaynak modüller src/ altında düz olarak bulunur ve birbirini doğrudan içe aktarır
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
@@ -0,0 +1,39 @@
+import pytest
+
+from char_recognizer import CHAR_CLASSES, assemble_plate_text
+
+def detections(chars):
+    # chars: (karakter, x, y) demetleri; kutular 10x20 piksel
+    boxes = [[x, y, x + 10, y + 20] for _, x, y in chars]
+    classes = [CHAR_CLASSES.index(ch) for ch, _, _ in chars]
+    return boxes, classes
+
+def test_empty():
+    assert assemble_plate_text([], [], []) == ('', 0.0)
+
+def test_single_row_sorted_left_to_right():
+    boxes, classes = detections([('1', 45, 10), ('A', 0, 10), ('C', 30, 10), ('2', 60, 10),
+                                 ('B', 15, 10), ('4', 90, 10), ('3', 75, 10)])
+    text, confidence = assemble_plate_text(boxes, classes, [0.9] * 7)
+    assert text == 'ABC1234'
+    assert confidence == pytest.approx(0.9)
+
+def test_two_row_plate():
+    # Motosiklet plakası: üstte harfler, altta rakamlar
+    boxes, classes = detections([('3', 40, 40), ('1', 0, 40), ('B', 20, 0), ('4', 60, 40),
+                                 ('A', 0, 0), ('C', 40, 0), ('2', 20, 40)])
+    text, _ = assemble_plate_text(boxes, classes, [0.9] * 7)
+    assert text == 'ABC1234'
+
+def test_slanted_single_row_not_split():
+    # Hafif eğik tek satır, karakter yüksekliğinin yarısından küçük kaymalarla satırlara bölünmemeli
+    boxes, classes = detections([(ch, i * 15, i * 2) for i, ch in enumerate('ABC1234')])
+    text, _ = assemble_plate_text(boxes, classes, [0.9] * 7)
+    assert text == 'ABC1234'
+
+def test_drops_lowest_confidence_extras():
+    boxes, classes = detections([(ch, i * 15, 10) for i, ch in enumerate('ABXC1234')])
+    confidences = [0.9, 0.9, 0.1, 0.9, 0.9, 0.9, 0.9, 0.9]
+    text, confidence = assemble_plate_text(boxes, classes, confidences)
+    assert text == 'ABC1234'
+    assert confidence == pytest.approx(0.9)
@@ -0,0 +1,93 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from crop_bank import CropBank, evaluate_bank
+
+GT_DATA = {
+    'a.png': {'plates': [{'text': 'ABC-1234', 'position': [10, 10, 50, 30]},
+                         {'text': 'XYZ-9876', 'position': [100, 10, 140, 30]}]}
+}
+DETECTIONS = [[10, 10, 50, 30, 0.9], [100, 10, 140, 30, 0.8], [200, 200, 220, 210, 0.5]]
+
+# Sahte OCR kırpıntıyı dolgu renginden okur; ikinci plakanın son karakterini yanlış okur
+READINGS = {50: 'ABC1234', 100: 'XYZ9870', 150: 'QQQ0000'}
+
+class FakeOCR:
+    backend = 'tesseract'
+    
+    def recognize_plate(self, image):
+        return READINGS.get(int(image.flat[0]), ''), 0.9
+    
+    def analyze_results(self, text, raw_text):
+        return text, len(text) == 7
+
+class FakeBatchOCR(FakeOCR):
+    backend = 'yolo'
+    
+    def __init__(self):
+        self.batches = []
+    
+    def recognize_batch(self, images):
+        self.batches.append(len(images))
+        return [self.recognize_plate(image) for image in images]
+
+def crops():
+    return [np.full((20, 40, 3), value, dtype=np.uint8) for value in (50, 100, 150)]
+
+@pytest.fixture
+def bank(tmp_path):
+    with CropBank(str(tmp_path / 'bank'), gt_data=GT_DATA) as bank:
+        yield bank
+
+def test_add_crops_stores_lossless_crops_with_labels(bank):
+    assert bank.add_crops('/data/a.png', DETECTIONS, crops(), detector_version='v1') == 3
+    assert bank.count() == 3
+    assert bank.count(labeled_only=True) == 2
+    
+    (rows, images), = bank.iter_batches(labeled_only=False)
+    assert [row['gt_text'] for row in rows] == ['ABC1234', 'XYZ9876', None]
+    assert rows[0]['source'] == '/data/a.png' and rows[0]['image_name'] == 'a.png'
+    assert all(os.path.exists(os.path.join(bank.bank_dir, row['crop_file'])) for row in rows)
+    for image, crop in zip(images, crops()):
+        assert np.array_equal(image, crop)
+
+def test_add_crops_skips_duplicates_and_empty_crops(bank):
+    bank.add_crops('/data/a.png', DETECTIONS, crops(), detector_version='v1')
+    
+    # Aynı görüntü aynı modelle yeniden işlendiğinde kırpıntı eklenmez; farklı model sürümü ayrı tutulur
+    assert bank.add_crops('/other/a.png', DETECTIONS, crops(), detector_version='v1') == 0
+    assert bank.add_crops('/data/a.png', DETECTIONS, [None, np.zeros((0, 0, 3), np.uint8), crops()[2]],
+                          detector_version='v2') == 1
+    assert bank.count() == 4
+    
+    assert len(next(bank.iter_batches(labeled_only=False, detector_version='v2'))[0]) == 1
+
+def test_bank_survives_reopen(bank):
+    bank.add_crops('/data/a.png', DETECTIONS, crops(), detector_version='v1')
+    bank.close()
+    
+    with CropBank(bank.bank_dir) as reopened:
+        assert reopened.count(labeled_only=True) == 2
+        assert reopened.add_crops('/data/a.png', DETECTIONS, crops(), detector_version='v1') == 0
+
+def test_evaluate_bank(bank):
+    bank.add_crops('/data/a.png', DETECTIONS, crops(), detector_version='v1')
+    bank.add_crops('/data/a.png', DETECTIONS[:1], crops()[:1], detector_version='v2')
+    
+    for ocr in (FakeOCR(), FakeBatchOCR()):
+        result, = evaluate_bank(bank, ocr, ('none',), batch_size=2, workers=2, detector_version='v1')
+        
+        # Yalnızca etiketli kırpıntılar değerlendirilir
+        assert result['ocr_variant'] == 'none'
+        assert result['crops'] == 2
+        assert result['exact_match_accuracy'] == 0.5
+        assert result['character_accuracy'] == 13 / 14
+        assert result['valid_rate'] == 1.0
+    assert ocr.batches == [2]
+    
+    results = evaluate_bank(bank, FakeOCR(), ('none', 'default'), batch_size=1)
+    assert [r['ocr_variant'] for r in results] == ['none', 'default']
+    assert results[0]['crops'] == 3
@@ -0,0 +1,65 @@
+import argparse
+import json
+
+import pytest
+
+# detect_and_recognize tespit modelini (ultralytics) modül düzeyinde içe aktarır
+pytest.importorskip('ultralytics')
+
+from evaluate import EvaluationMetrics
+from detect_and_recognize import (list_dataset_images, parse_shard, select_shard, shard_output_dir,
+                                  save_shard_results, merge_shards)
+
+def test_parse_shard():
+    assert parse_shard('0/4') == (0, 4)
+    assert parse_shard('3/4') == (3, 4)
+    for spec in ('4/4', '-1/4', '0/0', 'a/b', '1', '1/2/3'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_shard(spec)
+
+def test_select_shard_partitions_images():
+    images = [f'img{i:02d}.jpg' for i in range(10)]
+    shards = [select_shard(images, index, 3) for index in range(3)]
+    
+    assert shards[0] == ['img00.jpg', 'img03.jpg', 'img06.jpg', 'img09.jpg']
+    assert sorted(sum(shards, [])) == images
+    assert select_shard(images, 0, 1) == images
+
+def test_list_dataset_images_sorted_by_relative_path(tmp_path):
+    for relative in ('b/1.jpg', 'a/2.png', 'a/1.jpg', 'c.jpg', 'notes.txt'):
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b'')
+    
+    flat = list_dataset_images(tmp_path)
+    nested = list_dataset_images(tmp_path, recursive=True)
+    assert [p.relative_to(tmp_path).as_posix() for p in flat] == ['c.jpg']
+    assert [p.relative_to(tmp_path).as_posix() for p in nested] == ['a/1.jpg', 'a/2.png', 'b/1.jpg', 'c.jpg']
+
+def write_shard(results_dir, index, count, images, true_positives):
+    save_dir = shard_output_dir(str(results_dir), index, count)
+    evaluator = EvaluationMetrics(save_dir=save_dir)
+    evaluator.results['total_plates'] += true_positives
+    evaluator.results['true_positives'] += true_positives
+    evaluator.add_timing(0.1)
+    save_shard_results(save_dir, (index, count), evaluator, images)
+
+def test_merge_shards(tmp_path):
+    write_shard(tmp_path, 0, 2, {'a/1.jpg': [{'text': 'ABC1234'}]}, 1)
+    write_shard(tmp_path, 1, 2, {'b/1.jpg': []}, 2)
+    
+    evaluator = merge_shards(str(tmp_path))
+    assert evaluator.results['true_positives'] == 3
+    assert evaluator.results['total_plates'] == 3
+    assert len(evaluator.results['latencies']) == 2
+    
+    with open(tmp_path / 'merged_results.json', encoding='utf-8') as f:
+        assert json.load(f) == {'a/1.jpg': [{'text': 'ABC1234'}], 'b/1.jpg': []}
+
+def test_merge_shards_reports_missing_shards(tmp_path, capsys):
+    write_shard(tmp_path, 0, 3, {'a.jpg': []}, 1)
+    assert merge_shards(str(tmp_path)) is not None
+    assert 'Eksik parçalar: [1, 2]' in capsys.readouterr().out
+
+def test_merge_shards_without_shards(tmp_path):
+    assert merge_shards(str(tmp_path)) is None
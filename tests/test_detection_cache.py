@@ -0,0 +1,82 @@
+import numpy as np
+
+from detection_cache import DetectionCache, filter_detections, image_hash
+
+RAW_BOXES = np.array([
+    [10, 10, 110, 40, 0.90, 0],
+    [12, 11, 112, 41, 0.80, 0],    # ilk kutuyla büyük ölçüde örtüşür
+    [300, 200, 400, 230, 0.50, 0],
+    [500, 200, 600, 230, 0.05, 0]
+], dtype=np.float64)
+
+def test_filter_applies_threshold_and_nms():
+    boxes, keypoints = filter_detections(RAW_BOXES, conf_threshold=0.25, iou_threshold=0.7)
+    assert keypoints is None
+    assert boxes[:, 4].tolist() == [0.90, 0.50]
+
+def test_filter_loose_nms_keeps_overlaps():
+    boxes, _ = filter_detections(RAW_BOXES, conf_threshold=0.01, iou_threshold=0.99)
+    assert boxes[:, 4].tolist() == [0.90, 0.80, 0.50, 0.05]
+
+def test_filter_orders_by_confidence_and_keeps_keypoints():
+    raw_boxes = RAW_BOXES[[3, 2, 0]]
+    raw_keypoints = np.arange(3 * 4 * 2, dtype=np.float64).reshape(3, 4, 2)
+    boxes, keypoints = filter_detections(raw_boxes, conf_threshold=0.01, iou_threshold=0.7,
+                                         raw_keypoints=raw_keypoints)
+    assert boxes[:, 4].tolist() == [0.90, 0.50, 0.05]
+    assert np.array_equal(keypoints, raw_keypoints[[2, 1, 0]])
+
+def test_filter_empty():
+    boxes, keypoints = filter_detections(np.zeros((0, 6)), conf_threshold=0.25)
+    assert boxes.shape == (0, 6)
+    assert keypoints is None
+    
+    boxes, _ = filter_detections(RAW_BOXES, conf_threshold=0.95)
+    assert len(boxes) == 0
+
+def test_image_hash_depends_on_content_and_shape():
+    image = np.zeros((20, 30, 3), dtype=np.uint8)
+    assert image_hash(image) == image_hash(image.copy())
+    assert image_hash(image) != image_hash(np.zeros((30, 20, 3), dtype=np.uint8))
+    
+    changed = image.copy()
+    changed[0, 0, 0] = 1
+    assert image_hash(image) != image_hash(changed)
+
+def test_cache_round_trip(tmp_path):
+    cache = DetectionCache(str(tmp_path / 'cache'))
+    image = np.random.default_rng(0).integers(0, 256, (32, 32, 3), dtype=np.uint8)
+    keypoints = np.ones((1, 4, 2))
+    
+    entry_path = cache.entry_path('yolov8n.pt', image, 640)
+    assert cache.get(entry_path) is None
+    cache.put(entry_path, RAW_BOXES[:1], keypoints)
+    
+    boxes, cached_keypoints = cache.get(cache.entry_path('yolov8n.pt', image, 640))
+    assert np.array_equal(boxes, RAW_BOXES[:1])
+    assert np.array_equal(cached_keypoints, keypoints)
+    assert cache.stats == {'hits': 1, 'misses': 1}
+    
+    # Farklı çıkarım boyutu veya model ayrı bir kayıttır
+    assert cache.entry_path('yolov8n.pt', image, 320) != entry_path
+    assert cache.entry_path('yolov8s.pt', image, 640) != entry_path
+
+def test_cache_weights_change_invalidates(tmp_path):
+    weights = tmp_path / 'model.pt'
+    weights.write_bytes(b'v1')
+    cache = DetectionCache(str(tmp_path / 'cache'))
+    image = np.zeros((8, 8, 3), dtype=np.uint8)
+    
+    before = cache.entry_path(str(weights), image)
+    weights.write_bytes(b'v2 weights')
+    assert cache.entry_path(str(weights), image) != before
+
+def test_cache_ignores_corrupt_entry(tmp_path, capsys):
+    cache = DetectionCache(str(tmp_path / 'cache'))
+    entry_path = cache.entry_path('yolov8n.pt', np.zeros((8, 8, 3), dtype=np.uint8))
+    cache.put(entry_path, RAW_BOXES)
+    with open(entry_path, 'wb') as f:
+        f.write(b'not a npz file')
+    
+    assert cache.get(entry_path) is None
+    assert 'Bozuk önbellek kaydı' in capsys.readouterr().out
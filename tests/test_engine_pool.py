@@ -0,0 +1,53 @@
+import pytest
+
+# engine_pool tespit modelini (ultralytics) ve torch'u modül düzeyinde içe aktarır
+pytest.importorskip('ultralytics')
+torch = pytest.importorskip('torch')
+
+from engine_pool import EnginePool, partition_cores
+
+def core_counts(plan):
+    return len(plan['detector_cores']), len(plan['ocr_cores'])
+
+def test_cores_follow_stage_costs():
+    cores = list(range(8))
+    plan = partition_cores(0.03, 0.01, cores)
+    assert plan['detector_cores'] == [0, 1, 2, 3, 4, 5]
+    assert plan['ocr_cores'] == [6, 7]
+    assert plan['torch_threads'] == 6
+    assert plan['ocr_workers'] == 2
+    
+    assert core_counts(partition_cores(0.01, 0.03, cores)) == (2, 6)
+    assert core_counts(partition_cores(0.0, 0.0, cores)) == (4, 4)
+
+def test_each_stage_keeps_a_core():
+    cores = list(range(4))
+    assert core_counts(partition_cores(1.0, 0.0, cores)) == (3, 1)
+    assert core_counts(partition_cores(0.0, 1.0, cores)) == (1, 3)
+
+def test_detector_replicas_share_detection_cores():
+    plan = partition_cores(0.01, 0.09, list(range(8)), detector_replicas=3)
+    
+    # Maliyet payı bir çekirdek verir, ama her kopya en az bir çekirdek alır
+    assert core_counts(plan) == (3, 5)
+    assert plan['torch_threads'] == 1
+    
+    plan = partition_cores(0.06, 0.02, list(range(8)), detector_replicas=2)
+    assert core_counts(plan) == (6, 2)
+    assert plan['torch_threads'] == 3
+    
+    # Kopya sayısı çekirdeklerden fazlaysa OCR yine bir çekirdek alır
+    assert core_counts(partition_cores(0.01, 0.01, [0, 1], detector_replicas=4)) == (1, 1)
+
+def test_single_core_is_shared():
+    plan = partition_cores(0.03, 0.01, [5])
+    assert plan == {'detector_cores': [5], 'ocr_cores': [5], 'torch_threads': 1, 'ocr_workers': 1}
+
+def test_pool_restores_torch_threads():
+    previous = torch.get_num_threads()
+    plan = partition_cores(1.0, 1.0, [0, 1, 2, 3])
+    
+    # İşçiler ilk iş gönderilince kurulduğu için model yüklenmez
+    with EnginePool({}, plan=plan):
+        assert torch.get_num_threads() == plan['torch_threads']
+    assert torch.get_num_threads() == previous
@@ -0,0 +1,61 @@
+import json
+
+from journal import ProcessingJournal
+
+def write_journal(path, names, partial=b''):
+    with open(path, 'wb') as f:
+        for name in names:
+            f.write((json.dumps({'image': name, 'plates': []}) + '\n').encode('utf-8'))
+        f.write(partial)
+
+def read_names(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line)['image'] for line in f]
+
+def test_resume_skips_truncated_line(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    write_journal(path, ['a.jpg', 'b.jpg'], partial=b'{"image": "c.jp')
+    
+    with ProcessingJournal(path, resume=True) as journal:
+        assert journal.is_completed('a.jpg') and journal.is_completed('b.jpg')
+        assert not journal.is_completed('c.jpg')
+        journal.record('c.jpg', [{'text': 'ABC1234'}])
+    
+    # Yarım satır kesildiği için yeni kayıt ayrı bir satır olarak okunabilir
+    assert read_names(path) == ['a.jpg', 'b.jpg', 'c.jpg']
+
+def test_resume_without_retain_repairs_tail(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    write_journal(path, ['a.jpg'], partial=b'{"image": "b.j')
+    
+    with ProcessingJournal(path, resume=True, retain=False) as journal:
+        assert journal.completed == {}
+        journal.record('b.jpg', [])
+        assert journal.completed == {}
+    
+    assert read_names(path) == ['a.jpg', 'b.jpg']
+
+def test_repair_tail_across_blocks(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    write_journal(path, ['a.jpg', 'b.jpg'], partial=b'{"image": "' + b'x' * 100)
+    
+    journal = ProcessingJournal(path, resume=True, retain=False)
+    journal.close()
+    assert read_names(path) == ['a.jpg', 'b.jpg']
+    
+    # Son satır sonu birkaç blok geride kalsa da bulunur; hiç yoksa dosya boşaltılır
+    write_journal(path, ['a.jpg'], partial=b'y' * 100)
+    journal._repair_tail(block_size=8)
+    assert read_names(path) == ['a.jpg']
+    
+    write_journal(path, [], partial=b'z' * 50)
+    journal._repair_tail(block_size=8)
+    assert read_names(path) == []
+
+def test_without_resume_starts_fresh(tmp_path):
+    path = str(tmp_path / 'journal.jsonl')
+    write_journal(path, ['a.jpg'])
+    
+    with ProcessingJournal(path) as journal:
+        assert not journal.is_completed('a.jpg')
+    assert read_names(path) == []
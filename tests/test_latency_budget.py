@@ -0,0 +1,44 @@
+import time
+
+from latency_budget import DEGRADATION_LEVELS, LatencyBudget
+
+def make_budget():
+    budget = LatencyBudget(100, safety=1.0)
+    budget.observe('detect', 0.060)
+    budget.observe('detect_low_res', 0.020)
+    budget.observe('ocr_per_plate', 0.010)
+    budget.observe('annotate', 0.020)
+    return budget
+
+def level_name(level):
+    return DEGRADATION_LEVELS[level]['name']
+
+def test_unknown_costs_choose_full():
+    budget = LatencyBudget(100)
+    assert level_name(budget.choose_level(budget.start())) == 'full'
+
+def test_levels_follow_remaining_time():
+    budget = make_budget()
+    now = time.monotonic()
+    
+    # full: 60 + 10 + 20 = 90 ms, low_res: 50 ms, no_annotation: 30 ms, detections_only: 20 ms
+    assert level_name(budget.choose_level(now + 1.0)) == 'full'
+    assert level_name(budget.choose_level(now + 0.070)) == 'low_res'
+    assert level_name(budget.choose_level(now + 0.040)) == 'no_annotation'
+    assert level_name(budget.choose_level(now + 0.025)) == 'detections_only'
+
+def test_missed_deadline_chooses_cheapest():
+    budget = make_budget()
+    assert budget.choose_level(time.monotonic() - 1.0) == len(DEGRADATION_LEVELS) - 1
+
+def test_expected_plates_scale_ocr_cost():
+    budget = make_budget()
+    deadline = time.monotonic() + 0.095
+    assert level_name(budget.choose_level(deadline, expected_plates=1)) == 'full'
+    assert level_name(budget.choose_level(deadline, expected_plates=4)) == 'low_res'
+
+def test_observe_smooths_costs():
+    budget = LatencyBudget(100, smoothing=0.5)
+    budget.observe('detect', 0.1)
+    budget.observe('detect', 0.2)
+    assert abs(budget.costs['detect'] - 0.15) < 1e-9
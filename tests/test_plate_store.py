@@ -0,0 +1,77 @@
+import random
+
+from plate_store import normalize_plate_text, edit_distance, BKTree, PlateStore
+
+def test_normalize_plate_text():
+    assert normalize_plate_text('abc-1234') == 'A8C1234'
+    assert normalize_plate_text(' o0 Il ') == '0011'
+    assert normalize_plate_text('AB C1D') == normalize_plate_text('A8-C10')
+
+def test_edit_distance():
+    assert edit_distance('', '') == 0
+    assert edit_distance('ABC', '') == 3
+    assert edit_distance('ABC1234', 'ABC1234') == 0
+    assert edit_distance('ABC1234', 'ABD1234') == 1
+    assert edit_distance('ABC1234', 'ABC123') == 1
+    assert edit_distance('KITTEN', 'SITTING') == 3
+
+def test_bktree_ignores_duplicates():
+    tree = BKTree()
+    for text in ('ABC1234', 'ABC1234', 'XYZ9876'):
+        tree.add(text)
+    assert tree.size == 2
+
+def test_bktree_search_matches_brute_force():
+    rng = random.Random(0)
+    alphabet = 'ABC123'
+    texts = {''.join(rng.choice(alphabet) for _ in range(rng.randint(5, 7))) for _ in range(300)}
+    
+    tree = BKTree()
+    for text in texts:
+        tree.add(text)
+    
+    for query in list(texts)[:20] + ['AAAAAAA', 'C1']:
+        for max_distance in (0, 1, 2, 3):
+            expected = sorted((edit_distance(query, text), text) for text in texts
+                              if edit_distance(query, text) <= max_distance)
+            assert tree.search(query, max_distance) == expected
+
+def test_bktree_empty():
+    assert BKTree().search('ABC', 2) == []
+
+def make_plate(text):
+    return {'text': text, 'position': [0, 0, 100, 30], 'detection_confidence': 0.9,
+            'ocr_confidence': 90.0, 'is_valid': True}
+
+def test_store_find_exact_and_similar(tmp_path):
+    with PlateStore(str(tmp_path / 'reads.db')) as store:
+        assert store.add_reads('cam1.jpg', [make_plate('ABC1234'), make_plate('XYZ9876'), make_plate('')]) == 2
+        assert store.count() == 2
+        assert [r['text'] for r in store.find_exact('abc1234')] == ['ABC1234']
+        
+        # O/0 karışıklığı mesafe 0 sayılır
+        assert [(r['text'], r['distance']) for r in store.find_similar('A8C-I234', max_distance=0)] == [('ABC1234', 0)]
+        assert [r['text'] for r in store.find_similar('ABC1Z34', max_distance=1)] == ['ABC1234']
+        assert [r['text'] for r in store.find_similar('ABC12', max_distance=2)] == ['ABC1234']
+        assert store.find_similar('QWERTYU', max_distance=2) == []
+
+def test_store_index_matches_bktree(tmp_path):
+    rng = random.Random(1)
+    alphabet = 'ABCXYZ1234'
+    texts = [''.join(rng.choice(alphabet) for _ in range(7)) for _ in range(500)]
+    
+    with PlateStore(str(tmp_path / 'reads.db')) as store:
+        store.add_reads('cam1.jpg', [make_plate(text) for text in texts])
+        tree = BKTree()
+        for text in texts:
+            tree.add(normalize_plate_text(text))
+        
+        for query in texts[:25]:
+            norm_query = normalize_plate_text(query)
+            for max_distance in (1, 2):
+                expected = tree.search(norm_query, max_distance)
+                assert store._indexed_search(norm_query, max_distance) == expected
+    
+    # Yeniden açılan depo dizini diskten kullanır
+    with PlateStore(str(tmp_path / 'reads.db')) as store:
+        assert {r['text'] for r in store.find_similar(texts[0], max_distance=0)} >= {texts[0]}
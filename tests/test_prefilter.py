@@ -0,0 +1,114 @@
+import numpy as np
+import pytest
+
+import prefilter
+from prefilter import RegionPrefilter, covered_fraction, detect_in_region
+
+class FakeDetector:
+    # Görüntünün sol üst köşesinde sabit bir plaka bulur ve gördüğü görüntüyü saklar
+    def __init__(self):
+        self.calls = []
+    
+    def detect(self, image, return_corners=False):
+        self.calls.append(image.copy())
+        annotated = np.full_like(image, 255)
+        plates = [[1, 2, 11, 6, 0.9]]
+        corners = [[[1, 2], [11, 2], [11, 6], [1, 6]]]
+        return (plates, annotated, corners) if return_corners else (plates, annotated)
+
+def test_covered_fraction():
+    assert covered_fraction([0, 0, 10, 10], [0, 0, 20, 20]) == 1.0
+    assert covered_fraction([0, 0, 10, 10], [5, 0, 20, 20]) == 0.5
+    assert covered_fraction([0, 0, 10, 10], [10, 10, 20, 20]) == 0.0
+    assert covered_fraction([5, 5, 5, 5], [0, 0, 20, 20]) == 0.0
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        RegionPrefilter(mode='resize')
+
+def test_search_region_expands_and_clips():
+    prefilter_ = RegionPrefilter(mode='crop', margin=1.0)
+    assert prefilter_.search_region([], (100, 200, 3)) is None
+    
+    # Yükseklik 10: genişlikte 20, yükseklikte 10 piksel pay
+    assert prefilter_.search_region([[50, 40, 80, 50]], (100, 200, 3)) == [30, 30, 100, 60]
+    assert prefilter_.search_region([[5, 5, 30, 15], [150, 80, 190, 95]], (100, 200, 3)) == [0, 0, 200, 100]
+
+def test_detect_in_region_offsets_results():
+    image = np.zeros((60, 80, 3), dtype=np.uint8)
+    detector = FakeDetector()
+    plates, annotated, corners = detect_in_region(image, detector, [20, 10, 60, 40], return_corners=True)
+    
+    assert detector.calls[0].shape == (30, 40, 3)
+    assert plates == [[21, 12, 31, 16, 0.9]]
+    assert corners == [[[21, 12], [31, 12], [31, 16], [21, 16]]]
+    assert annotated[10:40, 20:60].min() == 255
+    assert annotated[:10].max() == 0 and image.max() == 0
+
+def test_detect_in_region_applies_mask():
+    image = np.full((20, 20, 3), 100, dtype=np.uint8)
+    mask = np.zeros((20, 20), dtype=np.uint8)
+    mask[:, :10] = 255
+    detector = FakeDetector()
+    _, annotated = detect_in_region(image, detector, [0, 0, 20, 20], mask=mask)
+    
+    # Maske dışı ağa siyah verilir ve işaretli görüntüye taşınmaz
+    assert detector.calls[0][:, 10:].max() == 0
+    assert detector.calls[0][:, :10].min() == 100
+    assert annotated[:, :10].min() == 255
+    assert annotated[:, 10:].max() == 100
+
+def test_detect_skips_frames_without_candidates(monkeypatch):
+    monkeypatch.setattr(prefilter, 'propose_plate_regions', lambda image: [])
+    prefilter_ = RegionPrefilter(mode='skip')
+    detector = FakeDetector()
+    image = np.zeros((60, 80, 3), dtype=np.uint8)
+    
+    assert prefilter_.detect(image, detector, 'a.png', return_corners=True)[0] == []
+    assert detector.calls == []
+    assert prefilter_.regions == {'a.png': None}
+
+def test_detect_modes(monkeypatch):
+    monkeypatch.setattr(prefilter, 'propose_plate_regions', lambda image: [[30, 20, 50, 30]])
+    image = np.zeros((60, 80, 3), dtype=np.uint8)
+    
+    # 'skip' modunda aday varsa tüm kare ağa verilir
+    detector = FakeDetector()
+    plates, _ = RegionPrefilter(mode='skip').detect(image, detector, 'a.png')
+    assert detector.calls[0].shape == image.shape
+    assert plates == [[1, 2, 11, 6, 0.9]]
+    
+    # 'crop' modunda yalnızca arama bölgesi ağa verilir
+    detector = FakeDetector()
+    prefilter_ = RegionPrefilter(mode='crop')
+    plates, _ = prefilter_.detect(image, detector, 'a.png')
+    assert prefilter_.regions['a.png'] == [10, 10, 70, 40]
+    assert detector.calls[0].shape == (30, 60, 3)
+    assert plates == [[11, 12, 21, 16, 0.9]]
+
+def test_recall_report():
+    gt_data = {
+        'a.png': {'plates': [{'position': [10, 10, 30, 20]}]},
+        'b.png': {'plates': [{'position': [10, 10, 30, 20]}, {'position': [150, 80, 190, 95]}]},
+        'c.png': {'plates': [{'position': [10, 10, 30, 20]}]}
+    }
+    
+    for mode in ('skip', 'crop'):
+        prefilter_ = RegionPrefilter(mode=mode)
+        prefilter_.record('a.png', None, (100, 200), 0.002)
+        prefilter_.record('b.png', [0, 0, 100, 50], (100, 200), 0.004)
+        prefilter_.record('unlabeled.png', [0, 0, 200, 100], (100, 200), 0.0)
+        report = prefilter_.recall_report(gt_data)
+        
+        assert report['gt_plates'] == 3
+        assert report['skip_rate'] == pytest.approx(1 / 3)
+        assert report['mean_ms'] == pytest.approx(2.0)
+        if mode == 'skip':
+            assert report['lost_plates'] == 1
+            assert report['mean_area_ratio'] == 1.0
+        else:
+            # İkinci karedeki sağ alt plaka arama bölgesinin dışında kalır
+            assert report['lost_plates'] == 2
+            assert report['mean_area_ratio'] == pytest.approx(0.625)
+    
+    assert RegionPrefilter().recall_report({})['prefilter_recall'] is None
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from profiler import SamplingProfiler
+
+def profiler_with_samples():
+    profiler = SamplingProfiler()
+    profiler.samples.update({
+        ('thread:MainThread', 'a.py:main', 'a.py:detect', '[cv2.resize]'): 3,
+        ('thread:MainThread', 'a.py:main', 'a.py:ocr'): 5,
+        ('thread:MainThread', 'a.py:main'): 1,
+        ('thread:worker', 'b.py:walk', 'b.py:walk', 'b.py:walk'): 2
+    })
+    profiler.stats['samples'] = 11
+    return profiler
+
+def test_collapsed():
+    assert profiler_with_samples().collapsed() == [
+        'thread:MainThread;a.py:main 1',
+        'thread:MainThread;a.py:main;a.py:detect;[cv2.resize] 3',
+        'thread:MainThread;a.py:main;a.py:ocr 5',
+        'thread:worker;b.py:walk;b.py:walk;b.py:walk 2'
+    ]
+
+def test_top_functions():
+    top = profiler_with_samples().top_functions()
+    assert top[:2] == [('a.py:ocr', 5, 5), ('[cv2.resize]', 3, 3)]
+    
+    # Toplam örnekler çağrılanları içerir; özyinelemeli çağrılar bir kez sayılır, iş parçacığı kökü sayılmaz
+    assert ('b.py:walk', 2, 2) in top
+    assert ('a.py:main', 1, 9) in top
+    assert all(not label.startswith('thread:') for label, _, _ in top)
+    assert len(profiler_with_samples().top_functions(limit=2)) == 2
+
+def test_save_writes_all_outputs(tmp_path):
+    paths = profiler_with_samples().save(str(tmp_path))
+    with open(paths['collapsed'], encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 4
+    with open(paths['flamegraph'], encoding='utf-8') as f:
+        assert 'a.py:ocr' in f.read()
+    with open(paths['top'], encoding='utf-8') as f:
+        assert 'a.py:ocr' in f.read()
+
+def busy_loop(stop):
+    total = 0
+    while not stop.is_set():
+        total += sum(range(1000))
+    return total
+
+def test_samples_running_threads_and_skips_idle_ones():
+    stop = threading.Event()
+    threads = [threading.Thread(target=busy_loop, args=(stop,), name='busy-1'),
+               threading.Thread(target=stop.wait, name='idle')]
+    for thread in threads:
+        thread.start()
+    
+    try:
+        with SamplingProfiler(interval=0.002) as profiler:
+            time.sleep(0.2)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    
+    stacks = list(profiler.samples)
+    assert any(stack[0] == 'thread:busy' and 'test_profiler.py:busy_loop' in stack for stack in stacks)
+    assert not any(stack[0] == 'thread:idle' for stack in stacks)
+    assert profiler.stats['idle'] > 0
+    assert profiler.stats['wall_seconds'] > 0
@@ -0,0 +1,107 @@
+import numpy as np
+
+from roi_prior import ROIPrior
+
+HEIGHT, WIDTH = 100, 200
+
+class BrightSpotDetector:
+    # Görüntüdeki parlak piksellerin sınır kutusunu plaka olarak döndürür ve gördüğü görüntü boyutlarını saklar
+    def __init__(self):
+        self.shapes = []
+    
+    def detect(self, image, return_corners=False):
+        self.shapes.append(image.shape[:2])
+        ys, xs = np.nonzero(image[:, :, 0] > 128)
+        plates = [[int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1, 0.9]] if len(xs) else []
+        corners = [None] * len(plates)
+        return (plates, image.copy(), corners) if return_corners else (plates, image.copy())
+
+def frame_with_plate(x1, y1, x2, y2):
+    image = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    image[y1:y2, x1:x2] = 255
+    return image
+
+def make_prior(**options):
+    settings = {'grid_size': 10, 'warmup_frames': 2, 'min_detections': 2, 'full_frame_interval': 5, 'decay': 1.0}
+    settings.update(options)
+    return ROIPrior(**settings)
+
+def test_source_of():
+    assert make_prior().source_of('/data/cam1_0001.jpg') == 'cam1'
+    assert make_prior().source_of('0001.jpg') == 'default'
+    assert make_prior(source_pattern=None).source_of('cam1_0001.jpg') == 'default'
+
+def test_plan_warms_up_then_uses_learned_region_with_periodic_full_frames():
+    prior = make_prior()
+    plans = []
+    for i in range(8):
+        plans.append(prior.plan(f"cam1_{i}.jpg", (HEIGHT, WIDTH, 3)))
+        prior.update('cam1', [[80, 40, 120, 50, 0.9]], (HEIGHT, WIDTH))
+    
+    # Plaka 4-6. sütun ve 4-5. satır hücrelerinde; bölge yatayda 2, dikeyde 1 plaka yüksekliği genişletilir
+    region = [60, 30, 160, 70]
+    assert plans == [('cam1', None, False), ('cam1', None, False),
+                     ('cam1', region, False), ('cam1', region, False), ('cam1', region, False),
+                     ('cam1', region, False), ('cam1', None, True), ('cam1', region, False)]
+    
+    # Kaynaklar birbirinden bağımsız öğrenilir
+    assert prior.plan('cam2_0.jpg', (HEIGHT, WIDTH, 3)) == ('cam2', None, False)
+
+def test_large_region_falls_back_to_full_frame():
+    prior = make_prior(warmup_frames=0, min_detections=1, max_area_ratio=0.1)
+    prior.update('cam1', [[80, 40, 120, 50, 0.9]], (HEIGHT, WIDTH))
+    assert prior.plan('cam1_0.jpg', (HEIGHT, WIDTH, 3)) == ('cam1', None, False)
+
+def test_detect_searches_only_the_learned_region():
+    prior = make_prior(record_regions=True)
+    detector = BrightSpotDetector()
+    image = frame_with_plate(80, 40, 120, 50)
+    
+    for i in range(3):
+        plates, _ = prior.detect(image, detector, f"cam1_{i}.jpg")
+        assert plates == [[80, 40, 120, 50, 0.9]]
+    
+    assert detector.shapes == [(HEIGHT, WIDTH), (HEIGHT, WIDTH), (40, 100)]
+    assert prior.regions == {'cam1_0.jpg': None, 'cam1_1.jpg': None, 'cam1_2.jpg': [60, 30, 160, 70]}
+    
+    gt_data = {f"cam1_{i}.jpg": {'plates': [{'position': [80, 40, 120, 50]}]} for i in range(2)}
+    gt_data['cam1_2.jpg'] = {'plates': [{'position': [10, 10, 30, 20]}]}
+    report = prior.recall_report(gt_data)
+    assert (report['gt_plates'], report['lost_plates']) == (3, 1)
+    assert report['full_frame_rate'] == 2 / 3
+
+def test_drift_check_restarts_warmup():
+    prior = make_prior(full_frame_interval=2)
+    detector = BrightSpotDetector()
+    for i in range(3):
+        prior.detect(frame_with_plate(80, 40, 120, 50), detector, f"cam1_{i}.jpg")
+    
+    # Tam kare kontrolünde plaka öğrenilen bölgenin dışında bulunur
+    plates, _ = prior.detect(frame_with_plate(10, 80, 40, 90), detector, 'cam1_3.jpg')
+    assert plates == [[10, 80, 40, 90, 0.9]]
+    assert prior.stats['drift_checks'] == 1
+    assert prior.stats['drift_plates'] == 1
+    assert prior.plan('cam1_4.jpg', (HEIGHT, WIDTH, 3))[1] is None
+
+def test_static_mask_hides_pixels_outside_polygons():
+    masks = {'cam1': [[[0, 0], [99, 0], [99, 99], [0, 99]]]}
+    prior = make_prior(masks=masks)
+    detector = BrightSpotDetector()
+    
+    # Maske yalnızca kendi kaynağına uygulanır ve öğrenme süresince de geçerlidir
+    assert prior.detect(frame_with_plate(150, 40, 170, 50), detector, 'cam1_0.jpg')[0] == []
+    assert prior.detect(frame_with_plate(20, 40, 60, 50), detector, 'cam1_1.jpg')[0] == [[20, 40, 60, 50, 0.9]]
+    assert prior.detect(frame_with_plate(150, 40, 170, 50), detector, 'cam2_0.jpg')[0] == [[150, 40, 170, 50, 0.9]]
+    assert detector.shapes == [(100, 100), (100, 100), (HEIGHT, WIDTH)]
+
+def test_save_and_load_skip_warmup(tmp_path):
+    prior = make_prior()
+    prior.update('cam1', [[80, 40, 120, 50, 0.9]] * 2, (HEIGHT, WIDTH))
+    prior.save(str(tmp_path / 'roi.json'))
+    
+    loaded = make_prior()
+    assert loaded.load(str(tmp_path / 'roi.json')) == 1
+    assert loaded.plan('cam1_0.jpg', (HEIGHT, WIDTH, 3)) == ('cam1', [60, 30, 160, 70], False)
+    
+    assert make_prior(grid_size=16).load(str(tmp_path / 'roi.json')) == 0
+    assert make_prior().load(str(tmp_path / 'missing.json')) == 0
@@ -0,0 +1,58 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from shm_ring import SharedFrameRing
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing(slot_count=2, slot_bytes=1 << 16)
+    yield ring
+    ring.close()
+
+def test_write_read_round_trip(ring):
+    frame = np.arange(64 * 48 * 3, dtype=np.uint8).reshape(64, 48, 3)
+    boxes = np.array([[1.5, 2.5, 3.5, 4.5]], dtype=np.float32)
+    
+    slot = ring.acquire(timeout=1)
+    handle = ring.write(slot, [frame, boxes])
+    assert len(handle) == 2
+    
+    read_frame, read_boxes = ring.read(handle, copy=True)
+    assert read_frame.dtype == np.uint8 and np.array_equal(read_frame, frame)
+    assert read_boxes.dtype == np.float32 and np.array_equal(read_boxes, boxes)
+    ring.release(handle)
+
+def test_slots_are_exclusive(ring):
+    first = ring.acquire(timeout=1)
+    second = ring.acquire(timeout=1)
+    assert {first, second} == {0, 1}
+    assert ring.acquire(timeout=0.05) is None
+    
+    ring.release(first)
+    assert ring.acquire(timeout=1) == first
+
+def test_oversized_write(ring):
+    slot = ring.acquire(timeout=1)
+    with pytest.raises(ValueError):
+        ring.write(slot, [np.zeros(1 << 17, dtype=np.uint8)])
+
+def negate_in_child(ring, handle, done):
+    frame = ring.read(handle)[0]
+    frame[...] = 255 - frame
+    done.put(True)
+
+@pytest.mark.skipif('fork' not in multiprocessing.get_all_start_methods(), reason='fork gerekli')
+def test_round_trip_across_processes(ring):
+    context = multiprocessing.get_context('fork')
+    frame = np.full((32, 32), 10, dtype=np.uint8)
+    handle = ring.write(ring.acquire(timeout=1), [frame])
+    
+    done = context.Queue()
+    process = context.Process(target=negate_in_child, args=(ring, handle, done))
+    process.start()
+    assert done.get(timeout=10)
+    process.join()
+    
+    assert np.array_equal(ring.read(handle, copy=True)[0], np.full((32, 32), 245, dtype=np.uint8))
@@ -0,0 +1,80 @@
+import time
+
+import pytest
+
+# stream_scheduler tespit modelini (ultralytics) modül düzeyinde içe aktarır
+pytest.importorskip('ultralytics')
+
+from stream_scheduler import StreamScheduler, parse_stream_spec
+
+def submit_frames(scheduler, counts):
+    for name, count in counts.items():
+        for i in range(count):
+            scheduler.submit(name, f"{name}{i}")
+
+def frames(batch):
+    return [frame['image'] for frame in batch]
+
+def test_round_robin_rotates_streams():
+    scheduler = StreamScheduler(max_batch=4, queue_size=10)
+    submit_frames(scheduler, {'a': 8, 'b': 2, 'c': 1})
+    
+    # Yoğun akış toplu işi dolduramaz; her toplu işte başlangıç akışı döner
+    assert frames(scheduler.next_batch()) == ['a0', 'b0', 'c0', 'a1']
+    assert frames(scheduler.next_batch()) == ['b1', 'a2', 'a3', 'a4']
+
+def test_weighted_policy_follows_weights():
+    scheduler = StreamScheduler(max_batch=8, queue_size=10, policy='weighted')
+    scheduler.add_stream('a', weight=3)
+    scheduler.add_stream('b', weight=1)
+    submit_frames(scheduler, {'a': 10, 'b': 10})
+    
+    batch = scheduler.next_batch()
+    assert [frame['stream'] for frame in batch].count('a') == 6
+    assert [frame['stream'] for frame in batch].count('b') == 2
+
+def test_full_queue_drops_oldest_frame():
+    scheduler = StreamScheduler(max_batch=8, queue_size=2)
+    assert [scheduler.submit('a', image) for image in ('a0', 'a1', 'a2')] == [0, 0, 1]
+    
+    metrics = scheduler.metrics()['a']
+    assert (metrics['submitted'], metrics['dropped'], metrics['queue_depth']) == (3, 1, 2)
+    
+    scheduler.close()
+    batch = scheduler.next_batch()
+    assert frames(batch) == ['a1', 'a2']
+    assert [frame['sequence'] for frame in batch] == [1, 2]
+    assert scheduler.next_batch() is None
+
+def test_partial_batch_waits_for_max_wait():
+    scheduler = StreamScheduler(max_batch=8, max_wait_ms=50)
+    assert scheduler.next_batch(timeout=0.01) == []
+    
+    scheduler.submit('a', 'a0')
+    start = time.perf_counter()
+    batch = scheduler.next_batch(timeout=1.0)
+    elapsed = time.perf_counter() - start
+    
+    assert frames(batch) == ['a0']
+    assert 0.04 <= elapsed < 0.5
+    
+    scheduler.complete(batch)
+    metrics = scheduler.metrics()['a']
+    assert metrics['completed'] == 1
+    assert metrics['latency_ms'] >= metrics['wait_ms'] >= 40
+
+def test_closed_scheduler_rejects_frames():
+    scheduler = StreamScheduler()
+    scheduler.close()
+    with pytest.raises(RuntimeError):
+        scheduler.submit('a', 'a0')
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        StreamScheduler(policy='fifo')
+    with pytest.raises(ValueError):
+        StreamScheduler().add_stream('a', weight=0)
+
+def test_parse_stream_spec():
+    assert parse_stream_spec('cam1=rtsp://host/stream') == ('cam1', 1.0, 'rtsp://host/stream')
+    assert parse_stream_spec('cam2:2.5=videos/cam2.mp4') == ('cam2', 2.5, 'videos/cam2.mp4')
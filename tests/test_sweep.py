@@ -0,0 +1,33 @@
+import pytest
+
+# sweep tespit modelini (ultralytics) modül düzeyinde içe aktarır
+pytest.importorskip('ultralytics')
+
+from sweep import pareto_front
+
+def config(name, latency, accuracy):
+    return {'name': name, 'mean_latency_ms': latency, 'exact_match_accuracy': accuracy}
+
+def names(front):
+    return [c['name'] for c in front]
+
+def test_pareto_front_drops_dominated_configs():
+    configs = [
+        config('slow_best', 80, 0.95),
+        config('fast', 10, 0.60),
+        config('dominated', 40, 0.55),
+        config('middle', 30, 0.80),
+        config('slower_worse', 90, 0.90)
+    ]
+    assert names(pareto_front(configs, 'exact_match_accuracy')) == ['fast', 'middle', 'slow_best']
+
+def test_pareto_front_equal_latency_keeps_more_accurate():
+    configs = [config('a', 20, 0.7), config('b', 20, 0.9), config('c', 25, 0.9)]
+    assert names(pareto_front(configs, 'exact_match_accuracy')) == ['b']
+
+def test_pareto_front_custom_keys():
+    configs = [{'ms': 5, 'f1': 0.5}, {'ms': 3, 'f1': 0.6}]
+    assert pareto_front(configs, 'f1', latency_key='ms') == [{'ms': 3, 'f1': 0.6}]
+
+def test_pareto_front_empty():
+    assert pareto_front([], 'exact_match_accuracy') == []
@@ -0,0 +1,53 @@
+import json
+import os
+import re
+
+import cv2
+import numpy as np
+
+from synthetic_plates import generate_dataset, generate_image
+
+SIZE = (320, 240)
+
+def test_same_index_gives_same_image():
+    image, labels = generate_image(7, seed=3, size=SIZE, plates_per_image=(1, 3))
+    again, again_labels = generate_image(7, seed=3, size=SIZE, plates_per_image=(1, 3))
+    
+    assert np.array_equal(image, again)
+    assert labels == again_labels
+
+def test_index_and_seed_change_the_image():
+    image, _ = generate_image(7, seed=3, size=SIZE)
+    assert not np.array_equal(image, generate_image(8, seed=3, size=SIZE)[0])
+    assert not np.array_equal(image, generate_image(7, seed=4, size=SIZE)[0])
+
+def test_labels_match_the_scene():
+    for index in range(10):
+        image, labels = generate_image(index, size=SIZE, plates_per_image=(2, 2), width_range=(0.15, 0.2))
+        assert image.shape == (SIZE[1], SIZE[0], 3)
+        
+        positions = [plate['position'] for plate in labels['plates']]
+        assert positions == sorted(positions)
+        for plate in labels['plates']:
+            pattern = r'[A-Z]{3}\d{4}' if plate['format'] == 'old' else r'[A-Z]{3}\d[A-Z]\d{2}'
+            assert re.fullmatch(pattern, plate['text'])
+            
+            x1, y1, x2, y2 = plate['position']
+            assert 0 <= x1 < x2 < SIZE[0] and 0 <= y1 < y2 < SIZE[1]
+            assert len(plate['corners']) == 4
+
+def test_dataset_does_not_depend_on_worker_count(tmp_path):
+    options = {'count': 4, 'seed': 1, 'size': SIZE, 'plates_per_image': (1, 2), 'image_format': 'png'}
+    serial = generate_dataset(str(tmp_path / 'serial'), workers=1, **options)
+    parallel = generate_dataset(str(tmp_path / 'parallel'), workers=2, **options)
+    
+    with open(serial, encoding='utf-8') as f:
+        serial_gt = json.load(f)
+    with open(parallel, encoding='utf-8') as f:
+        assert json.load(f) == serial_gt
+    
+    assert sorted(serial_gt) == [f"synthetic_{i:07d}.png" for i in range(4)]
+    for name in serial_gt:
+        serial_image = cv2.imread(os.path.join(tmp_path, 'serial', 'images', name))
+        parallel_image = cv2.imread(os.path.join(tmp_path, 'parallel', 'images', name))
+        assert np.array_equal(serial_image, parallel_image)
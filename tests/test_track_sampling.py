@@ -0,0 +1,45 @@
+import cv2
+import numpy as np
+import pytest
+
+from track_sampling import subsample_track
+
+def motion_frames(boxes):
+    return [(f'frame{i:02d}.png', {'box': box}) for i, box in enumerate(boxes)]
+
+def test_motion_drops_near_duplicates():
+    # Araç ilk üç karede duruyor, sonra hareket ediyor
+    frames = motion_frames([[100, 100, 200, 140]] * 3 + [[150, 100, 250, 140], [200, 100, 300, 140]])
+    kept, stats = subsample_track('', frames, max_frames=10, method='motion')
+    assert [file for file, _ in kept] == ['frame00.png', 'frame03.png', 'frame04.png']
+    assert stats == {'kept': 3, 'dropped': 0, 'deduplicated': 2}
+
+def test_motion_limits_frames_and_keeps_order():
+    frames = motion_frames([[x, 100, x + 100, 140] for x in range(0, 1000, 50)])
+    kept, stats = subsample_track('', frames, max_frames=4, method='motion')
+    names = [file for file, _ in kept]
+    
+    assert len(kept) == 4
+    assert names == sorted(names)
+    # En uzak nokta örneklemesi ilk kareden başlar ve izlemenin sonunu da kapsar
+    assert names[0] == 'frame00.png'
+    assert names[-1] == 'frame19.png'
+    assert stats == {'kept': 4, 'dropped': 16, 'deduplicated': 0}
+
+def test_phash_uses_images(tmp_path):
+    rng = np.random.default_rng(0)
+    first = rng.integers(0, 256, (64, 256), dtype=np.uint8)
+    second = rng.integers(0, 256, (64, 256), dtype=np.uint8)
+    for name, image in [('a.png', first), ('b.png', first), ('c.png', second)]:
+        cv2.imwrite(str(tmp_path / name), image)
+    
+    frames = [(name, {'box': [0, 0, 10, 10]}) for name in ('a.png', 'b.png', 'c.png', 'missing.png')]
+    kept, stats = subsample_track(str(tmp_path), frames, max_frames=10, method='phash')
+    
+    # Okunamayan kare her zaman farklı sayılır
+    assert [file for file, _ in kept] == ['a.png', 'c.png', 'missing.png']
+    assert stats['deduplicated'] == 1
+
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        subsample_track('', [], max_frames=1, method='random')
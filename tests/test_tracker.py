@@ -0,0 +1,93 @@
+import numpy as np
+
+from tracker import vote_plate_text, PlateTracker
+
+def sharp_crop(height=40, width=120):
+    # Keskinlik puanı sıfır olmasın diye dama tahtası deseni
+    crop = np.zeros((height, width, 3), dtype=np.uint8)
+    crop[::4, ::4] = 255
+    return crop
+
+def test_vote_empty_reads():
+    assert vote_plate_text([]) == ('', 0.0)
+    assert vote_plate_text([('', 0.9, True)]) == ('', 0.0)
+
+def test_vote_per_character_majority():
+    reads = [('ABC1234', 0.9, True), ('A8C1234', 0.8, True), ('ABC1Z34', 0.7, True)]
+    text, confidence = vote_plate_text(reads)
+    assert text == 'ABC1234'
+    assert 0.0 < confidence <= 1.0
+
+def test_vote_prefers_dominant_length():
+    reads = [('ABC1234', 0.6, True), ('ABC1234', 0.6, True), ('ABC12345', 0.9, False)]
+    assert vote_plate_text(reads)[0] == 'ABC1234'
+
+def test_vote_weights_valid_reads():
+    reads = [('ABC1234', 0.5, True), ('ABC1Z34', 0.5, False)]
+    assert vote_plate_text(reads)[0] == 'ABC1234'
+
+def test_tracker_matches_moving_box():
+    tracker = PlateTracker()
+    first = tracker.update([[100, 100, 200, 140, 0.9]])
+    second = tracker.update([[105, 100, 205, 140, 0.9]])
+    assert first == second
+    assert tracker.stats['tracks'] == 1
+
+def test_tracker_starts_new_track_for_distant_box():
+    tracker = PlateTracker()
+    first = tracker.update([[100, 100, 200, 140, 0.9]])
+    second = tracker.update([[500, 400, 600, 440, 0.9]])
+    assert first != second
+    assert tracker.stats['tracks'] == 2
+
+def test_tracker_drops_missed_tracks():
+    tracker = PlateTracker(max_missed=2)
+    track_id = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    for _ in range(3):
+        tracker.update([])
+    assert track_id not in tracker.tracks
+
+def test_tracker_stops_ocr_when_stable():
+    tracker = PlateTracker(stable_reads=2)
+    track_id = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    crop = sharp_crop()
+    
+    for _ in range(2):
+        assert tracker.should_ocr(track_id, crop, 0.9)
+        tracker.add_read(track_id, 'ABC1234', 0.9, True)
+    
+    track = tracker.get_track(track_id)
+    assert track.stable
+    assert track.text == 'ABC1234'
+    assert not tracker.should_ocr(track_id, crop, 0.9)
+
+def test_tracker_respects_ocr_budget():
+    tracker = PlateTracker(max_ocr_per_track=2, stable_reads=3)
+    track_id = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    crop = sharp_crop()
+    
+    tracker.add_read(track_id, 'ABC1234', 0.9, True)
+    tracker.add_read(track_id, 'XYZ9876', 0.9, True)
+    assert not tracker.should_ocr(track_id, crop, 0.9)
+    assert tracker.stats['ocr_calls'] == 2
+
+def test_tracker_skips_worse_crops_after_stable_reads():
+    tracker = PlateTracker(max_ocr_per_track=5, stable_reads=2)
+    track_id = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    
+    for text in ('ABC1234', 'XYZ9876'):
+        assert tracker.should_ocr(track_id, sharp_crop(), 0.9)
+        tracker.add_read(track_id, text, 0.9, True)
+    
+    # Çok daha küçük ve düşük güvenli kırpıntı okunmaz
+    assert not tracker.should_ocr(track_id, sharp_crop(height=8, width=24), 0.3)
+
+def test_tracker_reset_clears_tracks():
+    tracker = PlateTracker()
+    first = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    tracker.reset()
+    assert tracker.tracks == {}
+    
+    # Aynı konumdaki plaka eski izlemeyle eşleşmez
+    second = tracker.update([[100, 100, 200, 140, 0.9]])[0]
+    assert second != first
@@ -0,0 +1,103 @@
+import os
+
+import numpy as np
+import pytest
+
+from ufpr_annotations import UFPRIndex, parse_ufpr_annotation, _track_id
+
+ANNOTATION = """camera: GoPro Hero4 Silver
+position_vehicle: 809 447 196 346
+\ttype: car
+\tmake: Renault
+\tmodel: Sandero
+\tyear: 2015
+plate: {plate}
+position_plate: {x} 692 66 22
+\tchar 1: 857 698 8 12
+\tchar 2: 866 698 8 12
+"""
+
+def add_frame(root, split, track, frame, plate='AYO-9034', x=853):
+    folder = root / split / f'track{track:04d}'
+    folder.mkdir(parents=True, exist_ok=True)
+    name = f'track{track:04d}[{frame:02d}]'
+    (folder / f'{name}.txt').write_text(ANNOTATION.format(plate=plate, x=x))
+    (folder / f'{name}.png').write_bytes(b'')
+    return folder / f'{name}.txt'
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = tmp_path / 'UFPR-ALPR'
+    add_frame(root, 'training', 1, 1)
+    add_frame(root, 'training', 1, 2, x=860)
+    add_frame(root, 'testing', 91, 1, plate='BCD-1234')
+    
+    # Görüntüsü olmayan açıklama dizine alınmaz
+    (root / 'testing' / 'track0091' / 'orphan.txt').write_text(ANNOTATION.format(plate='XXX-0000', x=0))
+    return root
+
+def test_parse_annotation(dataset):
+    annotation = parse_ufpr_annotation(str(dataset / 'training' / 'track0001' / 'track0001[01].txt'))
+    assert annotation['text'] == 'AYO-9034'
+    assert annotation['box'] == [853, 692, 919, 714]
+    assert annotation['corners'] is None
+    assert annotation['chars'] == [[857, 698, 865, 710], [866, 698, 874, 710]]
+
+def test_parse_corners_and_missing_plate(tmp_path):
+    path = tmp_path / 'frame.txt'
+    path.write_text('plate: ABC1234\ncorners: 10,20 50,22 50,40 10,38\n')
+    annotation = parse_ufpr_annotation(str(path))
+    assert annotation['box'] == [10, 20, 50, 40]
+    assert annotation['corners'] == [[10, 20], [50, 22], [50, 40], [10, 38]]
+    
+    path.write_text('camera: GoPro\n')
+    assert parse_ufpr_annotation(str(path)) is None
+
+def test_track_id():
+    assert _track_id(os.path.join('training', 'track0091', 'track0091[01].png')) == 91
+    assert _track_id('frame.png') == -1
+
+def test_index_lookup(dataset):
+    index = UFPRIndex.build(str(dataset))
+    assert len(index) == 3
+    assert 'track0091[01].png' in index
+    assert 'orphan.png' not in index
+    
+    label = index['track0001[02].png']
+    assert label['plates'][0]['text'] == 'AYO9034'
+    assert label['plates'][0]['position'] == [860, 692, 926, 714]
+    assert label['plates'][0]['corners'] is None
+    assert label['track_id'] == 1
+    assert label['path'] == os.path.join('training', 'track0001', 'track0001[02].png')
+    
+    assert index.get('missing.png') is None
+    assert sorted(index.columns['names'][index.track_rows(1)].tolist()) == ['track0001[01].png', 'track0001[02].png']
+    assert index.columns['splits'][index.row_by_name['track0091[01].png']] == 'testing'
+
+def test_index_cache(dataset, capsys):
+    first = UFPRIndex.load_or_build(str(dataset))
+    assert 'oluşturuluyor' in capsys.readouterr().out
+    assert (dataset / '.ufpr_index.npz').exists()
+    
+    # Açıklamalar değişmediyse önbellek kullanılır
+    cached = UFPRIndex.load_or_build(str(dataset))
+    assert 'oluşturuluyor' not in capsys.readouterr().out
+    assert cached['track0091[01].png'] == first['track0091[01].png']
+    assert np.array_equal(cached.columns['boxes'], first.columns['boxes'])
+    
+    # Yeni bir kare eklenince indeks yeniden oluşturulur
+    add_frame(dataset, 'testing', 91, 2, plate='BCD-1234')
+    rebuilt = UFPRIndex.load_or_build(str(dataset))
+    assert 'oluşturuluyor' in capsys.readouterr().out
+    assert len(rebuilt) == 4
+
+def test_index_cache_detects_modified_annotation(dataset, capsys):
+    UFPRIndex.load_or_build(str(dataset))
+    path = add_frame(dataset, 'training', 1, 1, plate='ZZZ-9999')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    capsys.readouterr()
+    
+    index = UFPRIndex.load_or_build(str(dataset))
+    assert 'oluşturuluyor' in capsys.readouterr().out
+    assert index['track0001[01].png']['plates'][0]['text'] == 'ZZZ9999'
@@ -0,0 +1,101 @@
+import os
+
+import cv2
+import numpy as np
+
+from watch_folder import SpoolWatcher, is_complete_image, move_file, watch_folder
+
+def encoded(ext):
+    return cv2.imencode(ext, np.zeros((16, 16, 3), dtype=np.uint8))[1].tobytes()
+
+def write(path, data, mtime_ns=None):
+    path.write_bytes(data)
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+def test_complete_jpeg(tmp_path):
+    jpeg = encoded('.jpg')
+    assert is_complete_image(str(write(tmp_path / 'a.jpg', jpeg)))
+    assert not is_complete_image(str(write(tmp_path / 'b.jpg', jpeg[:len(jpeg) // 2])))
+    
+    # EOI işaretinden sonraki dolgu baytları kabul edilir
+    assert is_complete_image(str(write(tmp_path / 'c.JPEG', jpeg + b'\x00' * 4)))
+    assert not is_complete_image(str(write(tmp_path / 'd.jpg', b'\xff')))
+
+def test_complete_png(tmp_path):
+    png = encoded('.png')
+    assert is_complete_image(str(write(tmp_path / 'a.png', png)))
+    assert not is_complete_image(str(write(tmp_path / 'b.png', png[:-12])))
+
+def test_other_formats_and_missing_files(tmp_path):
+    assert is_complete_image(str(write(tmp_path / 'a.bmp', b'BM')))
+    assert not is_complete_image(str(tmp_path / 'missing.jpg'))
+
+def test_watcher_waits_until_file_settles(tmp_path):
+    watcher = SpoolWatcher(str(tmp_path), settle_seconds=0)
+    jpeg = encoded('.jpg')
+    path = write(tmp_path / 'cam1_1.jpg', jpeg[:100], mtime_ns=1_000)
+    
+    # İlk görüldüğünde ve her değişiklikten sonra bir tarama daha beklenir
+    assert watcher.poll() == []
+    write(path, jpeg, mtime_ns=2_000)
+    assert watcher.poll() == []
+    assert watcher.poll() == [str(path)]
+    
+    # Hazır dönen dosya bir daha dönmez (taşınmamış olsa bile yeniden sabitlenmesi beklenir)
+    assert watcher.poll() == []
+
+def test_watcher_skips_partial_hidden_and_incomplete_files(tmp_path):
+    watcher = SpoolWatcher(str(tmp_path), settle_seconds=0)
+    jpeg = encoded('.jpg')
+    write(tmp_path / 'cam1_1.jpg.part', jpeg)
+    write(tmp_path / '.cam1_2.jpg', jpeg)
+    write(tmp_path / 'notes.txt', b'x')
+    write(tmp_path / 'empty.jpg', b'')
+    write(tmp_path / 'truncated.jpg', jpeg[:50])
+    (tmp_path / 'folder.jpg').mkdir()
+    
+    watcher.poll()
+    assert watcher.poll() == []
+
+def test_watcher_orders_by_mtime_and_forgets_removed_files(tmp_path):
+    watcher = SpoolWatcher(str(tmp_path), settle_seconds=0)
+    jpeg = encoded('.jpg')
+    newer = write(tmp_path / 'a.jpg', jpeg, mtime_ns=3_000_000_000)
+    older = write(tmp_path / 'b.jpg', jpeg, mtime_ns=1_000_000_000)
+    removed = write(tmp_path / 'c.jpg', jpeg, mtime_ns=2_000_000_000)
+    
+    watcher.poll()
+    removed.unlink()
+    assert watcher.poll() == [str(older), str(newer)]
+    assert watcher._pending == {}
+
+def test_move_file_avoids_overwriting(tmp_path):
+    target_dir = tmp_path / 'processed'
+    first = move_file(str(write(tmp_path / 'a.jpg', b'1')), str(target_dir))
+    second = move_file(str(write(tmp_path / 'a.jpg', b'2')), str(target_dir))
+    assert os.path.basename(first) == 'a.jpg'
+    assert os.path.basename(second) == 'a_1.jpg'
+
+def test_watch_folder_processes_and_survives_failures(tmp_path):
+    spool = tmp_path / 'spool'
+    spool.mkdir()
+    jpeg = encoded('.jpg')
+    for name in ('cam1_1.jpg', 'cam1_2.jpg', 'cam1_3.jpg'):
+        write(spool / name, jpeg)
+    
+    def process_image(path, ready_time):
+        if path.endswith('cam1_2.jpg'):
+            raise RuntimeError('bozuk görüntü')
+        return [{'text': 'ABC1234'}], True
+    
+    processed = watch_folder(str(spool), process_image, max_in_flight=2, poll_interval=0.05, settle_seconds=0,
+                             max_idle_seconds=0.5)
+    
+    assert processed == 3
+    assert sorted(os.listdir(spool / 'processed')) == ['cam1_1.jpg', 'cam1_3.jpg']
+    assert os.listdir(spool / 'failed') == ['cam1_2.jpg']
+    assert os.listdir(spool / 'inprogress') == []
+    with open(spool / 'watch_journal.jsonl', encoding='utf-8') as f:
+        assert len(f.readlines()) == 3
@@ -1,6 +1,14 @@
 import os
+import sys
 import argparse
+
+# src modülleri birbirini doğrudan içe aktardığı için src dizinini yola ekle
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src'))
+
 from src.plate_detection import PlateDetector
+from src.train_tuner import tune_training
+from src.profiler import SamplingProfiler, finish_profile
+from src.char_recognizer import prepare_char_dataset
 
 def main():
     parser = argparse.ArgumentParser(description='UFPR-ALPR veri seti üzerinde YOLO modelini eğit')
@@ -10,9 +18,39 @@ def main():
     parser.add_argument('--batch_size', type=int, default=16, help='Eğitim için toplu iş boyutu')
     parser.add_argument('--img_size', type=int, default=640, help='Model için giriş görüntüsü boyutu')
     parser.add_argument('--resume', action='store_true', help='Son kontrol noktasından eğitime devam et')
+    parser.add_argument('--export_size', type=int, default=None,
+                        help='Görüntüleri bu boyuta önceden küçült ve yeniden kodla (genellikle --img_size ile aynı)')
+    parser.add_argument('--export_mode', type=str, default='letterbox', choices=['letterbox', 'resize'],
+                        help='Önceden küçültme kipi')
+    parser.add_argument('--export_format', type=str, default='jpg', choices=['jpg', 'webp', 'png'],
+                        help='Önceden küçültülen görüntülerin kodlama biçimi')
+    parser.add_argument('--export_quality', type=int, default=90, help='JPEG/WebP kalitesi (1-100)')
+    parser.add_argument('--keypoints', action='store_true',
+                        help='Plaka köşelerini köşe noktası olarak koru ve köşe noktası (pose) modeli eğit')
+    parser.add_argument('--frames_per_track', type=int, default=None,
+                        help='Eğitim bölümünde her izlemeden en fazla bu kadar birbirinden farklı kare al (varsayılan: tümü)')
+    parser.add_argument('--subsample_method', type=str, default='phash', choices=['phash', 'motion'],
+                        help='Kare benzerliği ölçüsü: görüntü özeti (phash) veya plaka kutusu hareketi (motion)')
+    parser.add_argument('--dedup_threshold', type=float, default=None,
+                        help='Bir önceki kareye bu eşikten yakın kareleri yakın kopya say (varsayılan: yöntem varsayılanı)')
+    parser.add_argument('--auto_tune', action='store_true',
+                        help='Eğitimden önce kısa denemelerle en hızlı batch/workers/cache/rect/amp ayarlarını bul')
+    parser.add_argument('--tune_batch_sizes', type=int, nargs='+', default=[8, 16, 32],
+                        help='Ayar sırasında denenecek toplu iş boyutları')
+    parser.add_argument('--probe_fraction', type=float, default=0.1, help='Her denemede kullanılacak veri oranı')
+    parser.add_argument('--probe_epochs', type=int, default=2, help='Her denemenin epoch sayısı')
+    parser.add_argument('--memory_budget_gb', type=float, default=None, help='Ayar sırasında uyulacak bellek bütçesi (GB)')
+    parser.add_argument('--char_model', action='store_true',
+                        help='Plaka modelinden sonra UFPR karakter açıklamalarıyla 36 sınıflı karakter modelini de eğit')
+    parser.add_argument('--char_img_size', type=int, default=192, help='Karakter modeli giriş görüntüsü boyutu')
+    parser.add_argument('--char_epochs', type=int, default=None, help='Karakter modeli epoch sayısı (varsayılan: --epochs)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Veri hazırlama ve eğitim boyunca yığın örnekleyerek profil çıkar (output_path/profile altına)')
     
     args = parser.parse_args()
     
+    profiler = SamplingProfiler().start() if args.profile else None
+    
     # Tespit modülünü başlat
     detector = PlateDetector()
     
@@ -20,22 +58,73 @@ def main():
     dataset_yaml = os.path.join(args.output_path, 'dataset.yaml')
     if not os.path.exists(dataset_yaml) or not args.resume:
         print("Veri seti hazırlanıyor...")
-        prepared_dataset_path = detector.prepare_ufpr_dataset(args.dataset_root, args.output_path)
+        prepared_dataset_path = detector.prepare_ufpr_dataset(
+            args.dataset_root,
+            args.output_path,
+            export_size=args.export_size,
+            export_mode=args.export_mode,
+            export_format=args.export_format,
+            export_quality=args.export_quality,
+            keypoints=args.keypoints,
+            frames_per_track=args.frames_per_track,
+            subsample_method=args.subsample_method,
+            dedup_threshold=args.dedup_threshold
+        )
         print(f"Veri seti şurada hazırlandı: {prepared_dataset_path}")
     else:
         prepared_dataset_path = args.output_path
         print("Mevcut veri seti kullanılıyor...")
     
+    # Eğitim ayarları (otomatik ayar yapılmazsa yalnızca toplu iş boyutu belirtilir)
+    train_settings = {'batch_size': args.batch_size}
+    
+    if args.auto_tune:
+        print("Eğitim hızı ayarlanıyor...")
+        best_config, _ = tune_training(
+            detector,
+            prepared_dataset_path,
+            img_size=args.img_size,
+            batch_sizes=args.tune_batch_sizes,
+            probe_fraction=args.probe_fraction,
+            probe_epochs=args.probe_epochs,
+            memory_budget_gb=args.memory_budget_gb
+        )
+        if best_config:
+            train_settings = best_config
+        else:
+            print("Uyarı: Otomatik ayar başarısız oldu, varsayılan ayarlarla devam ediliyor")
+    
     # Modeli eğit
     print("Model eğitiliyor...")
     model_path = detector.train_custom_model(
         prepared_dataset_path,
         epochs=args.epochs,
-        batch_size=args.batch_size,
-        img_size=args.img_size
+        img_size=args.img_size,
+        **train_settings
     )
     
     print(f"Eğitim tamamlandı. Model şuraya kaydedildi: {model_path}")
 
+    if args.char_model:
+        # Karakter modeli plaka kırpıntıları üzerinde aynı eğitim hattıyla eğitilir
+        char_dataset_path = os.path.join(args.output_path, 'chars')
+        if not os.path.exists(os.path.join(char_dataset_path, 'dataset.yaml')) or not args.resume:
+            prepare_char_dataset(args.dataset_root, char_dataset_path, frames_per_track=args.frames_per_track,
+                                 subsample_method=args.subsample_method, dedup_threshold=args.dedup_threshold)
+        
+        # Yatay çevirme karakterleri bozduğu için kapatılır; plaka modeli değiştirilmez
+        print("Karakter modeli eğitiliyor...")
+        char_model_path = detector.train_custom_model(
+            char_dataset_path,
+            epochs=args.char_epochs or args.epochs,
+            batch_size=args.batch_size,
+            img_size=args.char_img_size,
+            update_model=False,
+            fliplr=0.0
+        )
+        print(f"Karakter modeli eğitimi tamamlandı. Model şuraya kaydedildi: {char_model_path}")
+    
+    finish_profile(profiler, os.path.join(args.output_path, 'profile'))
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file